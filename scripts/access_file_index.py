@@ -0,0 +1,101 @@
+"""
+Basename index of the directories the parity scripts search for Access files.
+
+Linked-table paths and command-line database paths recorded on the Windows
+workstation rarely exist verbatim here, so the scripts look for the same
+file name under a fixed set of roots (working directory, its parent,
+~/Downloads and their "MVQS_Database 2" folders). `FileIndex` lists each
+root once, to `depth` levels below it, and answers every later lookup from
+a dict instead of a resolve()/exists() pair per root per name:
+
+    index = FileIndex(default_search_roots(), depth=0)
+    index.candidates("DC_Data.accdb")   # every match, in root order
+    index.find("MVQS_Database 2/DC_Data.accdb")
+
+Names are matched case-insensitively, as Access paths come from Windows.
+Roots that do not exist or cannot be listed are skipped.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path, PureWindowsPath
+from typing import Iterable
+
+DEFAULT_SEARCH_DEPTH = 0
+
+
+def default_search_roots() -> list[Path]:
+    cwd = Path.cwd()
+    home = Path.home()
+    return [
+        cwd,
+        cwd / "MVQS_Database 2",
+        cwd.parent,
+        cwd.parent / "MVQS_Database 2",
+        home / "Downloads",
+        home / "Downloads" / "MVQS",
+        home / "Downloads" / "MVQS_Database 2",
+        home / "Downloads" / "MVQS" / "MVQS_Database 2",
+    ]
+
+
+class FileIndex:
+    def __init__(self, roots: Iterable[Path], depth: int = DEFAULT_SEARCH_DEPTH) -> None:
+        self.roots: list[Path] = []
+        self.depth = depth
+        self.by_name: dict[str, list[Path]] = {}
+        self.directories_scanned = 0
+        seen_roots: set[Path] = set()
+        for root in roots:
+            try:
+                resolved = Path(root).expanduser().resolve()
+            except OSError:
+                continue
+            if resolved in seen_roots or not resolved.is_dir():
+                continue
+            seen_roots.add(resolved)
+            self.roots.append(resolved)
+        seen_files: set[Path] = set()
+        for root in self.roots:
+            self._scan(root, depth, seen_files)
+
+    def _scan(self, directory: Path, depth: int, seen_files: set[Path]) -> None:
+        try:
+            with os.scandir(directory) as entries:
+                listing = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            return
+        self.directories_scanned += 1
+        subdirs = []
+        for entry in listing:
+            try:
+                if entry.is_file():
+                    path = Path(entry.path)
+                    if path not in seen_files:
+                        seen_files.add(path)
+                        self.by_name.setdefault(entry.name.casefold(), []).append(path)
+                elif depth > 0 and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(Path(entry.path))
+            except OSError:
+                continue
+        for subdir in subdirs:
+            self._scan(subdir, depth - 1, seen_files)
+
+    def candidates(self, name: str) -> list[Path]:
+        """Every indexed file whose basename matches `name` (a basename or any Windows/POSIX path)."""
+        basename = PureWindowsPath(name).name
+        if not basename:
+            return []
+        return [path.resolve() for path in self.by_name.get(basename.casefold(), [])]
+
+    def find(self, path_str: str) -> Path | None:
+        """First match for `path_str`, preferring files whose trailing path components match it too."""
+        pure = PureWindowsPath(path_str)
+        wanted = [part.casefold() for part in pure.parts if part != pure.anchor]
+        matches = self.candidates(path_str)
+        for candidate in matches:
+            tail = [part.casefold() for part in candidate.parts[-len(wanted):]]
+            if tail == wanted:
+                return candidate
+        return matches[0] if matches else None
@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Rebuild Access query SQL from MSysQueries rows, without one `mdb-queries` per query.
+
+Every saved query is stored as rows in MSysQueries, grouped by ObjectId (the
+MSysObjects Id of the query). Each row carries an Attribute code and the
+Name1/Name2/Expression/Flag fields that attribute uses:
+
+    1  query type (Flag) and action target table (Name1)
+    2  parameter: Name1 = name, Flag = data type
+    3  select flags: 1 = *, 2 = DISTINCT, 4 = OWNERACCESS, 8 = DISTINCTROW,
+       16 = TOP (Name1 = count), 32 = PERCENT
+    5  input table: Name1 = table, Name2 = alias, Expression = subquery or
+       union part SQL
+    6  output column: Expression, Name1 = alias, Name2 = target column
+    7  join: Name1/Name2 = left/right table, Expression = ON, Flag = 1 inner,
+       2 left, 3 right
+    8  WHERE, 9 GROUP BY, 10 HAVING, 11 ORDER BY (Name1 "D" = descending)
+
+Two renderers:
+- `render_mdb_queries(rows)` reproduces `mdb-queries` output byte for byte
+  (comma-joined FROM list, first WHERE and ORDER BY only). The parity
+  registry hashes this text, so switching extraction source leaves every
+  sql_sha256 unchanged.
+- `render_access_sql(rows)` writes the fuller Access dialect: PARAMETERS,
+  joins, GROUP BY, HAVING, every ORDER BY key, aliases, action queries and
+  UNION parts. Pass-through and data-definition queries keep their text
+  outside MSysQueries and raise UnsupportedQuery.
+
+Usage:
+  python3 scripts/access_query_sql.py --db <front_end.accdb> \
+    [--dialect mdb-queries|access] [--verify] [--out-dir output/analysis/access_query_sql]
+
+`--verify` also runs `mdb-queries` for every query and reports the
+reconstructions whose SHA-256 differs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+
+from access_table_cache import DEFAULT_CACHE_ROOT
+from mdb_broker import MSYSOBJECTS_COLUMNS, MSYSQUERIES_COLUMNS, access_reader, configure_table_cache
+
+QUERY_TYPE = "5"
+
+ATTR_TYPE = "1"
+ATTR_PARAMETER = "2"
+ATTR_FLAGS = "3"
+ATTR_EXTERNAL_DB = "4"
+ATTR_TABLE = "5"
+ATTR_COLUMN = "6"
+ATTR_JOIN = "7"
+ATTR_WHERE = "8"
+ATTR_GROUP_BY = "9"
+ATTR_HAVING = "10"
+ATTR_ORDER_BY = "11"
+
+TYPE_SELECT = 1
+TYPE_MAKE_TABLE = 2
+TYPE_APPEND = 3
+TYPE_UPDATE = 4
+TYPE_DELETE = 5
+TYPE_CROSSTAB = 6
+TYPE_DDL = 7
+TYPE_PASSTHROUGH = 8
+TYPE_UNION = 9
+
+FLAG_SELECT_STAR = 1
+FLAG_DISTINCT = 2
+FLAG_OWNER_ACCESS = 4
+FLAG_DISTINCTROW = 8
+FLAG_TOP = 16
+FLAG_PERCENT = 32
+UNION_FLAG_DISTINCT = 2
+
+JOIN_TYPES = {"1": "INNER JOIN", "2": "LEFT JOIN", "3": "RIGHT JOIN"}
+PARAMETER_TYPES = {
+    "1": "Bit",
+    "2": "Byte",
+    "3": "Short",
+    "4": "Long",
+    "5": "Currency",
+    "6": "IEEESingle",
+    "7": "IEEEDouble",
+    "8": "DateTime",
+    "9": "Binary",
+    "10": "Text",
+    "11": "LongBinary",
+    "12": "LongText",
+    "15": "Guid",
+}
+CROSSTAB_VALUE_FLAG = "1"
+CROSSTAB_PIVOT_FLAG = "2"
+PLAIN_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class UnsupportedQuery(ValueError):
+    """MSysQueries does not hold enough to rebuild this query; use mdb-queries."""
+
+
+def now_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+def group_query_rows(msysqueries_rows: Iterable[dict[str, str]]) -> dict[str, list[dict[str, str]]]:
+    """One pass over MSysQueries; rows stay in table order within each ObjectId."""
+    grouped: defaultdict[str, list[dict[str, str]]] = defaultdict(list)
+    for row in msysqueries_rows:
+        object_id = (row.get("ObjectId") or "").strip()
+        if object_id:
+            grouped[object_id].append(row)
+    return dict(grouped)
+
+
+def query_ids_by_name(msysobjects_rows: Iterable[dict[str, str]]) -> dict[str, str]:
+    ids: dict[str, str] = {}
+    for row in msysobjects_rows:
+        if row.get("Type") != QUERY_TYPE:
+            continue
+        name = (row.get("Name") or "").strip()
+        raw_id = (row.get("Id") or "").strip()
+        if name and raw_id:
+            ids[name] = raw_id
+    return ids
+
+
+def rows_for(rows: list[dict[str, str]], attribute: str) -> list[dict[str, str]]:
+    return [row for row in rows if row.get("Attribute") == attribute]
+
+
+def int_flag(row: dict[str, str] | None) -> int:
+    try:
+        return int((row or {}).get("Flag") or 0)
+    except ValueError:
+        return 0
+
+
+def query_type(rows: list[dict[str, str]]) -> int:
+    type_rows = rows_for(rows, ATTR_TYPE)
+    return int_flag(type_rows[0]) if type_rows else TYPE_SELECT
+
+
+def select_flags(rows: list[dict[str, str]]) -> tuple[int, str]:
+    flag_rows = rows_for(rows, ATTR_FLAGS)
+    if not flag_rows:
+        return 0, ""
+    return int_flag(flag_rows[0]), (flag_rows[0].get("Name1") or "").strip()
+
+
+def render_mdb_queries(rows: list[dict[str, str]]) -> str:
+    """Same text `mdb-queries <db> <query>` prints (after strip) for these rows."""
+    flags, _ = select_flags(rows)
+    text = "SELECT "
+    if flags & FLAG_DISTINCT:
+        text += "DISTINCT "
+    elif flags & FLAG_DISTINCTROW:
+        text += "DISTINCTROW "
+    text += ",".join(row.get("Expression") or "" for row in rows_for(rows, ATTR_COLUMN))
+    text += " FROM"
+    tables = [f"[{row.get('Name1') or ''}]" for row in rows_for(rows, ATTR_TABLE)]
+    if tables:
+        text += " " + ",".join(tables)
+    where = rows_for(rows, ATTR_WHERE)
+    if where:
+        text += " WHERE " + (where[0].get("Expression") or "")
+    order = rows_for(rows, ATTR_ORDER_BY)
+    if order:
+        text += " ORDER BY " + (order[0].get("Expression") or "")
+        if (order[0].get("Name1") or "") == "D":
+            text += " DESCENDING"
+    return text.strip()
+
+
+def quote_identifier(name: str) -> str:
+    if PLAIN_IDENTIFIER.match(name):
+        return name
+    return f"[{name}]"
+
+
+def quote_dotted(name: str) -> str:
+    # Update/append target columns arrive as "table.column".
+    return ".".join(quote_identifier(part) for part in name.split("."))
+
+
+def table_source(row: dict[str, str]) -> tuple[str, str]:
+    """(name used by join rows, FROM-clause text) for one attribute-5 row."""
+    name = (row.get("Name1") or "").strip()
+    alias = (row.get("Name2") or "").strip()
+    subquery = (row.get("Expression") or "").strip()
+    if subquery:
+        return alias, f"({subquery}) AS {quote_identifier(alias)}"
+    if alias and alias != name:
+        return alias, f"{quote_identifier(name)} AS {quote_identifier(alias)}"
+    return name, quote_identifier(name)
+
+
+def render_from(rows: list[dict[str, str]]) -> str:
+    """
+    Fold attribute-7 join rows over the attribute-5 tables. Each join merges
+    the two groups holding its left and right tables; a second join row
+    between tables already in one group adds its condition with AND.
+    """
+    groups: list[tuple[set[str], str, list[str]]] = []
+    for row in rows_for(rows, ATTR_TABLE):
+        key, text = table_source(row)
+        groups.append(({key.lower()}, text, []))
+
+    def find(name: str) -> int:
+        for index, (members, _, _) in enumerate(groups):
+            if name.lower() in members:
+                return index
+        raise UnsupportedQuery(f"join references unknown table '{name}'")
+
+    for row in rows_for(rows, ATTR_JOIN):
+        condition = (row.get("Expression") or "").strip()
+        join_type = JOIN_TYPES.get((row.get("Flag") or "").strip())
+        if join_type is None:
+            raise UnsupportedQuery(f"unknown join flag {row.get('Flag')!r}")
+        left_index = find(row.get("Name1") or "")
+        right_index = find(row.get("Name2") or "")
+        if left_index == right_index:
+            groups[left_index][2].append(condition)
+            continue
+        left_members, left_text, left_conditions = groups[left_index]
+        right_members, right_text, right_conditions = groups[right_index]
+        if left_conditions:
+            left_text = f"({left_text}{' AND '.join(left_conditions)})"
+        if right_conditions:
+            right_text = f"({right_text}{' AND '.join(right_conditions)})"
+        joined = (left_members | right_members, f"{left_text} {join_type} {right_text} ON ", [condition])
+        for index in sorted((left_index, right_index), reverse=True):
+            groups.pop(index)
+        groups.insert(min(left_index, right_index), joined)
+
+    parts = []
+    for _, text, conditions in groups:
+        if conditions:
+            text = text + " AND ".join(conditions)
+        parts.append(text)
+    return ", ".join(parts)
+
+
+def render_select_body(rows: list[dict[str, str]], qtype: int) -> str:
+    flags, top_value = select_flags(rows)
+    head = "SELECT "
+    if flags & FLAG_DISTINCT:
+        head += "DISTINCT "
+    elif flags & FLAG_DISTINCTROW:
+        head += "DISTINCTROW "
+    if flags & FLAG_TOP and top_value:
+        head += f"TOP {top_value}{' PERCENT' if flags & FLAG_PERCENT else ''} "
+
+    columns = []
+    for row in rows_for(rows, ATTR_COLUMN):
+        if qtype == TYPE_CROSSTAB and (row.get("Flag") or "") == CROSSTAB_PIVOT_FLAG:
+            continue
+        expression = (row.get("Expression") or "").strip()
+        alias = (row.get("Name1") or "").strip()
+        columns.append(f"{expression} AS {quote_identifier(alias)}" if alias else expression)
+    if flags & FLAG_SELECT_STAR:
+        columns.insert(0, "*")
+
+    text = head + ", ".join(columns)
+    if qtype == TYPE_MAKE_TABLE:
+        target = rows_for(rows, ATTR_TYPE)[0].get("Name1") or ""
+        text += f" INTO {quote_identifier(target)}"
+    return text + render_tail(rows, qtype)
+
+
+def render_tail(rows: list[dict[str, str]], qtype: int, include_from: bool = True) -> str:
+    text = ""
+    from_text = render_from(rows) if include_from else ""
+    if from_text:
+        text += f"\nFROM {from_text}"
+    external = rows_for(rows, ATTR_EXTERNAL_DB)
+    if external and external[0].get("Name1"):
+        text += f" IN '{external[0]['Name1']}'"
+    where = rows_for(rows, ATTR_WHERE)
+    if where:
+        text += "\nWHERE " + (where[0].get("Expression") or "").strip()
+    group_by = [(row.get("Expression") or "").strip() for row in rows_for(rows, ATTR_GROUP_BY)]
+    if group_by:
+        text += "\nGROUP BY " + ", ".join(group_by)
+    having = rows_for(rows, ATTR_HAVING)
+    if having:
+        text += "\nHAVING " + (having[0].get("Expression") or "").strip()
+    if qtype == TYPE_CROSSTAB:
+        pivots = [
+            (row.get("Expression") or "").strip()
+            for row in rows_for(rows, ATTR_COLUMN)
+            if (row.get("Flag") or "") == CROSSTAB_PIVOT_FLAG
+        ]
+        if pivots:
+            text += "\nPIVOT " + pivots[0]
+    text += render_order_by(rows)
+    return text
+
+
+def render_order_by(rows: list[dict[str, str]]) -> str:
+    keys = []
+    for row in rows_for(rows, ATTR_ORDER_BY):
+        key = (row.get("Expression") or "").strip()
+        if (row.get("Name1") or "") == "D":
+            key += " DESC"
+        keys.append(key)
+    return "\nORDER BY " + ", ".join(keys) if keys else ""
+
+
+def render_parameters(rows: list[dict[str, str]]) -> str:
+    params = []
+    for row in rows_for(rows, ATTR_PARAMETER):
+        name = (row.get("Name1") or "").strip()
+        if not name:
+            continue
+        type_name = PARAMETER_TYPES.get((row.get("Flag") or "").strip(), "Value")
+        params.append(f"{quote_identifier(name)} {type_name}")
+    return f"PARAMETERS {', '.join(params)};\n" if params else ""
+
+
+def render_union(rows: list[dict[str, str]]) -> str:
+    flags, _ = select_flags(rows)
+    parts = [(row.get("Expression") or "").strip() for row in rows_for(rows, ATTR_TABLE)]
+    if len(parts) < 2 or not all(parts):
+        raise UnsupportedQuery("union query without two SQL parts")
+    joiner = "\nUNION\n" if flags & UNION_FLAG_DISTINCT else "\nUNION ALL\n"
+    return joiner.join(parts) + render_order_by(rows)
+
+
+def render_access_sql(rows: list[dict[str, str]]) -> str:
+    """Access-dialect SQL for one query's MSysQueries rows."""
+    if not rows:
+        raise UnsupportedQuery("no MSysQueries rows")
+    qtype = query_type(rows)
+    if qtype in (TYPE_DDL, TYPE_PASSTHROUGH):
+        raise UnsupportedQuery(f"query type {qtype} keeps its SQL outside MSysQueries")
+
+    prefix = render_parameters(rows)
+    if qtype == TYPE_UNION:
+        return prefix + render_union(rows)
+    if qtype in (TYPE_SELECT, TYPE_MAKE_TABLE):
+        return prefix + render_select_body(rows, qtype)
+    if qtype == TYPE_CROSSTAB:
+        values = [
+            (row.get("Expression") or "").strip()
+            for row in rows_for(rows, ATTR_COLUMN)
+            if (row.get("Flag") or "") == CROSSTAB_VALUE_FLAG
+        ]
+        body = render_select_body(
+            [row for row in rows if not (row.get("Attribute") == ATTR_COLUMN and row.get("Flag") == CROSSTAB_VALUE_FLAG)],
+            qtype,
+        )
+        return prefix + (f"TRANSFORM {values[0]}\n" if values else "") + body
+    if qtype == TYPE_APPEND:
+        target = rows_for(rows, ATTR_TYPE)[0].get("Name1") or ""
+        columns = rows_for(rows, ATTR_COLUMN)
+        targets = [(row.get("Name2") or "").strip() for row in columns]
+        target_list = f" ({', '.join(quote_dotted(name) for name in targets)})" if all(targets) and targets else ""
+        return prefix + f"INSERT INTO {quote_identifier(target)}{target_list}\n" + render_select_body(rows, qtype)
+    if qtype == TYPE_UPDATE:
+        assignments = [
+            f"{quote_dotted((row.get('Name2') or '').strip())} = {(row.get('Expression') or '').strip()}"
+            for row in rows_for(rows, ATTR_COLUMN)
+        ]
+        return (
+            prefix
+            + f"UPDATE {render_from(rows)}\nSET {', '.join(assignments)}"
+            + render_tail(rows, qtype, include_from=False)
+        )
+    if qtype == TYPE_DELETE:
+        columns = [(row.get("Expression") or "").strip() for row in rows_for(rows, ATTR_COLUMN)]
+        return prefix + f"DELETE {', '.join(columns)}".rstrip() + render_tail(rows, qtype)
+    raise UnsupportedQuery(f"unknown query type {qtype}")
+
+
+def render_all(
+    msysobjects_rows: list[dict[str, str]],
+    msysqueries_rows: list[dict[str, str]],
+    dialect: str = "mdb-queries",
+) -> dict[str, tuple[str | None, str | None]]:
+    """
+    SQL for every saved query of one front-end from a single MSysObjects +
+    MSysQueries read: name -> (sql, error). Queries with no rows, or that
+    the Access renderer cannot rebuild, get an error and sql None.
+    """
+    grouped = group_query_rows(msysqueries_rows)
+    render = render_mdb_queries if dialect == "mdb-queries" else render_access_sql
+    results: dict[str, tuple[str | None, str | None]] = {}
+    for name, object_id in sorted(query_ids_by_name(msysobjects_rows).items()):
+        rows = grouped.get(object_id)
+        if not rows:
+            results[name] = (None, "no MSysQueries rows")
+            continue
+        try:
+            text = render(rows)
+        except UnsupportedQuery as exc:
+            results[name] = (None, str(exc))
+            continue
+        results[name] = (text, None) if text else (None, "empty reconstruction")
+    return results
+
+
+def mdb_queries_sql(db_path: Path, query_name: str) -> tuple[str | None, str | None]:
+    proc = subprocess.run(["mdb-queries", str(db_path), query_name], capture_output=True, check=False)
+    output = (proc.stdout or b"").decode("utf-8", errors="replace")
+    text = output.strip()
+    if proc.returncode != 0 or not text:
+        stderr = (proc.stderr or b"").decode("utf-8", errors="replace")
+        return None, (stderr or output or "unknown query export error").strip()[:2000]
+    return text, None
+
+
+def verify_against_mdb_queries(
+    db_path: Path,
+    rendered: dict[str, tuple[str | None, str | None]],
+    workers: int = 8,
+) -> dict:
+    """Hash each reconstruction against `mdb-queries` output for the same query."""
+    names = sorted(rendered)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        reference = dict(zip(names, pool.map(lambda name: mdb_queries_sql(db_path, name), names)))
+
+    mismatches = []
+    matched = 0
+    for name in names:
+        sql, _ = rendered[name]
+        expected, expected_err = reference[name]
+        if expected_err and sql is None:
+            matched += 1
+            continue
+        if sql is not None and expected is not None and sha256_text(sql) == sha256_text(expected):
+            matched += 1
+            continue
+        mismatches.append(
+            {
+                "query": name,
+                "rendered_sha256": sha256_text(sql) if sql is not None else None,
+                "mdb_queries_sha256": sha256_text(expected) if expected is not None else None,
+                "rendered": sql,
+                "mdb_queries": expected,
+                "mdb_queries_error": expected_err,
+            }
+        )
+    return {
+        "queries_checked": len(names),
+        "matched": matched,
+        "mismatch_count": len(mismatches),
+        "mismatches": mismatches,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild saved query SQL from MSysQueries in one table scan.")
+    parser.add_argument("--db", required=True, help="Access front-end (.accdb/.mdb)")
+    parser.add_argument(
+        "--dialect",
+        choices=("mdb-queries", "access"),
+        default="mdb-queries",
+        help="mdb-queries = byte-compatible text; access = joins, GROUP BY, parameters, action queries",
+    )
+    parser.add_argument("--verify", action="store_true", help="Compare every query against mdb-queries output")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent mdb-queries processes for --verify")
+    parser.add_argument("--out-dir", default="output/analysis/access_query_sql", help="Output directory")
+    parser.add_argument(
+        "--access-cache-dir",
+        default=DEFAULT_CACHE_ROOT,
+        help=f"Cache of parsed Access table reads keyed by file SHA-256 (default: {DEFAULT_CACHE_ROOT})",
+    )
+    parser.add_argument("--no-access-cache", action="store_true", help="Always read Access tables with mdbtools")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    db_path = Path(args.db).expanduser().resolve()
+    if not db_path.exists():
+        raise RuntimeError(f"Access file not found: {db_path}")
+    configure_table_cache(None if args.no_access_cache else Path(args.access_cache_dir))
+
+    objects, queries = access_reader().read_tables(
+        db_path,
+        [("MSysObjects", MSYSOBJECTS_COLUMNS), ("MSysQueries", MSYSQUERIES_COLUMNS)],
+    )
+    rendered = render_all(objects, queries, args.dialect)
+    verification = None
+    if args.verify:
+        if args.dialect != "mdb-queries":
+            raise RuntimeError("--verify compares against mdb-queries text; use --dialect mdb-queries")
+        verification = verify_against_mdb_queries(db_path, rendered, args.workers)
+
+    stamp = now_id()
+    out_dir = Path(args.out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report = {
+        "generated_at_utc": now_iso(),
+        "db_path": str(db_path),
+        "dialect": args.dialect,
+        "stats": {
+            "queries_total": len(rendered),
+            "rendered": sum(1 for sql, _ in rendered.values() if sql is not None),
+            "unsupported": sum(1 for sql, _ in rendered.values() if sql is None),
+        },
+        "queries": {
+            name: {"sql": sql, "sql_sha256": sha256_text(sql) if sql is not None else None, "error": err}
+            for name, (sql, err) in rendered.items()
+        },
+        "verification": verification,
+    }
+    out_json = out_dir / f"access_query_sql_{stamp}.json"
+    out_json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    print(f"Wrote: {out_json}")
+    print(json.dumps(report["stats"], indent=2))
+    if verification is not None:
+        print(f"Verification: {verification['matched']}/{verification['queries_checked']} match mdb-queries")
+        if verification["mismatch_count"]:
+            return 2
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        raise SystemExit(1)
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite form of the Access parity registry.
+
+parity_access_inventory writes access_registry_<snapshot>.sqlite next to the
+JSON registry. Downstream steps (parity_table_taps, parity_modern_mapping_check)
+open it with `--registry-db` and read only the slices they need, instead of
+json.loads on the whole multi-megabyte document.
+
+Tables:
+- registry_meta            snapshot id, generated time, inputs, stats, gate
+- objects                  modules/reports/queries with their merged order
+- object_provenance        one row per (object, front-end) with MSysObjects fields
+- queries                  canonical/hidden query names, selected SQL and hash
+- query_sql                per-source SQL text and SHA-256 (the variants)
+- query_sql_errors         per-source extraction errors
+- query_edges              MSysQueries dependency edges
+- dependency_counts        inbound/outbound edge counts
+- source_databases         source catalogs (one row per database)
+- source_tables            table names per source database
+- table_to_sources         lower-cased table name -> source keys
+- linked_table_bindings    linked tables and their back-end paths
+- linked_table_to_databases lower-cased table name -> back-end paths
+
+The JSON registry stays the compatibility view. `registry_to_json` rebuilds it
+byte for byte from the database:
+
+  python3 scripts/access_registry_db.py --db output/analysis/parity/latest_access_registry.sqlite \
+    --out output/analysis/parity/latest_access_registry.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Iterable
+
+REGISTRY_DB_FORMAT = 1
+OBJECT_BUCKETS = ("modules", "reports", "queries")
+PROVENANCE_FIELDS = ("source_key", "source_path", "object_id", "parent_id", "date_create", "date_update", "flags")
+BINDING_FIELDS = ("source_key", "source_path", "table_name", "foreign_name", "database_path", "connect", "flags")
+# Registry sections a reader can ask `load_registry` for.
+SECTIONS = ("meta", "objects", "provenance", "query_names", "selected_sql", "query_sql", "edges", "source_catalog")
+
+SCHEMA = """
+CREATE TABLE registry_meta (key TEXT PRIMARY KEY, value_json TEXT NOT NULL);
+CREATE TABLE objects (
+    bucket TEXT NOT NULL, position INTEGER NOT NULL, name TEXT NOT NULL, name_lower TEXT NOT NULL,
+    type TEXT, source_count INTEGER NOT NULL, PRIMARY KEY (bucket, name)
+);
+CREATE INDEX objects_by_lower ON objects (bucket, name_lower);
+CREATE TABLE object_provenance (
+    bucket TEXT NOT NULL, name TEXT NOT NULL, position INTEGER NOT NULL,
+    source_key TEXT, source_path TEXT, object_id TEXT, parent_id TEXT,
+    date_create TEXT, date_update TEXT, flags TEXT
+);
+CREATE INDEX provenance_by_object ON object_provenance (bucket, name);
+CREATE INDEX provenance_by_source_id ON object_provenance (source_key, object_id);
+CREATE TABLE queries (
+    name TEXT PRIMARY KEY, kind TEXT NOT NULL, position INTEGER NOT NULL,
+    selected_sql TEXT, selected_sql_sha256 TEXT, sql_variant_count INTEGER
+);
+CREATE INDEX queries_by_kind ON queries (kind, position);
+CREATE TABLE query_sql (
+    name TEXT NOT NULL, position INTEGER NOT NULL, source_key TEXT, source_path TEXT,
+    sql TEXT, sql_sha256 TEXT
+);
+CREATE INDEX query_sql_by_name ON query_sql (name, position);
+CREATE INDEX query_sql_by_hash ON query_sql (sql_sha256);
+CREATE TABLE query_sql_errors (
+    name TEXT NOT NULL, position INTEGER NOT NULL, source_key TEXT, source_path TEXT, error TEXT
+);
+CREATE INDEX query_sql_errors_by_name ON query_sql_errors (name, position);
+CREATE TABLE query_edges (position INTEGER NOT NULL, source_query TEXT NOT NULL, target_query TEXT NOT NULL);
+CREATE INDEX query_edges_by_source ON query_edges (source_query);
+CREATE INDEX query_edges_by_target ON query_edges (target_query);
+CREATE TABLE dependency_counts (
+    direction TEXT NOT NULL, position INTEGER NOT NULL, query_name TEXT NOT NULL, edge_count INTEGER NOT NULL
+);
+CREATE TABLE source_databases (
+    position INTEGER NOT NULL, source_key TEXT PRIMARY KEY, source_type TEXT, path TEXT, table_count INTEGER
+);
+CREATE TABLE source_tables (source_key TEXT NOT NULL, position INTEGER NOT NULL, table_name TEXT NOT NULL);
+CREATE INDEX source_tables_by_name ON source_tables (table_name COLLATE NOCASE);
+CREATE TABLE table_to_sources (table_lower TEXT NOT NULL, position INTEGER NOT NULL, source_key TEXT NOT NULL);
+CREATE INDEX table_to_sources_by_table ON table_to_sources (table_lower);
+CREATE TABLE linked_table_bindings (
+    position INTEGER NOT NULL, source_key TEXT, source_path TEXT, table_name TEXT, foreign_name TEXT,
+    database_path TEXT, connect TEXT, flags TEXT
+);
+CREATE INDEX linked_table_bindings_by_table ON linked_table_bindings (table_name COLLATE NOCASE);
+CREATE TABLE linked_table_to_databases (table_lower TEXT NOT NULL, position INTEGER NOT NULL, database_path TEXT NOT NULL);
+CREATE INDEX linked_table_to_databases_by_table ON linked_table_to_databases (table_lower);
+"""
+
+META_KEYS = ("generated_at_utc", "snapshot_id", "inputs", "stats", "gate")
+
+
+def write_registry_db(report: dict, out_path: Path) -> Path:
+    """Write `report` (the registry dict) to a fresh SQLite file via a temp path and rename."""
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(f".{out_path.name}.partial")
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;")
+        conn.executescript(SCHEMA)
+        meta = {key: report.get(key) for key in META_KEYS}
+        meta["registry_db_format"] = REGISTRY_DB_FORMAT
+        meta["query_sql_extraction"] = (report.get("queries") or {}).get("extraction")
+        conn.executemany(
+            "INSERT INTO registry_meta VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in meta.items()],
+        )
+
+        objects = report.get("objects") or {}
+        for bucket in OBJECT_BUCKETS:
+            entries = objects.get(bucket) or []
+            conn.executemany(
+                "INSERT INTO objects VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (bucket, idx, entry["name"], entry["name"].lower(), entry.get("type"), entry.get("source_count", 0))
+                    for idx, entry in enumerate(entries)
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO object_provenance VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (bucket, entry["name"], idx, *(source.get(field) for field in PROVENANCE_FIELDS))
+                    for entry in entries
+                    for idx, source in enumerate(entry.get("present_in_sources") or [])
+                ],
+            )
+
+        query_section = report.get("queries") or {}
+        sql_by_name = query_section.get("sql_by_name") or {}
+        for kind, names in (("canonical", query_section.get("canonical_names")), ("hidden", query_section.get("hidden_names"))):
+            conn.executemany(
+                "INSERT INTO queries VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        name,
+                        kind,
+                        idx,
+                        (sql_by_name.get(name) or {}).get("selected_sql"),
+                        (sql_by_name.get(name) or {}).get("selected_sql_sha256"),
+                        (sql_by_name.get(name) or {}).get("sql_variant_count"),
+                    )
+                    for idx, name in enumerate(names or [])
+                ],
+            )
+        for name, entry in sql_by_name.items():
+            conn.executemany(
+                "INSERT INTO query_sql VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (name, idx, row.get("source_key"), row.get("source_path"), row.get("sql"), row.get("sql_sha256"))
+                    for idx, row in enumerate(entry.get("sources") or [])
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO query_sql_errors VALUES (?, ?, ?, ?, ?)",
+                [
+                    (name, idx, row.get("source_key"), row.get("source_path"), row.get("error"))
+                    for idx, row in enumerate(entry.get("extract_errors") or [])
+                ],
+            )
+
+        dependencies = report.get("dependencies") or {}
+        conn.executemany(
+            "INSERT INTO query_edges VALUES (?, ?, ?)",
+            [(idx, row["source_query"], row["target_query"]) for idx, row in enumerate(dependencies.get("query_edges") or [])],
+        )
+        for direction in ("inbound", "outbound"):
+            conn.executemany(
+                "INSERT INTO dependency_counts VALUES (?, ?, ?, ?)",
+                [
+                    (direction, idx, name, count)
+                    for idx, (name, count) in enumerate((dependencies.get(f"{direction}_counts") or {}).items())
+                ],
+            )
+
+        catalog = report.get("source_catalog") or {}
+        for idx, row in enumerate(catalog.get("databases") or []):
+            conn.execute(
+                "INSERT INTO source_databases VALUES (?, ?, ?, ?, ?)",
+                (idx, row.get("source_key"), row.get("source_type"), row.get("path"), row.get("table_count")),
+            )
+            conn.executemany(
+                "INSERT INTO source_tables VALUES (?, ?, ?)",
+                [(row.get("source_key"), pos, table) for pos, table in enumerate(row.get("tables") or [])],
+            )
+        for table, target in (("table_to_sources", "table_to_sources"), ("linked_table_to_databases", "linked_table_to_databases")):
+            conn.executemany(
+                f"INSERT INTO {table} VALUES (?, ?, ?)",
+                [
+                    (key, pos, value)
+                    for key, values in (catalog.get(target) or {}).items()
+                    for pos, value in enumerate(values)
+                ],
+            )
+        conn.executemany(
+            "INSERT INTO linked_table_bindings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (idx, *(row.get(field) for field in BINDING_FIELDS))
+                for idx, row in enumerate(catalog.get("linked_table_bindings") or [])
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    tmp_path.replace(out_path)
+    return out_path
+
+
+def open_registry_db(path: Path) -> sqlite3.Connection:
+    if not path.exists():
+        raise RuntimeError(f"Registry database not found: {path}")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    fmt = conn.execute("SELECT value_json FROM registry_meta WHERE key = 'registry_db_format'").fetchone()
+    if fmt is None or json.loads(fmt[0]) != REGISTRY_DB_FORMAT:
+        conn.close()
+        raise RuntimeError(f"Unsupported registry database format in {path}")
+    return conn
+
+
+def _grouped(rows: Iterable[sqlite3.Row], key: str, value: str) -> dict[str, list]:
+    grouped: dict[str, list] = {}
+    for row in rows:
+        grouped.setdefault(row[key], []).append(row[value])
+    return grouped
+
+
+def load_meta(conn: sqlite3.Connection) -> dict[str, Any]:
+    return {row["key"]: json.loads(row["value_json"]) for row in conn.execute("SELECT key, value_json FROM registry_meta")}
+
+
+def load_objects(conn: sqlite3.Connection, with_provenance: bool) -> dict[str, list[dict]]:
+    provenance: dict[tuple[str, str], list[dict]] = {}
+    if with_provenance:
+        for row in conn.execute("SELECT * FROM object_provenance ORDER BY bucket, name, position"):
+            provenance.setdefault((row["bucket"], row["name"]), []).append(
+                {field: row[field] for field in PROVENANCE_FIELDS}
+            )
+    objects: dict[str, list[dict]] = {bucket: [] for bucket in OBJECT_BUCKETS}
+    for row in conn.execute("SELECT bucket, name, type, source_count FROM objects ORDER BY bucket, position"):
+        entry: dict[str, Any] = {"name": row["name"]}
+        if with_provenance:
+            entry["type"] = row["type"]
+            entry["present_in_sources"] = provenance.get((row["bucket"], row["name"]), [])
+            entry["source_count"] = row["source_count"]
+        objects[row["bucket"]].append(entry)
+    return objects
+
+
+def load_sql_by_name(conn: sqlite3.Connection, full: bool) -> dict[str, dict]:
+    """selected_sql only, or (full) the same per-query entries the JSON registry holds."""
+    rows = conn.execute(
+        "SELECT name, selected_sql, selected_sql_sha256, sql_variant_count FROM queries "
+        "WHERE kind = 'canonical' ORDER BY position"
+    ).fetchall()
+    if not full:
+        return {row["name"]: {"name": row["name"], "selected_sql": row["selected_sql"]} for row in rows}
+
+    sources: dict[str, list[dict]] = {}
+    for row in conn.execute("SELECT * FROM query_sql ORDER BY name, position"):
+        sources.setdefault(row["name"], []).append(
+            {
+                "source_key": row["source_key"],
+                "source_path": row["source_path"],
+                "sql": row["sql"],
+                "sql_sha256": row["sql_sha256"],
+            }
+        )
+    errors: dict[str, list[dict]] = {}
+    for row in conn.execute("SELECT * FROM query_sql_errors ORDER BY name, position"):
+        errors.setdefault(row["name"], []).append(
+            {"source_key": row["source_key"], "source_path": row["source_path"], "error": row["error"]}
+        )
+    by_name: dict[str, dict] = {}
+    for row in rows:
+        name = row["name"]
+        source_rows = sources.get(name, [])
+        by_name[name] = {
+            "name": name,
+            "sources": source_rows,
+            "selected_sql": row["selected_sql"],
+            "selected_sql_sha256": row["selected_sql_sha256"],
+            "sql_variant_sha256": sorted({source["sql_sha256"] for source in source_rows}),
+            "sql_variant_count": row["sql_variant_count"],
+            "extract_errors": errors.get(name, []),
+        }
+    return by_name
+
+
+def load_source_catalog(conn: sqlite3.Connection) -> dict[str, Any]:
+    tables = _grouped(conn.execute("SELECT * FROM source_tables ORDER BY source_key, position"), "source_key", "table_name")
+    databases = [
+        {
+            "source_key": row["source_key"],
+            "source_type": row["source_type"],
+            "path": row["path"],
+            "table_count": row["table_count"],
+            "tables": tables.get(row["source_key"], []),
+        }
+        for row in conn.execute("SELECT * FROM source_databases ORDER BY position")
+    ]
+    return {
+        "databases": databases,
+        "table_to_sources": _grouped(
+            conn.execute("SELECT * FROM table_to_sources ORDER BY table_lower, position"), "table_lower", "source_key"
+        ),
+        "linked_table_bindings": [
+            {field: row[field] for field in BINDING_FIELDS}
+            for row in conn.execute("SELECT * FROM linked_table_bindings ORDER BY position")
+        ],
+        "linked_table_to_databases": _grouped(
+            conn.execute("SELECT * FROM linked_table_to_databases ORDER BY table_lower, position"),
+            "table_lower",
+            "database_path",
+        ),
+    }
+
+
+def load_registry(path: Path, sections: Iterable[str] = SECTIONS) -> dict:
+    """
+    A registry dict shaped like the JSON one, holding only the requested
+    sections. `objects` without `provenance` gives name-only entries;
+    `selected_sql` without `query_sql` gives name + selected_sql per query.
+    """
+    wanted = set(sections)
+    unknown = wanted - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"unknown registry sections: {sorted(unknown)}")
+    conn = open_registry_db(path)
+    try:
+        meta = load_meta(conn)
+        registry: dict[str, Any] = {"snapshot_id": meta.get("snapshot_id")}
+        if "meta" in wanted:
+            registry.update({key: meta.get(key) for key in META_KEYS})
+        if wanted & {"objects", "provenance"}:
+            registry["objects"] = load_objects(conn, "provenance" in wanted)
+        if wanted & {"query_names", "selected_sql", "query_sql"}:
+            kinds = _grouped(conn.execute("SELECT kind, name FROM queries ORDER BY kind, position"), "kind", "name")
+            registry["queries"] = {
+                "canonical_names": kinds.get("canonical", []),
+                "hidden_names": kinds.get("hidden", []),
+            }
+            if wanted & {"selected_sql", "query_sql"}:
+                registry["queries"]["sql_by_name"] = load_sql_by_name(conn, "query_sql" in wanted)
+            if "query_sql" in wanted and meta.get("query_sql_extraction") is not None:
+                registry["queries"]["extraction"] = meta["query_sql_extraction"]
+        if "edges" in wanted:
+            counts: dict[str, dict[str, int]] = {"inbound": {}, "outbound": {}}
+            for row in conn.execute("SELECT * FROM dependency_counts ORDER BY direction, position"):
+                counts[row["direction"]][row["query_name"]] = row["edge_count"]
+            registry["dependencies"] = {
+                "query_edges": [
+                    {"source_query": row["source_query"], "target_query": row["target_query"]}
+                    for row in conn.execute("SELECT source_query, target_query FROM query_edges ORDER BY position")
+                ],
+                "inbound_counts": counts["inbound"],
+                "outbound_counts": counts["outbound"],
+            }
+        if "source_catalog" in wanted:
+            registry["source_catalog"] = load_source_catalog(conn)
+        return registry
+    finally:
+        conn.close()
+
+
+def registry_to_json(path: Path) -> dict:
+    """The full registry, in the same key order parity_access_inventory writes."""
+    loaded = load_registry(path)
+    return {
+        "generated_at_utc": loaded["generated_at_utc"],
+        "snapshot_id": loaded["snapshot_id"],
+        "inputs": loaded["inputs"],
+        "stats": loaded["stats"],
+        "objects": loaded["objects"],
+        "queries": loaded["queries"],
+        "dependencies": loaded["dependencies"],
+        "source_catalog": loaded["source_catalog"],
+        "gate": loaded["gate"],
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export the JSON view of a SQLite access registry.")
+    parser.add_argument("--db", required=True, help="Path to access_registry_*.sqlite")
+    parser.add_argument("--out", help="Output JSON path (default: same name with .json)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    db_path = Path(args.db).expanduser().resolve()
+    out_path = Path(args.out).expanduser().resolve() if args.out else db_path.with_suffix(".json")
+    out_path.write_text(json.dumps(registry_to_json(db_path), indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote registry JSON view: {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        raise SystemExit(1)
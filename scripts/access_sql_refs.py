@@ -0,0 +1,235 @@
+"""
+Single-pass table-reference scanner for Access SQL, memoized by SQL SHA-256.
+
+`table_references(sql)` lexes the text once (bracketed, backticked and
+double-quoted identifiers; single-quoted strings; #date# literals; `--` and
+`/* */` comments) and follows a small amount of clause state while it goes:
+
+- FROM and UPDATE open a table list: every `,` at that parenthesis depth, and
+  every JOIN, expects another table.
+- A `(` where a table is expected is either a nested join group (the list
+  continues inside it) or a subquery (SELECT resets the state, so its own
+  FROM is picked up at the inner depth).
+- INTO expects exactly one table (SELECT ... INTO and INSERT INTO), so an
+  INSERT column list is not mistaken for a join group.
+- WHERE, GROUP, ORDER, HAVING, SET, UNION, PIVOT, VALUES and `;` close the
+  list; ON only stops expecting a table until the next JOIN or `,`.
+
+Names are the identifier as written, brackets/quotes removed; dotted names
+keep their dots and names containing `!` (form/control references) are
+skipped. Text inside strings or comments never produces a reference.
+
+`SqlRefCache` keeps scanned results keyed by the SHA-256 of the SQL text, in
+memory for the run and in a gzip'd JSON file across runs:
+
+    refs = SqlRefCache(Path("output/cache/sql_refs"))
+    names = refs.get(sql_text)
+    refs.save()
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import uuid
+from pathlib import Path
+
+SCANNER_VERSION = "v1"
+DEFAULT_SQL_REFS_CACHE = "output/cache/sql_refs"
+
+TOKEN_RE = re.compile(
+    r"""
+    (?P<space>\s+)
+    |(?P<comment>--[^\n\r]*|/\*.*?(?:\*/|\Z))
+    |(?P<bracket>\[[^\]]*\]?)
+    |(?P<backtick>`[^`]*`?)
+    |(?P<dquote>"(?:[^"]|"")*"?)
+    |(?P<squote>'(?:[^']|'')*'?)
+    |(?P<date>\#[^#\r\n]*\#)
+    |(?P<word>[\w$~]+)
+    |(?P<punct>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+TABLE_LIST_KEYWORDS = {"from", "update"}
+SINGLE_TABLE_KEYWORDS = {"into", "join"}
+CLOSING_KEYWORDS = {
+    "select",
+    "transform",
+    "where",
+    "group",
+    "order",
+    "having",
+    "set",
+    "union",
+    "pivot",
+    "values",
+    "parameters",
+    "with",
+}
+# Bare words that are never table names where a table is expected.
+RESERVED_WORDS = CLOSING_KEYWORDS | TABLE_LIST_KEYWORDS | SINGLE_TABLE_KEYWORDS | {
+    "distinct",
+    "distinctrow",
+    "top",
+    "inner",
+    "left",
+    "right",
+    "full",
+    "outer",
+    "cross",
+    "as",
+    "on",
+    "in",
+    "all",
+    "delete",
+    "insert",
+    "exists",
+    "not",
+}
+
+
+def sql_sha256(sql: str) -> str:
+    return hashlib.sha256(sql.encode("utf-8")).hexdigest()
+
+
+def _tokens(sql: str):
+    """Yield (kind, text) with whitespace and comments dropped; quoted kinds are unwrapped."""
+    for match in TOKEN_RE.finditer(sql):
+        kind = match.lastgroup
+        text = match.group()
+        if kind in ("space", "comment"):
+            continue
+        if kind in ("bracket", "backtick", "dquote"):
+            closer = text[0] if kind != "bracket" else "]"
+            inner = text[1:-1] if len(text) > 1 and text.endswith(closer) else text[1:]
+            if kind == "dquote":
+                inner = inner.replace('""', '"')
+            yield "name", inner
+        elif kind == "word":
+            yield "word", text
+        elif kind in ("squote", "date"):
+            yield "literal", text
+        else:
+            yield "punct", text
+
+
+def table_references(sql: str) -> set[str]:
+    refs: set[str] = set()
+    # One frame per open parenthesis: is a `,` at this depth another table?
+    in_table_list = [False]
+    expect_table = False
+    # Name being assembled from `a.b` / `a!b` parts while a table is expected.
+    parts: list[str] | None = None
+    skip_name = False
+    joiner = ""
+    after_dot = False
+
+    def finish_name() -> None:
+        nonlocal parts, skip_name
+        if parts and not skip_name:
+            name = ".".join(part.strip() for part in parts).strip()
+            if name:
+                refs.add(name)
+        parts = None
+        skip_name = False
+
+    for kind, text in _tokens(sql):
+        qualified = after_dot
+        after_dot = kind == "punct" and text in ".!"
+        if parts is not None:
+            if joiner:
+                if kind in ("name", "word"):
+                    parts.append(text)
+                    joiner = ""
+                    continue
+                # `tbl.*` and similar: keep what we have.
+                joiner = ""
+            elif kind == "punct" and text in ".!":
+                joiner = text
+                if text == "!":
+                    skip_name = True
+                continue
+            finish_name()
+
+        lowered = text.lower() if kind == "word" else ""
+        # `tbl.Update` is a column, not the UPDATE keyword.
+        if kind == "name" or (kind == "word" and (qualified or lowered not in RESERVED_WORDS)):
+            if expect_table:
+                parts = [text]
+                expect_table = False
+            continue
+
+        if kind == "word":
+            if lowered in TABLE_LIST_KEYWORDS:
+                in_table_list[-1] = True
+                expect_table = True
+            elif lowered in SINGLE_TABLE_KEYWORDS:
+                expect_table = True
+            elif lowered == "on":
+                expect_table = False
+            elif lowered in CLOSING_KEYWORDS:
+                in_table_list[-1] = False
+                expect_table = False
+            continue
+
+        if kind == "punct":
+            if text == "(":
+                # A bracket where a table is expected continues the table list inside it.
+                in_table_list.append(expect_table)
+            elif text == ")":
+                if len(in_table_list) > 1:
+                    in_table_list.pop()
+                expect_table = False
+            elif text == ",":
+                expect_table = in_table_list[-1]
+            elif text == ";":
+                in_table_list = [False]
+                expect_table = False
+
+    if parts is not None:
+        finish_name()
+    return refs
+
+
+class SqlRefCache:
+    """Memo of `table_references` keyed by SQL SHA-256; `root=None` keeps it in memory only."""
+
+    def __init__(self, root: Path | None) -> None:
+        self.path = root / f"table_refs.{SCANNER_VERSION}.json.gz" if root else None
+        self.entries: dict[str, list[str]] = {}
+        self.dirty = False
+        self.stats = {"hits": 0, "misses": 0, "loaded": 0}
+        if self.path:
+            try:
+                with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+                    self.entries = json.load(handle)
+            except (OSError, ValueError, EOFError):
+                self.entries = {}
+            self.stats["loaded"] = len(self.entries)
+
+    def get(self, sql: str) -> set[str]:
+        digest = sql_sha256(sql)
+        cached = self.entries.get(digest)
+        if cached is not None:
+            self.stats["hits"] += 1
+            return set(cached)
+        self.stats["misses"] += 1
+        refs = table_references(sql)
+        self.entries[digest] = sorted(refs)
+        self.dirty = True
+        return refs
+
+    def save(self) -> None:
+        if not self.path or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        raw = json.dumps(self.entries, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+        tmp = self.path.with_name(f".{self.path.name}.{uuid.uuid4().hex}.partial")
+        tmp.write_bytes(gzip.compress(raw.encode("utf-8"), compresslevel=6, mtime=0))
+        os.replace(tmp, self.path)
+        self.dirty = False
@@ -0,0 +1,152 @@
+"""
+Content-addressed cache of parsed Access table reads.
+
+The parity and audit scripts read the same system tables (MSysObjects,
+MSysQueries, MSysAccessStorage) and table catalogs from the same .accdb files
+on every run. `TableCache` stores each parsed result under the SHA-256 of the
+Access file, so an unchanged file is answered from disk without starting
+mdb-sql or mdb-export, and any edit to the file misses the cache on its own.
+
+Layout under the cache root:
+
+    probes.json                                     path -> {size, mtime_ns, sha256}
+    v1/<sha[:2]>/<sha>/<table>.<cols>.json.gz         {"columns": [...], "rows": [[...], ...]}
+    v1/<sha[:2]>/<sha>/binary/<table>.<cols>.json.gz  same, for binary mdb-export reads
+
+Entries are gzip'd JSON with one column list and positional rows, rather
+than one dict per row. `<cols>` is a short hash of the requested column list
+("all" when every column was read), so callers that read different columns
+of the same table do not collide. Binary reads (mdb-export, used for tables
+whose blob columns mdb-sql cannot return) live under their own `binary/`
+directory, so they never answer a delimited mdb-sql read of the same table
+and columns, or the other way round. File hashes are reused while size and
+mtime are unchanged, the same rule extract_legacy_access_snapshot uses for
+its source probes.
+
+`mdb_broker.AccessReader` consults the cache when one is configured:
+
+    from mdb_broker import configure_table_cache
+    configure_table_cache(Path("output/cache/access_tables"))
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Sequence
+
+CACHE_FORMAT = "v1"
+DEFAULT_CACHE_ROOT = "output/cache/access_tables"
+CATALOG_TABLE = "__catalog__"
+
+
+def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def columns_key(columns: Sequence[str] | None) -> str:
+    if not columns:
+        return "all"
+    return hashlib.sha256("\x1f".join(columns).encode("utf-8")).hexdigest()[:12]
+
+
+def safe_table_name(table: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in table)
+
+
+class TableCache:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.lock = threading.Lock()
+        self.probes: dict[str, dict] | None = None
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "files_hashed": 0}
+
+    def _load_probes(self) -> dict[str, dict]:
+        if self.probes is None:
+            try:
+                self.probes = json.loads((self.root / "probes.json").read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self.probes = {}
+        return self.probes
+
+    def fingerprint(self, db_path: Path) -> str:
+        """SHA-256 of the Access file, rehashed only when size or mtime moved."""
+        resolved = db_path.resolve()
+        stat = resolved.stat()
+        with self.lock:
+            probes = self._load_probes()
+            previous = probes.get(str(resolved))
+            if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+                return str(previous["sha256"])
+        digest = sha256_file(resolved)
+        with self.lock:
+            probes = self._load_probes()
+            probes[str(resolved)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+            self.stats["files_hashed"] += 1
+            self._write_atomic(self.root / "probes.json", (json.dumps(probes, indent=2, sort_keys=True) + "\n").encode())
+        return digest
+
+    def entry_path(
+        self, file_sha: str, table: str, columns: Sequence[str] | None, binary: bool = False
+    ) -> Path:
+        name = f"{safe_table_name(table)}.{columns_key(columns)}.json.gz"
+        entry_dir = self.root / CACHE_FORMAT / file_sha[:2] / file_sha
+        return (entry_dir / "binary" if binary else entry_dir) / name
+
+    def get(
+        self, file_sha: str, table: str, columns: Sequence[str] | None, binary: bool = False
+    ) -> list[dict[str, str]] | None:
+        path = self.entry_path(file_sha, table, columns, binary)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError, EOFError):
+            self.stats["misses"] += 1
+            return None
+        header = payload["columns"]
+        self.stats["hits"] += 1
+        return [dict(zip(header, values)) for values in payload["rows"]]
+
+    def put(
+        self,
+        file_sha: str,
+        table: str,
+        columns: Sequence[str] | None,
+        rows: list[dict[str, str]],
+        binary: bool = False,
+    ) -> None:
+        header = list(columns) if columns else (list(rows[0].keys()) if rows else [])
+        payload = {
+            "table": table,
+            "columns": header,
+            "rows": [[row.get(column, "") for column in header] for row in rows],
+        }
+        raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        self._write_atomic(self.entry_path(file_sha, table, columns, binary), gzip.compress(raw, compresslevel=6, mtime=0))
+        self.stats["writes"] += 1
+
+    def get_catalog(self, file_sha: str, include_system: bool) -> list[str] | None:
+        rows = self.get(file_sha, CATALOG_TABLE, ("system",) if include_system else ("user",))
+        return None if rows is None else [row["name"] for row in rows]
+
+    def put_catalog(self, file_sha: str, include_system: bool, tables: list[str]) -> None:
+        columns = ("system",) if include_system else ("user",)
+        path = self.entry_path(file_sha, CATALOG_TABLE, columns)
+        raw = json.dumps({"table": CATALOG_TABLE, "columns": ["name"], "rows": [[name] for name in tables]})
+        self._write_atomic(path, gzip.compress(raw.encode("utf-8"), mtime=0))
+        self.stats["writes"] += 1
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.partial")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
@@ -26,7 +26,10 @@ import sys
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Sequence
+
+from access_table_cache import DEFAULT_CACHE_ROOT
+from mdb_broker import MSYSOBJECTS_COLUMNS, MSYSQUERIES_COLUMNS, access_reader, configure_table_cache
 
 try:
     csv.field_size_limit(sys.maxsize)
@@ -75,6 +78,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Exit non-zero if any module/report/canonical-query remains unaccounted.",
     )
+    parser.add_argument(
+        "--access-cache-dir",
+        default=DEFAULT_CACHE_ROOT,
+        help=f"Cache of parsed Access table reads keyed by file SHA-256 (default: {DEFAULT_CACHE_ROOT})",
+    )
+    parser.add_argument("--no-access-cache", action="store_true", help="Always read Access tables with mdbtools")
     return parser.parse_args()
 
 
@@ -103,10 +112,21 @@ def run_command(args: list[str], *, stdin_text: str | None = None) -> str:
     return (proc.stdout or b"").decode("utf-8", errors="replace")
 
 
-def export_system_table(front_end_path: Path, table_name: str, out_path: Path) -> None:
-    data = run_command(["mdb-export", str(front_end_path), table_name])
+def export_system_table(
+    front_end_path: Path,
+    table_name: str,
+    out_path: Path,
+    columns: Sequence[str] | None = None,
+    *,
+    binary: bool = False,
+) -> None:
+    rows = access_reader().read_table(front_end_path, table_name, columns, binary=binary)
+    fieldnames = list(columns) if columns else (list(rows[0].keys()) if rows else [])
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(data, encoding="utf-8")
+    with out_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=fieldnames, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
 
 
 def load_csv_rows(path: Path) -> list[dict[str, str]]:
@@ -331,6 +351,7 @@ def build_markdown(report: dict) -> str:
 def main() -> int:
     args = parse_args()
     require_tool("mdb-export")
+    configure_table_cache(None if args.no_access_cache else Path(args.access_cache_dir))
 
     front_end_path = Path(args.front_end_path).expanduser().resolve()
     if not front_end_path.exists():
@@ -345,9 +366,10 @@ def main() -> int:
     msysobjects_csv = tmp_dir / "msysobjects_frontend.csv"
     msysqueries_csv = tmp_dir / "msysqueries_frontend.csv"
     msysaccessstorage_csv = tmp_dir / "msysaccessstorage_frontend.csv"
-    export_system_table(front_end_path, "MSysObjects", msysobjects_csv)
-    export_system_table(front_end_path, "MSysQueries", msysqueries_csv)
-    export_system_table(front_end_path, "MSysAccessStorage", msysaccessstorage_csv)
+    export_system_table(front_end_path, "MSysObjects", msysobjects_csv, MSYSOBJECTS_COLUMNS)
+    export_system_table(front_end_path, "MSysQueries", msysqueries_csv, MSYSQUERIES_COLUMNS)
+    # Lv is a binary blob; delimited mdb-sql output cannot carry it safely.
+    export_system_table(front_end_path, "MSysAccessStorage", msysaccessstorage_csv, binary=True)
 
     msysobjects_rows = load_csv_rows(msysobjects_csv)
     msysqueries_rows = load_csv_rows(msysqueries_csv)
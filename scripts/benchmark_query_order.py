@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Benchmark the query-ordering topological sort on synthetic dependency graphs.
+
+Builds graphs of increasing size with Access-style query names (numeric
+suffixes, mixed case) and a small share of back edges that form cycles, then
+times `parity_table_taps.order_components` (SCC condensation + heap sort).
+Every run checks that cross-component edges point forward in the result. Up
+to --reference-max nodes the acyclic part of each graph is also checked
+against the previous re-sort-per-step implementation, kept here as
+`reference_topo_sort`, so the benchmark doubles as an ordering-equivalence
+test.
+
+Usage:
+  python3 scripts/benchmark_query_order.py --sizes 1000 5000 20000 50000
+
+Outputs:
+- output/analysis/benchmark_query_order_<timestamp>.json
+- output/analysis/benchmark_query_order_<timestamp>.md
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from parity_table_taps import ComponentOrder, order_components, sequence_sort_key, topo_sort_with_fallback
+
+NAME_AREAS = ("Evaluee", "Job_Bank", "XLU_Occupations", "Clients", "TSP", "Profiles", "Reports", "System")
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def timestamp_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def reference_topo_sort(nodes: list[str], edges: set[tuple[str, str]]) -> tuple[list[str], list[str]]:
+    """The pre-heap implementation: pop(0) and a full frontier re-sort after every node."""
+    adjacency: dict[str, set[str]] = {name: set() for name in nodes}
+    indegree: dict[str, int] = {name: 0 for name in nodes}
+    for src, dst in edges:
+        if src not in adjacency or dst not in adjacency or src == dst:
+            continue
+        if dst in adjacency[src]:
+            continue
+        adjacency[src].add(dst)
+        indegree[dst] += 1
+
+    frontier = sorted([name for name in nodes if indegree[name] == 0], key=lambda n: (sequence_sort_key(n), n.lower()))
+    ordered: list[str] = []
+    while frontier:
+        current = frontier.pop(0)
+        ordered.append(current)
+        for neighbor in sorted(adjacency[current], key=lambda n: (sequence_sort_key(n), n.lower())):
+            indegree[neighbor] -= 1
+            if indegree[neighbor] == 0:
+                frontier.append(neighbor)
+        frontier.sort(key=lambda n: (sequence_sort_key(n), n.lower()))
+
+    placed = set(ordered)
+    cycle_nodes = sorted([name for name in nodes if name not in placed], key=lambda n: (sequence_sort_key(n), n.lower()))
+    ordered.extend(cycle_nodes)
+    return ordered, cycle_nodes
+
+
+def synthetic_graph(size: int, edges_per_node: float, cycle_fraction: float, seed: int) -> tuple[list[str], set[tuple[str, str]]]:
+    rng = random.Random(seed + size)
+    nodes = []
+    for idx in range(size):
+        area = NAME_AREAS[idx % len(NAME_AREAS)]
+        prefix = "qry" if idx % 7 else "QRY"
+        nodes.append(f"{prefix}{area}_{idx // len(NAME_AREAS)}_Step{rng.randint(1, 40)}_{idx}")
+
+    edges: set[tuple[str, str]] = set()
+    for idx in range(1, size):
+        for _ in range(rng.randint(0, max(1, round(edges_per_node * 2)))):
+            # Mostly edges towards earlier nodes (a DAG); a few point forward and close cycles.
+            target = rng.randrange(0, idx) if rng.random() >= cycle_fraction else rng.randrange(idx, size)
+            edges.add((nodes[idx], nodes[target]))
+    shuffled = nodes[:]
+    rng.shuffle(shuffled)
+    return sorted(shuffled, key=str.lower), edges
+
+
+def acyclic_edges(edges: set[tuple[str, str]]) -> set[tuple[str, str]]:
+    """Keep only edges towards earlier-generated nodes (the trailing `_<idx>` in each name)."""
+    return {(src, dst) for src, dst in edges if int(dst.rsplit("_", 1)[1]) < int(src.rsplit("_", 1)[1])}
+
+
+def check_condensation(order: ComponentOrder, edges: set[tuple[str, str]]) -> None:
+    for src, dst in edges:
+        a, b = order.component_of[src], order.component_of[dst]
+        if a != b and (a >= b or order.levels[a] >= order.levels[b]):
+            raise RuntimeError(f"edge {src} -> {dst} is not ordered across components {a} -> {b}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark deterministic query ordering on synthetic graphs.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 2000, 5000, 10000, 20000, 50000])
+    parser.add_argument("--edges-per-node", type=float, default=1.5, help="Average dependencies per query")
+    parser.add_argument("--cycle-fraction", type=float, default=0.01, help="Share of edges that point forward")
+    parser.add_argument(
+        "--reference-max",
+        type=int,
+        default=5000,
+        help="Largest size also run through the quadratic reference for an equality check",
+    )
+    parser.add_argument("--seed", type=int, default=20260219)
+    parser.add_argument("--out-dir", default="output/analysis", help="Output directory")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    rows = []
+    for size in sorted(set(args.sizes)):
+        nodes, edges = synthetic_graph(size, args.edges_per_node, args.cycle_fraction, args.seed)
+        started = time.perf_counter()
+        order = order_components(nodes, edges)
+        heap_seconds = time.perf_counter() - started
+        check_condensation(order, edges)
+        cycle_nodes = order.cycle_nodes
+
+        reference_seconds = None
+        identical = None
+        if size <= args.reference_max:
+            dag_edges = acyclic_edges(edges)
+            actual = topo_sort_with_fallback(nodes, dag_edges)
+            started = time.perf_counter()
+            expected = reference_topo_sort(nodes, dag_edges)
+            reference_seconds = time.perf_counter() - started
+            identical = expected == actual
+            if not identical:
+                raise RuntimeError(f"heap ordering differs from reference at size {size}")
+
+        rows.append(
+            {
+                "nodes": size,
+                "edges": len(edges),
+                "cycle_nodes": len(cycle_nodes),
+                "components": len(order.components),
+                "levels": max(order.levels) + 1 if order.levels else 0,
+                "heap_seconds": round(heap_seconds, 4),
+                "heap_us_per_node_log_node": round(heap_seconds * 1e6 / (size * math.log2(max(size, 2))), 3),
+                "reference_seconds": round(reference_seconds, 4) if reference_seconds is not None else None,
+                "identical_to_reference": identical,
+            }
+        )
+        print(json.dumps(rows[-1]))
+
+    report = {
+        "generated_at_utc": now_iso(),
+        "parameters": {
+            "sizes": sorted(set(args.sizes)),
+            "edges_per_node": args.edges_per_node,
+            "cycle_fraction": args.cycle_fraction,
+            "reference_max": args.reference_max,
+            "seed": args.seed,
+        },
+        "results": rows,
+    }
+
+    stamp = timestamp_id()
+    out_dir = Path(args.out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    json_path = out_dir / f"benchmark_query_order_{stamp}.json"
+    json_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    lines = [
+        "# Query Order Benchmark",
+        "",
+        f"- Generated: `{report['generated_at_utc']}`",
+        f"- Edges per node: {args.edges_per_node}; forward (cycle) edge share: {args.cycle_fraction}",
+        "",
+        "| Nodes | Edges | Cycle nodes | Components | Levels | Sort (s) | µs / (n log n) | Reference (s) | Identical (DAG) |",
+        "|---:|---:|---:|---:|---:|---:|---:|---:|---|",
+    ]
+    for row in rows:
+        reference = "-" if row["reference_seconds"] is None else f"{row['reference_seconds']:.4f}"
+        identical = "-" if row["identical_to_reference"] is None else ("yes" if row["identical_to_reference"] else "NO")
+        lines.append(
+            f"| {row['nodes']} | {row['edges']} | {row['cycle_nodes']} | {row['components']} | {row['levels']} | "
+            f"{row['heap_seconds']:.4f} | "
+            f"{row['heap_us_per_node_log_node']} | {reference} | {identical} |"
+        )
+    md_path = out_dir / f"benchmark_query_order_{stamp}.md"
+    md_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    print(f"Wrote benchmark: {json_path}")
+    print(f"Wrote markdown: {md_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        raise SystemExit(1)
@@ -7,6 +7,19 @@ Usage:
     --front-end-path "/path/to/MVQS_DC_FrontEnd_with_Adobe.accdb" \
     --data-path "/path/to/MVQS_DC_Data.accdb" \
     --jobbank-path "/path/to/MVQS_DC_Data_JobBank.accdb"
+
+Snapshots are incremental: each source database is probed (size, mtime,
+SHA-256) and compared with the latest earlier manifest under --output-root.
+Tables from unchanged sources are not re-exported. Table CSVs and schemas
+are stored once in a content-addressed blob store (<output-root>/blobs) and
+hard-linked into each snapshot, so identical tables share one file on disk.
+
+Every exported table gets per-column profiles (distinct estimate, min/max,
+histogram, top values, inferred type) in the same streaming pass; see
+legacy_column_profile.py for the snapshot-to-snapshot drift diff.
+
+With --sqlite the exported tables are also loaded into a typed
+<snapshot>/legacy_snapshot.sqlite (see legacy_snapshot_sqlite.py).
 """
 
 from __future__ import annotations
@@ -14,15 +27,23 @@ from __future__ import annotations
 import argparse
 import csv
 import hashlib
+import io
 import json
 import os
 import shutil
 import subprocess
 import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+from legacy_column_profile import profile_csv_rows
+from legacy_snapshot_sqlite import build_snapshot_sqlite
 
 
 @dataclass(frozen=True)
@@ -62,6 +83,40 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Continue if a table or source DB is missing (records failures in manifest)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent mdb-schema/mdb-export processes (default: 4)",
+    )
+    parser.add_argument(
+        "--blob-root",
+        help="Content-addressed blob store for table CSVs and schemas (default: <output-root>/blobs)",
+    )
+    parser.add_argument(
+        "--baseline-snapshot",
+        help="Snapshot id to compare sources against (default: latest earlier manifest under --output-root)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-export every table even when source databases are unchanged",
+    )
+    parser.add_argument(
+        "--rehash-sources",
+        action="store_true",
+        help="Always hash source databases instead of trusting an unchanged size + mtime",
+    )
+    parser.add_argument(
+        "--no-column-profile",
+        action="store_true",
+        help="Only record row and null counts per column (skip distinct/min/max/histogram/top-k profiles)",
+    )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="Also load exported tables into a typed <snapshot>/legacy_snapshot.sqlite",
+    )
     return parser.parse_args()
 
 
@@ -93,57 +148,269 @@ def sha256_bytes(raw: bytes) -> str:
     return hashlib.sha256(raw).hexdigest()
 
 
+def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def probe_source(path: Path, previous: dict[str, Any] | None, *, rehash: bool = False) -> dict[str, Any]:
+    """
+    Return {path, size, mtime_ns, sha256, hash_reused} for a source database.
+
+    When size and mtime match the previous probe the stored hash is trusted,
+    so unchanged multi-GB .accdb files are not re-read on every run.
+    """
+    stat = path.stat()
+    probe: dict[str, Any] = {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if (
+        not rehash
+        and previous
+        and previous.get("sha256")
+        and previous.get("size") == probe["size"]
+        and previous.get("mtime_ns") == probe["mtime_ns"]
+    ):
+        probe["sha256"] = previous["sha256"]
+        probe["hash_reused"] = True
+    else:
+        probe["sha256"] = sha256_file(path)
+        probe["hash_reused"] = False
+    return probe
+
+
+def find_baseline_manifest(output_root: Path, snapshot_id: str, baseline_id: str | None) -> dict[str, Any] | None:
+    if baseline_id:
+        path = output_root / baseline_id / "legacy_snapshot_manifest.json"
+        if not path.exists():
+            raise RuntimeError(f"baseline snapshot manifest not found: {path}")
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    latest: dict[str, Any] | None = None
+    for candidate in output_root.glob("*/legacy_snapshot_manifest.json"):
+        if candidate.parent.name == snapshot_id:
+            continue
+        try:
+            manifest = json.loads(candidate.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        if latest is None or str(manifest.get("extracted_at_utc", "")) > str(latest.get("extracted_at_utc", "")):
+            latest = manifest
+    return latest
+
+
+class BlobStore:
+    """Content-addressed file store: <root>/<sha[:2]>/<sha><suffix>."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.tmp_dir = root / "tmp"
+
+    def path_for(self, sha256: str, suffix: str) -> Path:
+        return self.root / sha256[:2] / f"{sha256}{suffix}"
+
+    def temp_path(self, name: str) -> Path:
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        return self.tmp_dir / f"{sanitize_name(name)}.{uuid.uuid4().hex}.partial"
+
+    def adopt(self, src: Path, sha256: str, suffix: str, *, move: bool) -> Path:
+        """Store `src` under its hash; an existing blob wins and `src` is dropped when moving."""
+        blob = self.path_for(sha256, suffix)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        if blob.exists():
+            if move:
+                src.unlink(missing_ok=True)
+            return blob
+        if move:
+            os.replace(src, blob)
+        else:
+            link_or_copy(src, blob)
+        return blob
+
+
+def link_or_copy(src: Path, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.unlink(missing_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
 def write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(text, encoding="utf-8")
 
 
-def write_bytes(path: Path, data: bytes) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_bytes(data)
-
-
-def csv_stats(csv_text: str) -> dict[str, Any]:
-    reader = csv.DictReader(csv_text.splitlines())
-    if reader.fieldnames is None:
-        return {"row_count": 0, "columns": []}
-
-    null_counts: dict[str, int] = {name: 0 for name in reader.fieldnames}
-    row_count = 0
-    for row in reader:
-        row_count += 1
-        for name in reader.fieldnames:
-            value = row.get(name)
-            if value is None or str(value).strip() == "":
-                null_counts[name] += 1
-
-    columns = []
-    for name in reader.fieldnames:
-        null_count = null_counts[name]
-        null_rate = (null_count / row_count) if row_count > 0 else 0.0
-        columns.append(
-            {
-                "name": name,
-                "null_count": null_count,
-                "null_rate": round(null_rate, 6),
-            }
-        )
-    return {"row_count": row_count, "columns": columns}
+def csv_stats(lines: Iterable[str], profile: bool = True) -> dict[str, Any]:
+    """Row count and per-column null counts, plus streaming column profiles when `profile` is set."""
+    return profile_csv_rows(csv.reader(lines), detailed=profile)
 
 
-def export_schema(db_path: Path, out_path: Path) -> dict[str, Any]:
+def export_schema(db_path: Path, out_path: Path, blobs: BlobStore) -> dict[str, Any]:
+    started = time.perf_counter()
     proc = run_command(["mdb-schema", str(db_path), "sqlite"], check=False)
     schema_text = proc.stdout or ""
-    write_text(out_path, schema_text)
+    sha256 = sha256_bytes(schema_text.encode("utf-8"))
+    blob = blobs.path_for(sha256, ".sql")
+    if not blob.exists():
+        write_text(blob, schema_text)
+    link_or_copy(blob, out_path)
     return {
         "path": str(out_path),
-        "sha256": sha256_bytes(schema_text.encode("utf-8")),
+        "blob_path": str(blob),
+        "sha256": sha256,
         "exit_code": proc.returncode,
+        "export_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def export_table_to_file(db_path: Path, table_name: str, out_path: Path, profile: bool = True) -> dict[str, Any]:
+    """
+    Stream `mdb-export` stdout straight into `out_path`.
+
+    The same pass updates the SHA-256 and feeds `csv_stats`, so memory stays
+    flat regardless of table size. Lines are newline-normalized exactly as the
+    previous in-memory text capture was.
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    with tempfile.TemporaryFile() as stderr_file, out_path.open("wb") as handle:
+        proc = subprocess.Popen(["mdb-export", str(db_path), table_name], stdout=subprocess.PIPE, stderr=stderr_file)
+        stream = io.TextIOWrapper(proc.stdout, encoding="utf-8")
+
+        def tee_lines() -> Iterator[str]:
+            for line in stream:
+                raw = line.encode("utf-8")
+                handle.write(raw)
+                digest.update(raw)
+                yield line
+
+        try:
+            stats = csv_stats(tee_lines(), profile=profile)
+            for _ in tee_lines():
+                pass
+        finally:
+            stream.close()
+            returncode = proc.wait()
+        stderr_file.seek(0)
+        stderr_text = stderr_file.read().decode("utf-8", errors="replace")
+
+    if returncode != 0:
+        out_path.unlink(missing_ok=True)
+    return {
+        "returncode": returncode,
+        "stderr": stderr_text,
+        "sha256": digest.hexdigest(),
+        "row_count": stats["row_count"],
+        "columns": stats["columns"],
     }
 
 
-def export_table(db_path: Path, table_name: str) -> subprocess.CompletedProcess[str]:
-    return run_command(["mdb-export", str(db_path), table_name], check=False)
+def table_path(output_dir: Path, target: ExtractTarget) -> Path:
+    return output_dir / "tables" / f"{target.source_key}__{sanitize_name(target.table)}.csv"
+
+
+def extract_target(
+    target: ExtractTarget,
+    db_path: Path,
+    output_dir: Path,
+    blobs: BlobStore,
+    profile: bool = True,
+) -> tuple[dict[str, Any] | None, str | None]:
+    """Export one table into the blob store and return (manifest object, error message)."""
+    started = time.perf_counter()
+    table_file = table_path(output_dir, target)
+    staging = blobs.temp_path(f"{target.source_key}__{target.table}")
+    try:
+        result = export_table_to_file(db_path, target.table, staging, profile=profile)
+    except BaseException:
+        staging.unlink(missing_ok=True)
+        raise
+    if result["returncode"] != 0:
+        message = (
+            f"table export failed for {target.table} from {target.source_key}: "
+            f"{result['stderr'].strip()[:500]}"
+        )
+        return None, message
+
+    blob = blobs.adopt(staging, result["sha256"], ".csv", move=True)
+    link_or_copy(blob, table_file)
+    return (
+        {
+            "table": target.table,
+            "source": target.source_key,
+            "db_path": str(db_path),
+            "csv_path": str(table_file),
+            "blob_path": str(blob),
+            "record_count": result["row_count"],
+            "sha256": result["sha256"],
+            "field_dictionary": result["columns"],
+            "export_seconds": round(time.perf_counter() - started, 3),
+        },
+        None,
+    )
+
+
+def reuse_artifact(
+    previous: dict[str, Any],
+    path_key: str,
+    out_path: Path,
+    blobs: BlobStore,
+    suffix: str,
+) -> Path | None:
+    """
+    Link a baseline artifact's blob into this snapshot, adopting pre-blob
+    snapshots' files into the store on first sight. None means re-export.
+    """
+    sha256 = previous.get("sha256")
+    if not sha256:
+        return None
+    blob = blobs.path_for(sha256, suffix)
+    if not blob.exists():
+        legacy_path = Path(str(previous.get(path_key) or ""))
+        if not legacy_path.is_file() or sha256_file(legacy_path) != sha256:
+            return None
+        blobs.adopt(legacy_path, sha256, suffix, move=False)
+    link_or_copy(blob, out_path)
+    return blob
+
+
+def has_column_profiles(entry: dict[str, Any]) -> bool:
+    return all("profile" in field for field in entry.get("field_dictionary") or [])
+
+
+def reuse_target(
+    target: ExtractTarget,
+    previous: dict[str, Any],
+    output_dir: Path,
+    blobs: BlobStore,
+    baseline_id: str,
+    profile: bool = True,
+) -> dict[str, Any] | None:
+    """
+    Link the baseline's CSV for an unchanged table. A baseline exported
+    without column profiles (--no-column-profile, or manifest v1) is
+    re-profiled from the reused blob when profiling is on.
+    """
+    table_file = table_path(output_dir, target)
+    blob = reuse_artifact(previous, "csv_path", table_file, blobs, ".csv")
+    if blob is None:
+        return None
+    entry = dict(previous)
+    entry.pop("reprofiled", None)
+    if profile and not has_column_profiles(previous):
+        with blob.open("r", encoding="utf-8") as handle:
+            stats = csv_stats(handle, profile=True)
+        entry["record_count"] = stats["row_count"]
+        entry["field_dictionary"] = stats["columns"]
+        entry["reprofiled"] = True
+    entry["csv_path"] = str(table_file)
+    entry["blob_path"] = str(blob)
+    entry["export_seconds"] = 0.0
+    entry["reused_from_snapshot"] = baseline_id
+    return entry
 
 
 def main() -> int:
@@ -165,75 +432,162 @@ def main() -> int:
             raise RuntimeError(f"{key} database not found: {path}")
 
     snapshot_id = args.snapshot_id or timestamp_id()
-    output_dir = Path(args.output_root).expanduser().resolve() / snapshot_id
+    output_root = Path(args.output_root).expanduser().resolve()
+    output_dir = output_root / snapshot_id
     output_dir.mkdir(parents=True, exist_ok=True)
+    blobs = BlobStore(Path(args.blob_root).expanduser().resolve() if args.blob_root else output_root / "blobs")
+
+    baseline = find_baseline_manifest(output_root, snapshot_id, args.baseline_snapshot)
+    baseline_id = str(baseline.get("snapshot_id")) if baseline else None
+    baseline_probes = (baseline or {}).get("source_probes") or {}
+    baseline_objects = {
+        (str(entry.get("source")), str(entry.get("table"))): entry for entry in (baseline or {}).get("objects", [])
+    }
+    baseline_schemas = (baseline or {}).get("schemas") or {}
+
+    source_probes = {
+        key: probe_source(path, baseline_probes.get(key), rehash=args.rehash_sources)
+        for key, path in source_paths.items()
+        if path is not None
+    }
+    unchanged_sources = {
+        key
+        for key, probe in source_probes.items()
+        if not args.full
+        and baseline_id is not None
+        and (baseline_probes.get(key) or {}).get("sha256") == probe["sha256"]
+    }
 
     manifest: dict[str, Any] = {
-        "manifest_version": 1,
+        "manifest_version": 2,
         "snapshot_id": snapshot_id,
         "extracted_at_utc": now_iso(),
         "source_paths": {key: (str(path) if path else None) for key, path in source_paths.items()},
+        "source_probes": source_probes,
+        "blob_root": str(blobs.root),
         "objects": [],
         "schemas": {},
         "errors": [],
     }
 
-    for key, db_path in source_paths.items():
-        if db_path is None:
+    reused_schemas: dict[str, dict[str, Any]] = {}
+    for key in sorted(unchanged_sources):
+        previous = baseline_schemas.get(key)
+        if not previous or previous.get("exit_code") != 0:
             continue
-        schema_path = output_dir / "schemas" / f"{key}.schema.sql"
-        try:
-            manifest["schemas"][key] = export_schema(db_path, schema_path)
-        except Exception as exc:  # pragma: no cover - environment-specific
-            message = f"schema export failed for {key}: {exc}"
-            manifest["errors"].append(message)
-            if not args.allow_missing:
-                raise RuntimeError(message) from exc
+        out_path = output_dir / "schemas" / f"{key}.schema.sql"
+        blob = reuse_artifact(previous, "path", out_path, blobs, ".sql")
+        if blob is not None:
+            reused_schemas[key] = {
+                **previous,
+                "path": str(out_path),
+                "blob_path": str(blob),
+                "export_seconds": 0.0,
+                "reused_from_snapshot": baseline_id,
+            }
 
+    reused_tables: dict[str, dict[str, Any]] = {}
     for target in DEFAULT_TARGETS:
-        db_path = source_paths.get(target.source_key)
-        if db_path is None:
-            message = f"source database not provided for table {target.table} (source={target.source_key})"
-            manifest["errors"].append(message)
-            if not args.allow_missing:
-                raise RuntimeError(message)
+        previous = baseline_objects.get((target.source_key, target.table))
+        if target.source_key not in unchanged_sources or previous is None:
             continue
-
-        proc = export_table(db_path, target.table)
-        if proc.returncode != 0:
-            message = (
-                f"table export failed for {target.table} from {target.source_key}: "
-                f"{(proc.stderr or proc.stdout or '').strip()[:500]}"
+        entry = reuse_target(target, previous, output_dir, blobs, str(baseline_id), not args.no_column_profile)
+        if entry is not None:
+            reused_tables[target.table] = entry
+
+    if not args.allow_missing:
+        for target in DEFAULT_TARGETS:
+            if target.table not in reused_tables and source_paths.get(target.source_key) is None:
+                raise RuntimeError(
+                    f"source database not provided for table {target.table} (source={target.source_key})"
+                )
+
+    workers = max(1, args.workers)
+    manifest["workers"] = workers
+    manifest["column_profiles"] = not args.no_column_profile
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        schema_jobs = {
+            key: pool.submit(export_schema, db_path, output_dir / "schemas" / f"{key}.schema.sql", blobs)
+            for key, db_path in source_paths.items()
+            if db_path is not None and key not in reused_schemas
+        }
+        table_jobs = [
+            (
+                target,
+                pool.submit(
+                    extract_target,
+                    target,
+                    source_paths[target.source_key],
+                    output_dir,
+                    blobs,
+                    not args.no_column_profile,
+                ),
             )
-            manifest["errors"].append(message)
-            if not args.allow_missing:
-                raise RuntimeError(message)
-            continue
+            if source_paths.get(target.source_key) is not None and target.table not in reused_tables
+            else (target, None)
+            for target in DEFAULT_TARGETS
+        ]
 
-        csv_text = proc.stdout or ""
-        csv_bytes = csv_text.encode("utf-8")
-        table_file = output_dir / "tables" / f"{target.source_key}__{sanitize_name(target.table)}.csv"
-        write_bytes(table_file, csv_bytes)
-        stats = csv_stats(csv_text)
-        manifest["objects"].append(
-            {
-                "table": target.table,
-                "source": target.source_key,
-                "db_path": str(db_path),
-                "csv_path": str(table_file),
-                "record_count": stats["row_count"],
-                "sha256": sha256_bytes(csv_bytes),
-                "field_dictionary": stats["columns"],
-            }
-        )
+        # Collect in submission order so manifest ordering is deterministic.
+        try:
+            for key, db_path in source_paths.items():
+                if key in reused_schemas:
+                    manifest["schemas"][key] = reused_schemas[key]
+                    continue
+                if key not in schema_jobs:
+                    continue
+                try:
+                    manifest["schemas"][key] = schema_jobs[key].result()
+                except Exception as exc:  # pragma: no cover - environment-specific
+                    message = f"schema export failed for {key}: {exc}"
+                    manifest["errors"].append(message)
+                    if not args.allow_missing:
+                        raise RuntimeError(message) from exc
+
+            for target, job in table_jobs:
+                if target.table in reused_tables:
+                    manifest["objects"].append(reused_tables[target.table])
+                    continue
+                if job is None:
+                    message = f"source database not provided for table {target.table} (source={target.source_key})"
+                    manifest["errors"].append(message)
+                    if not args.allow_missing:
+                        raise RuntimeError(message)
+                    continue
+
+                entry, message = job.result()
+                if message is not None:
+                    manifest["errors"].append(message)
+                    if not args.allow_missing:
+                        raise RuntimeError(message)
+                    continue
+                manifest["objects"].append(entry)
+        except BaseException:
+            # Fail now instead of waiting for every queued export to finish.
+            pool.shutdown(cancel_futures=True)
+            raise
+
+    manifest["incremental"] = {
+        "baseline_snapshot": baseline_id,
+        "full_export": bool(args.full),
+        "unchanged_sources": sorted(unchanged_sources),
+        "tables_reused": len(reused_tables),
+        "tables_exported": len(manifest["objects"]) - len(reused_tables),
+        "schemas_reused": len(reused_schemas),
+    }
 
     summary = {
         "tables_requested": len(DEFAULT_TARGETS),
         "tables_extracted": len(manifest["objects"]),
+        "tables_reused": len(reused_tables),
         "errors": len(manifest["errors"]),
     }
     manifest["summary"] = summary
 
+    if args.sqlite:
+        manifest["sqlite"] = build_snapshot_sqlite(output_dir, manifest)
+        summary["sqlite_path"] = manifest["sqlite"]["path"]
+
     manifest_path = output_dir / "legacy_snapshot_manifest.json"
     write_text(manifest_path, json.dumps(manifest, indent=2) + "\n")
 
@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Streaming column profiles for legacy snapshot tables, and drift diffs
+between two snapshots.
+
+Usage:
+  python3 scripts/legacy_column_profile.py \
+    --baseline data/legacy_snapshot/<old-id> \
+    --candidate data/legacy_snapshot/<new-id>
+
+`TableProfiler` is fed CSV rows in a single pass (extract_legacy_access_snapshot
+calls it while mdb-export streams) and keeps bounded memory per column:
+- HyperLogLog distinct estimate (exact below EXACT_DISTINCT_LIMIT values)
+- numeric and lexical min/max, value length range
+- adaptive power-of-two-width numeric histogram (at most HISTOGRAM_BINS bins)
+- Misra-Gries heavy hitters (top-k with a stated error bound)
+- inferred type (integer, real, datetime, text, empty)
+
+Rows are buffered in small batches and counted per distinct value, so the
+sketches see each distinct value once per batch with a weight. The CLI
+compares the profiles stored in two snapshot manifests and writes
+legacy_profile_diff_<stamp>.json/.md.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+HLL_PRECISION = 12
+EXACT_DISTINCT_LIMIT = 1024
+HEAVY_HITTER_CAPACITY = 64
+TOP_K = 10
+HISTOGRAM_BINS = 32
+HISTOGRAM_INITIAL_EXPONENT = -20
+BATCH_ROWS = 4096
+MAX_REPORTED_VALUE_CHARS = 120
+
+INTEGER_PATTERN = re.compile(r"[-+]?(0|[1-9]\d*)")
+REAL_PATTERN = re.compile(r"[-+]?((0|[1-9]\d*)(\.\d*)?|\.\d+)([eE][-+]?\d+)?")
+DATETIME_PATTERN = re.compile(r"(\d{1,2}/\d{1,2}/\d{2,4}|\d{4}-\d{2}-\d{2})([ T]\d{1,2}:\d{2}(:\d{2})?)?")
+
+DRIFT_NULL_RATE = 0.01
+DRIFT_DISTINCT_RATIO = 0.05
+DRIFT_HISTOGRAM_TVD = 0.05
+
+
+def now_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    def __init__(self, precision: int = HLL_PRECISION) -> None:
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self.rest_bits = 64 - precision
+        self.rest_mask = (1 << self.rest_bits) - 1
+
+    def add_hash(self, hashed: int) -> None:
+        index = hashed >> self.rest_bits
+        rank = self.rest_bits - (hashed & self.rest_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> float:
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * size and zeros:
+            return size * math.log(size / zeros)
+        return raw
+
+
+class MisraGries:
+    """
+    Weighted Misra-Gries summary; stored counts undercount by at most
+    `error_bound`. Counters may grow to twice the capacity before a reduction
+    subtracts the (capacity+1)-th largest count, so reductions are amortized.
+    """
+
+    def __init__(self, capacity: int = HEAVY_HITTER_CAPACITY) -> None:
+        self.capacity = capacity
+        self.counters: dict[str, int] = {}
+        self.error_bound = 0
+
+    def add(self, value: str, weight: int) -> None:
+        counters = self.counters
+        if value in counters:
+            counters[value] += weight
+            return
+        counters[value] = weight
+        if len(counters) <= 2 * self.capacity:
+            return
+        floor = sorted(counters.values(), reverse=True)[self.capacity]
+        self.error_bound += floor
+        self.counters = {key: count - floor for key, count in counters.items() if count > floor}
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        return sorted(self.counters.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+
+class AdaptiveHistogram:
+    """
+    Equal-width histogram whose bin width is a power of two and whose bins
+    are aligned to multiples of that width. When values span more than
+    `max_bins` bins the width doubles and neighbouring bins merge, so any two
+    histograms can be compared after coarsening to the wider width.
+    """
+
+    def __init__(self, max_bins: int = HISTOGRAM_BINS, initial_exponent: int = HISTOGRAM_INITIAL_EXPONENT) -> None:
+        self.max_bins = max_bins
+        self.exponent = initial_exponent
+        self.bins: dict[int, int] = {}
+        self.low: int | None = None
+        self.high: int | None = None
+
+    @property
+    def width(self) -> float:
+        return math.ldexp(1.0, self.exponent)
+
+    def widen(self) -> None:
+        """Double the bin width, merging each pair of neighbouring bins."""
+        self.exponent += 1
+        merged: dict[int, int] = {}
+        for key, count in self.bins.items():
+            merged[key >> 1] = merged.get(key >> 1, 0) + count
+        self.bins = merged
+        if self.low is not None:
+            self.low >>= 1
+            self.high >>= 1
+
+    def add(self, value: float, weight: int) -> None:
+        # Values near the float limit overflow value / width at fine widths; widen first.
+        while not math.isfinite(value / self.width):
+            self.widen()
+        index = math.floor(value / self.width)
+        while self.low is not None and max(self.high, index) - min(self.low, index) >= self.max_bins:
+            self.widen()
+            index >>= 1
+        self.low = index if self.low is None else min(self.low, index)
+        self.high = index if self.high is None else max(self.high, index)
+        self.bins[index] = self.bins.get(index, 0) + weight
+
+    def to_dict(self) -> dict[str, Any]:
+        width = self.width
+        return {
+            "bin_exponent": self.exponent,
+            "bin_width": width,
+            "bins": [[key * width, self.bins[key]] for key in sorted(self.bins)],
+        }
+
+
+def classify(value: str) -> tuple[str, float | None]:
+    if INTEGER_PATTERN.fullmatch(value):
+        try:
+            return "integer", float(int(value))
+        except (OverflowError, ValueError):
+            # Beyond float range (or Python's int-parsing digit limit): profile as text.
+            return "text", None
+    if REAL_PATTERN.fullmatch(value):
+        number = float(value)
+        if math.isfinite(number):
+            return "real", number
+    if DATETIME_PATTERN.fullmatch(value):
+        return "datetime", None
+    return "text", None
+
+
+def clip(value: str | None) -> str | None:
+    if value is None or len(value) <= MAX_REPORTED_VALUE_CHARS:
+        return value
+    return value[:MAX_REPORTED_VALUE_CHARS] + "..."
+
+
+class ColumnProfile:
+    def __init__(self, name: str, detailed: bool = True) -> None:
+        self.name = name
+        self.detailed = detailed
+        self.null_count = 0
+        self.non_null_count = 0
+        self.exact_distinct: set[str] | None = set()
+        self.hll = HyperLogLog()
+        self.heavy_hitters = MisraGries()
+        self.histogram = AdaptiveHistogram()
+        self.kind_counts: dict[str, int] = {}
+        self.numeric_min: float | None = None
+        self.numeric_max: float | None = None
+        self.text_min: str | None = None
+        self.text_max: str | None = None
+        self.length_min: int | None = None
+        self.length_max: int | None = None
+
+    def add_counts(self, counts: dict[str, int]) -> None:
+        for value, weight in counts.items():
+            if value.strip() == "":
+                self.null_count += weight
+                continue
+            self.non_null_count += weight
+            if not self.detailed:
+                continue
+
+            self.hll.add_hash(hash64(value))
+            if self.exact_distinct is not None:
+                self.exact_distinct.add(value)
+                if len(self.exact_distinct) > EXACT_DISTINCT_LIMIT:
+                    self.exact_distinct = None
+            self.heavy_hitters.add(value, weight)
+
+            kind, number = classify(value)
+            self.kind_counts[kind] = self.kind_counts.get(kind, 0) + weight
+            if number is not None:
+                self.histogram.add(number, weight)
+                if self.numeric_min is None or number < self.numeric_min:
+                    self.numeric_min = number
+                if self.numeric_max is None or number > self.numeric_max:
+                    self.numeric_max = number
+            if self.text_min is None or value < self.text_min:
+                self.text_min = value
+            if self.text_max is None or value > self.text_max:
+                self.text_max = value
+            length = len(value)
+            if self.length_min is None or length < self.length_min:
+                self.length_min = length
+            if self.length_max is None or length > self.length_max:
+                self.length_max = length
+
+    def inferred_type(self) -> str:
+        kinds = set(self.kind_counts)
+        if not kinds:
+            return "empty"
+        if kinds == {"integer"}:
+            return "integer"
+        if kinds <= {"integer", "real"}:
+            return "real"
+        if kinds == {"datetime"}:
+            return "datetime"
+        return "text"
+
+    def to_dict(self, top_k: int = TOP_K) -> dict[str, Any]:
+        exact = self.exact_distinct is not None
+        distinct = len(self.exact_distinct) if exact else round(self.hll.estimate())
+        inferred = self.inferred_type()
+        numeric_min = self.numeric_min
+        numeric_max = self.numeric_max
+        if inferred == "integer" and numeric_min is not None and numeric_max is not None:
+            numeric_min = int(numeric_min)
+            numeric_max = int(numeric_max)
+        numeric = numeric_min is not None
+        return {
+            "inferred_type": inferred,
+            "type_counts": dict(sorted(self.kind_counts.items())),
+            "distinct_estimate": distinct,
+            "distinct_exact": exact,
+            "min": numeric_min if inferred in {"integer", "real"} else clip(self.text_min),
+            "max": numeric_max if inferred in {"integer", "real"} else clip(self.text_max),
+            "numeric_min": numeric_min,
+            "numeric_max": numeric_max,
+            "length_min": self.length_min,
+            "length_max": self.length_max,
+            "histogram": self.histogram.to_dict() if numeric else None,
+            "top_values": [
+                {"value": clip(value), "count_lower_bound": count} for value, count in self.heavy_hitters.top(top_k)
+            ],
+            "top_values_error_bound": self.heavy_hitters.error_bound,
+        }
+
+
+class TableProfiler:
+    """Single-pass per-column statistics over CSV rows (header first)."""
+
+    def __init__(self, fieldnames: list[str], detailed: bool = True, batch_rows: int = BATCH_ROWS) -> None:
+        self.fieldnames = fieldnames
+        self.width = len(fieldnames)
+        self.columns = [ColumnProfile(name, detailed) for name in fieldnames]
+        self.batch_rows = batch_rows
+        self.batch: list[list[str]] = []
+        self.row_count = 0
+
+    def add_row(self, row: list[str]) -> None:
+        if not row:
+            return
+        self.row_count += 1
+        if len(row) != self.width:
+            row = (row + [""] * self.width)[: self.width]
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.batch:
+            return
+        for column, values in zip(self.columns, zip(*self.batch)):
+            column.add_counts(Counter(values))
+        self.batch = []
+
+    def field_dictionary(self) -> list[dict[str, Any]]:
+        self.flush()
+        fields = []
+        for column in self.columns:
+            null_rate = (column.null_count / self.row_count) if self.row_count > 0 else 0.0
+            entry: dict[str, Any] = {
+                "name": column.name,
+                "null_count": column.null_count,
+                "null_rate": round(null_rate, 6),
+            }
+            if column.detailed:
+                entry["profile"] = column.to_dict()
+            fields.append(entry)
+        return fields
+
+
+def coarsen_histogram(histogram: dict[str, Any], exponent: int) -> dict[int, int]:
+    width = math.ldexp(1.0, exponent)
+    bins: dict[int, int] = {}
+    for low, count in histogram.get("bins", []):
+        key = math.floor(low / width)
+        bins[key] = bins.get(key, 0) + int(count)
+    return bins
+
+
+def histogram_distance(old: dict[str, Any] | None, new: dict[str, Any] | None) -> float | None:
+    """Total variation distance after coarsening both histograms to the wider bin width."""
+    if not old or not new:
+        return None
+    exponent = max(int(old["bin_exponent"]), int(new["bin_exponent"]))
+    old_bins = coarsen_histogram(old, exponent)
+    new_bins = coarsen_histogram(new, exponent)
+    old_total = sum(old_bins.values())
+    new_total = sum(new_bins.values())
+    if old_total == 0 or new_total == 0:
+        return None
+    keys = set(old_bins) | set(new_bins)
+    return 0.5 * sum(abs(old_bins.get(key, 0) / old_total - new_bins.get(key, 0) / new_total) for key in keys)
+
+
+def diff_column(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    old_profile = old.get("profile") or {}
+    new_profile = new.get("profile") or {}
+    reasons: list[str] = []
+
+    null_rate_delta = float(new.get("null_rate", 0.0)) - float(old.get("null_rate", 0.0))
+    if abs(null_rate_delta) > DRIFT_NULL_RATE:
+        reasons.append("null_rate")
+
+    old_distinct = old_profile.get("distinct_estimate")
+    new_distinct = new_profile.get("distinct_estimate")
+    distinct_ratio = None
+    if old_distinct is not None and new_distinct is not None:
+        distinct_ratio = (new_distinct - old_distinct) / max(1, old_distinct)
+        exact = old_profile.get("distinct_exact") and new_profile.get("distinct_exact")
+        if (exact and new_distinct != old_distinct) or abs(distinct_ratio) > DRIFT_DISTINCT_RATIO:
+            reasons.append("distinct")
+
+    if old_profile and new_profile:
+        if old_profile.get("inferred_type") != new_profile.get("inferred_type"):
+            reasons.append("inferred_type")
+        if old_profile.get("min") != new_profile.get("min") or old_profile.get("max") != new_profile.get("max"):
+            reasons.append("range")
+
+    tvd = histogram_distance(old_profile.get("histogram"), new_profile.get("histogram"))
+    if tvd is not None and tvd > DRIFT_HISTOGRAM_TVD:
+        reasons.append("histogram")
+
+    old_top = [item["value"] for item in old_profile.get("top_values", [])]
+    new_top = [item["value"] for item in new_profile.get("top_values", [])]
+    if old_profile and new_profile and set(old_top) != set(new_top):
+        reasons.append("top_values")
+
+    return {
+        "column": new.get("name", old.get("name")),
+        "drifted": bool(reasons),
+        "reasons": reasons,
+        "null_rate_delta": round(null_rate_delta, 6),
+        "distinct_old": old_distinct,
+        "distinct_new": new_distinct,
+        "distinct_change_ratio": round(distinct_ratio, 6) if distinct_ratio is not None else None,
+        "type_old": old_profile.get("inferred_type"),
+        "type_new": new_profile.get("inferred_type"),
+        "min_old": old_profile.get("min"),
+        "min_new": new_profile.get("min"),
+        "max_old": old_profile.get("max"),
+        "max_new": new_profile.get("max"),
+        "histogram_tvd": round(tvd, 6) if tvd is not None else None,
+        "top_values_entered": [value for value in new_top if value not in old_top],
+        "top_values_left": [value for value in old_top if value not in new_top],
+    }
+
+
+def diff_manifests(baseline: dict[str, Any], candidate: dict[str, Any]) -> dict[str, Any]:
+    old_objects = {(entry.get("source"), entry.get("table")): entry for entry in baseline.get("objects", [])}
+    new_objects = {(entry.get("source"), entry.get("table")): entry for entry in candidate.get("objects", [])}
+
+    tables: list[dict[str, Any]] = []
+    for key in sorted(set(old_objects) | set(new_objects), key=lambda item: (str(item[0]), str(item[1]))):
+        old = old_objects.get(key)
+        new = new_objects.get(key)
+        table: dict[str, Any] = {"source": key[0], "table": key[1]}
+        if old is None or new is None:
+            table["status"] = "added" if old is None else "removed"
+            tables.append(table)
+            continue
+        if old.get("sha256") == new.get("sha256"):
+            table["status"] = "identical"
+            tables.append(table)
+            continue
+
+        old_fields = {field["name"]: field for field in old.get("field_dictionary", [])}
+        new_fields = {field["name"]: field for field in new.get("field_dictionary", [])}
+        columns = [
+            diff_column(old_fields[name], new_fields[name]) for name in new_fields if name in old_fields
+        ]
+        table.update(
+            {
+                "status": "changed",
+                "record_count_old": old.get("record_count"),
+                "record_count_new": new.get("record_count"),
+                "columns_added": [name for name in new_fields if name not in old_fields],
+                "columns_removed": [name for name in old_fields if name not in new_fields],
+                "profiled": any("profile" in field for field in new_fields.values())
+                and any("profile" in field for field in old_fields.values()),
+                "drifted_columns": [column for column in columns if column["drifted"]],
+                "columns_compared": len(columns),
+            }
+        )
+        tables.append(table)
+
+    return {
+        "generated_at_utc": now_iso(),
+        "baseline_snapshot": baseline.get("snapshot_id"),
+        "candidate_snapshot": candidate.get("snapshot_id"),
+        "thresholds": {
+            "null_rate": DRIFT_NULL_RATE,
+            "distinct_ratio": DRIFT_DISTINCT_RATIO,
+            "histogram_tvd": DRIFT_HISTOGRAM_TVD,
+        },
+        "summary": {
+            "tables": len(tables),
+            "identical": sum(1 for table in tables if table["status"] == "identical"),
+            "changed": sum(1 for table in tables if table["status"] == "changed"),
+            "added": sum(1 for table in tables if table["status"] == "added"),
+            "removed": sum(1 for table in tables if table["status"] == "removed"),
+            "drifted_columns": sum(len(table.get("drifted_columns", [])) for table in tables),
+        },
+        "tables": tables,
+    }
+
+
+def build_markdown(report: dict[str, Any]) -> str:
+    summary = report["summary"]
+    lines = [
+        "# Legacy Snapshot Profile Diff",
+        "",
+        f"- Generated: `{report['generated_at_utc']}`",
+        f"- Baseline: `{report['baseline_snapshot']}`",
+        f"- Candidate: `{report['candidate_snapshot']}`",
+        f"- Tables: `{summary['tables']}` (identical `{summary['identical']}`, changed `{summary['changed']}`, "
+        f"added `{summary['added']}`, removed `{summary['removed']}`)",
+        f"- Drifted columns: `{summary['drifted_columns']}`",
+        "",
+        "| Source | Table | Status | Rows (old -> new) | Drifted columns |",
+        "|---|---|---|---|---|",
+    ]
+    for table in report["tables"]:
+        rows = ""
+        if table["status"] == "changed":
+            rows = f"{table['record_count_old']} -> {table['record_count_new']}"
+        drifted = ", ".join(
+            f"{column['column']} ({'/'.join(column['reasons'])})" for column in table.get("drifted_columns", [])
+        )
+        lines.append(f"| {table['source']} | {table['table']} | {table['status']} | {rows} | {drifted} |")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def load_manifest(path_or_dir: str) -> dict[str, Any]:
+    path = Path(path_or_dir).expanduser().resolve()
+    if path.is_dir():
+        path = path / "legacy_snapshot_manifest.json"
+    if not path.exists():
+        raise RuntimeError(f"snapshot manifest not found: {path}")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def profile_csv_rows(rows: Iterable[list[str]], detailed: bool = True) -> dict[str, Any]:
+    iterator = iter(rows)
+    fieldnames = next(iterator, None)
+    if fieldnames is None:
+        return {"row_count": 0, "columns": []}
+    profiler = TableProfiler(fieldnames, detailed=detailed)
+    for row in iterator:
+        profiler.add_row(row)
+    return {"row_count": profiler.row_count, "columns": profiler.field_dictionary()}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Diff column profiles between two legacy snapshots")
+    parser.add_argument("--baseline", required=True, help="Baseline snapshot folder or manifest path")
+    parser.add_argument("--candidate", required=True, help="Candidate snapshot folder or manifest path")
+    parser.add_argument("--out-dir", default="output/analysis", help="Report output directory")
+    parser.add_argument(
+        "--fail-on-drift",
+        action="store_true",
+        help="Exit non-zero when any profiled column drifts past the thresholds",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    report = diff_manifests(load_manifest(args.baseline), load_manifest(args.candidate))
+
+    out_dir = Path(args.out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = now_id()
+    json_path = out_dir / f"legacy_profile_diff_{stamp}.json"
+    md_path = out_dir / f"legacy_profile_diff_{stamp}.md"
+    json_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    md_path.write_text(build_markdown(report), encoding="utf-8")
+
+    print(f"Profile diff JSON: {json_path}")
+    print(f"Profile diff Markdown: {md_path}")
+    print(json.dumps(report["summary"], indent=2))
+
+    if args.fail_on_drift and report["summary"]["drifted_columns"] > 0:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        raise SystemExit(1)
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Row-level diff between two legacy Access snapshots.
+
+Usage:
+  python3 scripts/legacy_snapshot_diff.py \
+    --baseline data/legacy_snapshot/<old-id> \
+    --candidate data/legacy_snapshot/<new-id> \
+    [--key tblJob_Bank=ID] [--write-deltas]
+
+Rows are matched by primary key. The key comes from the snapshot's
+mdb-schema output (PRIMARY KEY, else the first UNIQUE index), or from --key.
+Tables with no key are diffed as row multisets, so they only show added
+and removed rows. Tables whose CSV SHA-256 matches are skipped.
+
+When a table pair is larger than --memory-mb, both sides are spilled into
+hash partitions on disk by key. Each partition is then diffed on its own,
+so memory stays bounded by one partition.
+
+Reports go to output/analysis/legacy_snapshot_diff_<stamp>.json/.md.
+--write-deltas also writes one <table>.delta.jsonl per changed table with
+add/remove/change operations, ordered by key, for incremental rebuilds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import heapq
+import json
+import math
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from legacy_snapshot_sqlite import TableSchema, parse_schema_sql
+
+KEY_SEPARATOR = "\x1f"
+DEFAULT_MEMORY_MB = 256
+# Rough in-memory cost of a parsed row relative to its CSV bytes.
+ROW_MEMORY_FACTOR = 6
+SAMPLE_LIMIT = 20
+
+
+def now_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def load_manifest(path_or_dir: str) -> dict[str, Any]:
+    path = Path(path_or_dir).expanduser().resolve()
+    if path.is_dir():
+        path = path / "legacy_snapshot_manifest.json"
+    if not path.exists():
+        raise RuntimeError(f"snapshot manifest not found: {path}")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def load_schemas(manifest: dict[str, Any]) -> dict[str, dict[str, TableSchema]]:
+    schemas: dict[str, dict[str, TableSchema]] = {}
+    for source, entry in (manifest.get("schemas") or {}).items():
+        path = Path(str(entry.get("path") or ""))
+        if path.is_file():
+            schemas[source] = parse_schema_sql(path.read_text(encoding="utf-8"))
+    return schemas
+
+
+def parse_key_overrides(values: list[str]) -> dict[str, list[str]]:
+    overrides: dict[str, list[str]] = {}
+    for value in values:
+        table, sep, columns = value.partition("=")
+        if not sep or not table.strip() or not columns.strip():
+            raise RuntimeError(f"invalid --key value (expected table=col[,col...]): {value}")
+        overrides[table.strip()] = [column.strip() for column in columns.split(",") if column.strip()]
+    return overrides
+
+
+def resolve_key(table: str, schema: TableSchema | None, overrides: dict[str, list[str]]) -> tuple[list[str], str]:
+    if table in overrides:
+        return overrides[table], "override"
+    if schema is not None and schema.primary_key:
+        return list(schema.primary_key), "primary_key"
+    if schema is not None:
+        for _, unique, columns in schema.indexes:
+            if unique and columns:
+                return list(columns), "unique_index"
+    return [], "row_content"
+
+
+class KeyedReader:
+    """Builds match keys for one snapshot CSV (key columns, or the whole row when unkeyed)."""
+
+    def __init__(self, header: list[str], key_columns: list[str]) -> None:
+        missing = [column for column in key_columns if column not in header]
+        if missing:
+            raise RuntimeError(f"key columns not in table header: {', '.join(missing)}")
+        self.width = len(header)
+        self.key_indexes = [header.index(column) for column in key_columns]
+
+    def key_for(self, row: list[str]) -> str:
+        if self.key_indexes:
+            return KEY_SEPARATOR.join(row[index] for index in self.key_indexes)
+        return KEY_SEPARATOR.join(row)
+
+    def rows(self, reader: Iterator[list[str]]) -> Iterator[list[str]]:
+        width = self.width
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != width:
+                row = (row + [""] * width)[:width]
+            yield row
+
+
+def with_occurrences(keyed: Iterator[tuple[str, list[str]]], duplicates: Counter[str]) -> Iterator[tuple[str, list[str]]]:
+    seen: dict[str, int] = {}
+    for key, row in keyed:
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        if count:
+            duplicates["rows"] += 1
+            key = f"{key}{KEY_SEPARATOR}#{count}"
+        yield key, row
+
+
+def partition_of(key: str, partitions: int) -> int:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % partitions
+
+
+class TableDiff:
+    def __init__(self, old_header: list[str], new_header: list[str]) -> None:
+        self.old_header = old_header
+        self.new_header = new_header
+        self.common = [column for column in new_header if column in old_header]
+        self.old_positions = [old_header.index(column) for column in self.common]
+        self.new_positions = [new_header.index(column) for column in self.common]
+        self.added = 0
+        self.removed = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.changed_columns: Counter[str] = Counter()
+        # Smallest keys per kind, so samples are stable across partition counts.
+        self.samples: dict[str, list[tuple[str, dict[str, Any]]]] = {"added": [], "removed": [], "changed": []}
+
+    def remember(self, kind: str, key: str, payload: dict[str, Any]) -> None:
+        bucket = self.samples[kind]
+        if len(bucket) < SAMPLE_LIMIT:
+            bucket.append((key, payload))
+            bucket.sort(key=lambda item: item[0])
+        elif key < bucket[-1][0]:
+            bucket[-1] = (key, payload)
+            bucket.sort(key=lambda item: item[0])
+
+    def compare_partition(
+        self,
+        old_rows: dict[str, list[str]],
+        new_rows: Iterator[tuple[str, list[str]]],
+        delta_ops: list[tuple[str, dict[str, Any]]] | None,
+    ) -> None:
+        for key, new_row in new_rows:
+            old_row = old_rows.pop(key, None)
+            if old_row is None:
+                self.added += 1
+                payload = {"op": "add", "key": key.split(KEY_SEPARATOR), "row": dict(zip(self.new_header, new_row))}
+                self.remember("added", key, payload)
+                if delta_ops is not None:
+                    delta_ops.append((key, payload))
+                continue
+            changes = {
+                column: [old_row[old_index], new_row[new_index]]
+                for column, old_index, new_index in zip(self.common, self.old_positions, self.new_positions)
+                if old_row[old_index] != new_row[new_index]
+            }
+            if not changes:
+                self.unchanged += 1
+                continue
+            self.changed += 1
+            self.changed_columns.update(changes.keys())
+            payload = {"op": "change", "key": key.split(KEY_SEPARATOR), "changes": changes}
+            self.remember("changed", key, payload)
+            if delta_ops is not None:
+                delta_ops.append((key, payload))
+
+        for key, old_row in old_rows.items():
+            self.removed += 1
+            payload = {"op": "remove", "key": key.split(KEY_SEPARATOR), "row": dict(zip(self.old_header, old_row))}
+            self.remember("removed", key, payload)
+            if delta_ops is not None:
+                delta_ops.append((key, payload))
+
+
+def read_header(path: Path) -> list[str]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        return next(csv.reader(handle), None) or []
+
+
+def iter_keyed(path: Path, key_columns: list[str]) -> Iterator[tuple[str, list[str]]]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None) or []
+        keyed = KeyedReader(header, key_columns)
+        for row in keyed.rows(reader):
+            yield keyed.key_for(row), row
+
+
+def spill(
+    keyed: Iterator[tuple[str, list[str]]],
+    partitions: int,
+    spill_dir: Path,
+    prefix: str,
+) -> list[Path]:
+    paths = [spill_dir / f"{prefix}.{index:04d}.csv" for index in range(partitions)]
+    handles = [path.open("w", encoding="utf-8", newline="") for path in paths]
+    try:
+        writers = [csv.writer(handle, lineterminator="\n") for handle in handles]
+        for key, row in keyed:
+            writers[partition_of(key, partitions)].writerow([key, *row])
+    finally:
+        for handle in handles:
+            handle.close()
+    return paths
+
+
+def iter_spilled(path: Path) -> Iterator[tuple[str, list[str]]]:
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        for record in csv.reader(handle):
+            yield record[0], record[1:]
+
+
+def write_sorted_deltas(
+    chunk_paths: list[Path],
+    out_path: Path,
+) -> None:
+    """Merge per-partition key-sorted delta chunks into one key-ordered JSONL file."""
+
+    def iter_chunk(path: Path) -> Iterator[tuple[str, str]]:
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                key, _, payload = line.rstrip("\n").partition("\t")
+                yield json.loads(key), payload
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", encoding="utf-8") as handle:
+        for _, payload in heapq.merge(*(iter_chunk(path) for path in chunk_paths), key=lambda item: item[0]):
+            handle.write(payload + "\n")
+
+
+def diff_table(
+    old_entry: dict[str, Any],
+    new_entry: dict[str, Any],
+    key_columns: list[str],
+    key_source: str,
+    memory_bytes: int,
+    delta_path: Path | None,
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    old_path = Path(str(old_entry["csv_path"]))
+    new_path = Path(str(new_entry["csv_path"]))
+    old_header = read_header(old_path)
+    new_header = read_header(new_path)
+    if key_columns:
+        for label, header in (("baseline", old_header), ("candidate", new_header)):
+            missing = [column for column in key_columns if column not in header]
+            if missing:
+                raise RuntimeError(f"{label} {new_entry['table']} lacks key columns: {', '.join(missing)}")
+    elif old_header != new_header:
+        # Content keys only line up when both sides have the same columns.
+        key_columns = [column for column in new_header if column in old_header]
+
+    estimated = (old_path.stat().st_size + new_path.stat().st_size) * ROW_MEMORY_FACTOR
+    partitions = max(1, math.ceil(estimated / memory_bytes))
+    diff = TableDiff(old_header, new_header)
+    duplicates: dict[str, Counter[str]] = {"baseline": Counter(), "candidate": Counter()}
+
+    with tempfile.TemporaryDirectory(prefix="legacy_snapshot_diff.") as tmp:
+        tmp_dir = Path(tmp)
+        old_keyed = iter_keyed(old_path, key_columns)
+        new_keyed = iter_keyed(new_path, key_columns)
+        if partitions == 1:
+            partition_pairs = [(lambda: old_keyed, lambda: new_keyed)]
+        else:
+            old_parts = spill(old_keyed, partitions, tmp_dir, "baseline")
+            new_parts = spill(new_keyed, partitions, tmp_dir, "candidate")
+            partition_pairs = [
+                (lambda path=old_part: iter_spilled(path), lambda path=new_part: iter_spilled(path))
+                for old_part, new_part in zip(old_parts, new_parts)
+            ]
+
+        chunk_paths: list[Path] = []
+        for index, (old_iter, new_iter) in enumerate(partition_pairs):
+            # Equal keys always land in the same partition, so duplicate
+            # numbering here matches a whole-table pass.
+            old_rows = dict(with_occurrences(old_iter(), duplicates["baseline"]))
+            delta_ops: list[tuple[str, dict[str, Any]]] | None = [] if delta_path is not None else None
+            diff.compare_partition(old_rows, with_occurrences(new_iter(), duplicates["candidate"]), delta_ops)
+            if delta_ops:
+                delta_ops.sort(key=lambda item: item[0])
+                chunk_path = tmp_dir / f"delta.{index:04d}.tsv"
+                with chunk_path.open("w", encoding="utf-8") as handle:
+                    for key, payload in delta_ops:
+                        handle.write(json.dumps(key) + "\t" + json.dumps(payload) + "\n")
+                chunk_paths.append(chunk_path)
+            del old_rows, delta_ops
+
+        if delta_path is not None and chunk_paths:
+            write_sorted_deltas(chunk_paths, delta_path)
+
+    return {
+        "source": new_entry.get("source"),
+        "table": new_entry.get("table"),
+        "status": "changed" if (diff.added or diff.removed or diff.changed) else "equivalent",
+        "key_columns": key_columns,
+        "key_source": key_source,
+        "record_count_old": old_entry.get("record_count"),
+        "record_count_new": new_entry.get("record_count"),
+        "added": diff.added,
+        "removed": diff.removed,
+        "changed": diff.changed,
+        "unchanged": diff.unchanged,
+        "changed_columns": dict(diff.changed_columns.most_common()),
+        "columns_added": [column for column in new_header if column not in old_header],
+        "columns_removed": [column for column in old_header if column not in new_header],
+        "duplicate_key_rows": {label: counter["rows"] for label, counter in duplicates.items()},
+        "partitions": partitions,
+        "samples": {kind: [payload for _, payload in items] for kind, items in diff.samples.items()},
+        "delta_path": str(delta_path) if delta_path is not None and (diff.added or diff.removed or diff.changed) else None,
+        "diff_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def build_markdown(report: dict[str, Any]) -> str:
+    summary = report["summary"]
+    lines = [
+        "# Legacy Snapshot Row Diff",
+        "",
+        f"- Generated: `{report['generated_at_utc']}`",
+        f"- Baseline: `{report['baseline_snapshot']}`",
+        f"- Candidate: `{report['candidate_snapshot']}`",
+        f"- Tables: `{summary['tables']}` (identical `{summary['identical']}`, changed `{summary['changed']}`, "
+        f"added `{summary['tables_added']}`, removed `{summary['tables_removed']}`)",
+        f"- Rows: added `{summary['rows_added']}`, removed `{summary['rows_removed']}`, changed `{summary['rows_changed']}`",
+        "",
+        "| Source | Table | Status | Key | Added | Removed | Changed | Top changed columns |",
+        "|---|---|---|---|---:|---:|---:|---|",
+    ]
+    for table in report["tables"]:
+        key = ", ".join(table.get("key_columns") or []) or table.get("key_source", "")
+        top_columns = ", ".join(
+            f"{column} ({count})" for column, count in list((table.get("changed_columns") or {}).items())[:5]
+        )
+        lines.append(
+            f"| {table['source']} | {table['table']} | {table['status']} | {key} | "
+            f"{table.get('added', '')} | {table.get('removed', '')} | {table.get('changed', '')} | {top_columns} |"
+        )
+    lines.append("")
+    return "\n".join(lines)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Row-level diff between two legacy Access snapshots")
+    parser.add_argument("--baseline", required=True, help="Baseline snapshot folder or manifest path")
+    parser.add_argument("--candidate", required=True, help="Candidate snapshot folder or manifest path")
+    parser.add_argument("--table", action="append", default=[], help="Only diff these tables (repeatable)")
+    parser.add_argument(
+        "--key",
+        action="append",
+        default=[],
+        help="Key override as table=col[,col...] (repeatable); default comes from the snapshot schema",
+    )
+    parser.add_argument(
+        "--memory-mb",
+        type=int,
+        default=DEFAULT_MEMORY_MB,
+        help=f"In-memory budget per table before spilling hash partitions to disk (default: {DEFAULT_MEMORY_MB})",
+    )
+    parser.add_argument("--out-dir", default="output/analysis", help="Report output directory")
+    parser.add_argument(
+        "--write-deltas",
+        action="store_true",
+        help="Write key-ordered <table>.delta.jsonl files next to the report",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    baseline = load_manifest(args.baseline)
+    candidate = load_manifest(args.candidate)
+    overrides = parse_key_overrides(args.key)
+    schemas = load_schemas(candidate)
+    memory_bytes = max(1, args.memory_mb) * 1024 * 1024
+    wanted = set(args.table)
+
+    out_dir = Path(args.out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = now_id()
+    deltas_dir = out_dir / f"legacy_snapshot_diff_{stamp}" if args.write_deltas else None
+
+    old_objects = {(entry.get("source"), entry.get("table")): entry for entry in baseline.get("objects", [])}
+    new_objects = {(entry.get("source"), entry.get("table")): entry for entry in candidate.get("objects", [])}
+    tables: list[dict[str, Any]] = []
+    for key in sorted(set(old_objects) | set(new_objects), key=lambda item: (str(item[0]), str(item[1]))):
+        source, table = key
+        if wanted and table not in wanted:
+            continue
+        old = old_objects.get(key)
+        new = new_objects.get(key)
+        if old is None or new is None:
+            tables.append({"source": source, "table": table, "status": "added" if old is None else "removed"})
+            continue
+        if old.get("sha256") and old.get("sha256") == new.get("sha256"):
+            tables.append({"source": source, "table": table, "status": "identical"})
+            continue
+        key_columns, key_source = resolve_key(str(table), schemas.get(str(source), {}).get(str(table)), overrides)
+        delta_path = deltas_dir / f"{source}__{table}.delta.jsonl" if deltas_dir is not None else None
+        result = diff_table(old, new, key_columns, key_source, memory_bytes, delta_path)
+        tables.append(result)
+        print(
+            f"{source}.{table}: +{result['added']} -{result['removed']} ~{result['changed']} "
+            f"(key={key_source}, partitions={result['partitions']}, {result['diff_seconds']}s)"
+        )
+
+    report = {
+        "generated_at_utc": now_iso(),
+        "baseline_snapshot": baseline.get("snapshot_id"),
+        "candidate_snapshot": candidate.get("snapshot_id"),
+        "memory_mb": args.memory_mb,
+        "deltas_dir": str(deltas_dir) if deltas_dir is not None else None,
+        "summary": {
+            "tables": len(tables),
+            "identical": sum(1 for table in tables if table["status"] in {"identical", "equivalent"}),
+            "changed": sum(1 for table in tables if table["status"] == "changed"),
+            "tables_added": sum(1 for table in tables if table["status"] == "added"),
+            "tables_removed": sum(1 for table in tables if table["status"] == "removed"),
+            "rows_added": sum(int(table.get("added", 0)) for table in tables),
+            "rows_removed": sum(int(table.get("removed", 0)) for table in tables),
+            "rows_changed": sum(int(table.get("changed", 0)) for table in tables),
+        },
+        "tables": tables,
+    }
+
+    json_path = out_dir / f"legacy_snapshot_diff_{stamp}.json"
+    md_path = out_dir / f"legacy_snapshot_diff_{stamp}.md"
+    json_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    md_path.write_text(build_markdown(report), encoding="utf-8")
+
+    print(f"Snapshot diff JSON: {json_path}")
+    print(f"Snapshot diff Markdown: {md_path}")
+    print(json.dumps(report["summary"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        raise SystemExit(1)
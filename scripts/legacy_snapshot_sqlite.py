@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Load a legacy Access snapshot's table CSVs into one typed SQLite file.
+
+Usage:
+  python3 scripts/legacy_snapshot_sqlite.py --snapshot-dir data/legacy_snapshot/<id>
+
+Column types come from the snapshot's `mdb-schema ... sqlite` output:
+INTEGER/REAL columns are stored as numbers, everything else as TEXT, and
+empty CSV cells become NULL. Primary keys and the Access indexes declared
+for each table are created after the load. Each table is bulk-inserted in
+a single transaction.
+
+The result is written to <snapshot-dir>/legacy_snapshot.sqlite (or --out)
+together with:
+- _snapshot_meta    (snapshot id, manifest version, build time)
+- _snapshot_tables  (table, source, csv sha256, record count, indexes)
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+SQLITE_FILENAME = "legacy_snapshot.sqlite"
+MANIFEST_FILENAME = "legacy_snapshot_manifest.json"
+
+CREATE_TABLE_PATTERN = re.compile(r"CREATE TABLE `([^`]+)`\s*\((.*?)\n\);", re.DOTALL)
+COLUMN_PATTERN = re.compile(r"^\s*`([^`]+)`\s+([A-Za-z]+)", re.MULTILINE)
+PRIMARY_KEY_PATTERN = re.compile(r"PRIMARY KEY \(([^)]*)\)")
+CREATE_INDEX_PATTERN = re.compile(r"CREATE (UNIQUE )?INDEX `([^`]+)` ON `([^`]+)` \(([^)]*)\);")
+QUOTED_NAME_PATTERN = re.compile(r"`([^`]+)`")
+
+# mdb-schema's sqlite backend emits these declared types; anything else is text.
+SQLITE_AFFINITY = {
+    "integer": "INTEGER",
+    "int": "INTEGER",
+    "boolean": "INTEGER",
+    "real": "REAL",
+    "double": "REAL",
+    "float": "REAL",
+    "numeric": "NUMERIC",
+}
+
+
+@dataclass
+class TableSchema:
+    name: str
+    columns: dict[str, str] = field(default_factory=dict)
+    primary_key: list[str] = field(default_factory=list)
+    indexes: list[tuple[str, bool, list[str]]] = field(default_factory=list)
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def parse_schema_sql(text: str) -> dict[str, TableSchema]:
+    """Parse `mdb-schema <db> sqlite` output into per-table column types and keys."""
+    tables: dict[str, TableSchema] = {}
+    for match in CREATE_TABLE_PATTERN.finditer(text):
+        schema = TableSchema(name=match.group(1))
+        body = match.group(2)
+        for column, declared in COLUMN_PATTERN.findall(body):
+            schema.columns[column] = SQLITE_AFFINITY.get(declared.lower(), "TEXT")
+        key = PRIMARY_KEY_PATTERN.search(body)
+        if key:
+            schema.primary_key = QUOTED_NAME_PATTERN.findall(key.group(1))
+        tables[schema.name] = schema
+
+    for unique, index_name, table, columns in CREATE_INDEX_PATTERN.findall(text):
+        schema = tables.setdefault(table, TableSchema(name=table))
+        schema.indexes.append((index_name, bool(unique), QUOTED_NAME_PATTERN.findall(columns)))
+    return tables
+
+
+def convert_value(raw: str, affinity: str) -> Any:
+    if raw == "":
+        return None
+    if affinity == "INTEGER":
+        try:
+            return int(raw)
+        except ValueError:
+            return raw
+    if affinity in {"REAL", "NUMERIC"}:
+        try:
+            return float(raw)
+        except ValueError:
+            return raw
+    return raw
+
+
+def iter_typed_rows(reader: Iterator[list[str]], affinities: list[str]) -> Iterator[tuple[Any, ...]]:
+    width = len(affinities)
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        yield tuple(convert_value(row[index], affinities[index]) for index in range(width))
+
+
+def create_indexes(conn: sqlite3.Connection, table: str, schema: TableSchema, header: list[str]) -> list[dict[str, Any]]:
+    """
+    Create the table's primary key and declared indexes. Unique indexes that
+    the exported data violates fall back to plain indexes and are flagged.
+    """
+    present = set(header)
+    wanted: list[tuple[str, bool, list[str]]] = []
+    if schema.primary_key:
+        wanted.append((f"{table}_pk", True, schema.primary_key))
+    seen_columns: set[tuple[str, ...]] = {tuple(schema.primary_key)} if schema.primary_key else set()
+    for index_name, unique, columns in schema.indexes:
+        if tuple(columns) in seen_columns:
+            continue
+        seen_columns.add(tuple(columns))
+        wanted.append((index_name, unique, columns))
+
+    created: list[dict[str, Any]] = []
+    for index_name, unique, columns in wanted:
+        if not columns or not set(columns) <= present:
+            continue
+        column_sql = ", ".join(quote_ident(column) for column in columns)
+        name_sql = quote_ident(f"ix_{table}__{index_name}")
+        demoted = False
+        try:
+            conn.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name_sql} ON {quote_ident(table)} ({column_sql})")
+        except sqlite3.IntegrityError:
+            conn.execute(f"CREATE INDEX {name_sql} ON {quote_ident(table)} ({column_sql})")
+            demoted = True
+        created.append({"name": index_name, "columns": columns, "unique": unique and not demoted, "demoted": demoted})
+    return created
+
+
+def load_table(
+    conn: sqlite3.Connection,
+    table: str,
+    csv_path: Path,
+    schema: TableSchema | None,
+) -> dict[str, Any]:
+    started = time.perf_counter()
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None) or []
+        declared = schema.columns if schema else {}
+        affinities = [declared.get(column, "TEXT") for column in header]
+
+        conn.execute(f"DROP TABLE IF EXISTS {quote_ident(table)}")
+        if not header:
+            conn.execute(f"CREATE TABLE {quote_ident(table)} (_empty TEXT)")
+            return {"table": table, "record_count": 0, "columns": [], "indexes": [], "load_seconds": 0.0}
+        column_sql = ", ".join(f"{quote_ident(column)} {affinity}" for column, affinity in zip(header, affinities))
+        conn.execute(f"CREATE TABLE {quote_ident(table)} ({column_sql})")
+        placeholders = ", ".join("?" for _ in header)
+        cursor = conn.executemany(
+            f"INSERT INTO {quote_ident(table)} VALUES ({placeholders})",
+            iter_typed_rows(reader, affinities),
+        )
+        record_count = cursor.rowcount
+
+    indexes = create_indexes(conn, table, schema, header) if schema else []
+    return {
+        "table": table,
+        "record_count": record_count,
+        "columns": [{"name": column, "type": affinity} for column, affinity in zip(header, affinities)],
+        "indexes": indexes,
+        "load_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def build_snapshot_sqlite(snapshot_dir: Path, manifest: dict[str, Any], out_path: Path | None = None) -> dict[str, Any]:
+    """Build the typed SQLite file for a snapshot and return its manifest entry."""
+    started = time.perf_counter()
+    out_path = out_path or snapshot_dir / SQLITE_FILENAME
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = out_path.with_name(out_path.name + ".partial")
+    partial.unlink(missing_ok=True)
+
+    schemas_by_source: dict[str, dict[str, TableSchema]] = {}
+    for source, entry in (manifest.get("schemas") or {}).items():
+        schema_path = Path(str(entry.get("path") or ""))
+        if schema_path.is_file():
+            schemas_by_source[source] = parse_schema_sql(schema_path.read_text(encoding="utf-8"))
+
+    conn = sqlite3.connect(partial, isolation_level=None)
+    try:
+        # Throwaway file until the rename below, so durability pragmas are off.
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("BEGIN")
+        conn.execute("CREATE TABLE _snapshot_meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            """
+            CREATE TABLE _snapshot_tables (
+              table_name TEXT PRIMARY KEY,
+              source TEXT,
+              csv_sha256 TEXT,
+              record_count INTEGER,
+              typed_columns INTEGER,
+              indexes_json TEXT
+            )
+            """
+        )
+        loaded: list[dict[str, Any]] = []
+        for entry in manifest.get("objects", []):
+            table = str(entry["table"])
+            source = str(entry.get("source") or "")
+            schema = schemas_by_source.get(source, {}).get(table)
+            result = load_table(conn, table, Path(str(entry["csv_path"])), schema)
+            if result["record_count"] != entry.get("record_count", result["record_count"]):
+                raise RuntimeError(
+                    f"row count mismatch loading {table}: csv manifest={entry.get('record_count')} sqlite={result['record_count']}"
+                )
+            result["source"] = source
+            result["typed_columns"] = sum(1 for column in result["columns"] if column["type"] != "TEXT")
+            conn.execute(
+                "INSERT INTO _snapshot_tables VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    table,
+                    source,
+                    entry.get("sha256"),
+                    result["record_count"],
+                    result["typed_columns"],
+                    json.dumps(result["indexes"]),
+                ),
+            )
+            loaded.append(result)
+
+        built_at = now_iso()
+        conn.executemany(
+            "INSERT INTO _snapshot_meta VALUES (?, ?)",
+            [
+                ("snapshot_id", str(manifest.get("snapshot_id") or snapshot_dir.name)),
+                ("manifest_version", str(manifest.get("manifest_version") or "")),
+                ("built_at_utc", built_at),
+            ],
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.close()
+        partial.unlink(missing_ok=True)
+        raise
+    conn.close()
+    os.replace(partial, out_path)
+
+    return {
+        "path": str(out_path),
+        "built_at_utc": built_at,
+        "tables": [
+            {
+                "table": result["table"],
+                "source": result["source"],
+                "record_count": result["record_count"],
+                "typed_columns": result["typed_columns"],
+                "indexes": [index["name"] for index in result["indexes"]],
+                "demoted_unique_indexes": [index["name"] for index in result["indexes"] if index["demoted"]],
+                "load_seconds": result["load_seconds"],
+            }
+            for result in loaded
+        ],
+        "build_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load a legacy snapshot's CSV tables into a typed SQLite file")
+    parser.add_argument("--snapshot-dir", required=True, help="Snapshot folder containing legacy_snapshot_manifest.json")
+    parser.add_argument("--out", help=f"SQLite output path (default: <snapshot-dir>/{SQLITE_FILENAME})")
+    parser.add_argument(
+        "--no-manifest-update",
+        action="store_true",
+        help="Do not record the SQLite build in the snapshot manifest",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    snapshot_dir = Path(args.snapshot_dir).expanduser().resolve()
+    manifest_path = snapshot_dir / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        raise RuntimeError(f"snapshot manifest not found: {manifest_path}")
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    result = build_snapshot_sqlite(snapshot_dir, manifest, Path(args.out).expanduser().resolve() if args.out else None)
+    if not args.no_manifest_update:
+        manifest["sqlite"] = result
+        manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+    print(f"SQLite snapshot written: {result['path']}")
+    print(
+        json.dumps(
+            {
+                "tables": len(result["tables"]),
+                "rows": sum(table["record_count"] for table in result["tables"]),
+                "build_seconds": result["build_seconds"],
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        raise SystemExit(1)
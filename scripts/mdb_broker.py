@@ -0,0 +1,335 @@
+"""
+Shared Access table reader backed by one long-running `mdb-sql` per file.
+
+Parity and audit scripts read the same small system tables (MSysObjects,
+MSysQueries) from the same .accdb files. `AccessReader` keeps one `mdb-sql`
+session per database path, sends each batch of SELECTs down its stdin in one
+write, and parses the delimited result sets back into DictReader-style rows.
+Process startup and the .accdb catalog parse are then paid once per file.
+
+Usage from a script:
+
+    from mdb_broker import MSYSOBJECTS_COLUMNS, access_reader
+
+    rows = access_reader().read_table(db_path, "MSysObjects", MSYSOBJECTS_COLUMNS)
+
+Protocol notes:
+- mdb-sql runs with `-p` (no pretty print) and a unit-separator delimiter.
+  Each statement ends with a `go` line. A result set is a header line, then
+  rows, then a "N Rows retrieved" footer, which also marks where it ends.
+- Values containing newlines are rejoined by counting delimiters against
+  the header width.
+- Anything unexpected, such as a header mismatch, a stray delimiter, an
+  error on stderr or a timeout, stops the session. That read then falls
+  back to a per-table `mdb-export`, so results match the old path.
+- Binary columns (e.g. MSysAccessStorage.Lv) are not safe in delimited text;
+  pass `binary=True` to read them with mdb-export directly.
+- With `configure_table_cache(root)`, reads and table catalogs are answered
+  from a cache keyed by the file's SHA-256 (see access_table_cache.py), so an
+  unchanged file is not opened by mdbtools at all.
+"""
+
+from __future__ import annotations
+
+import atexit
+import csv
+import io
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from access_table_cache import TableCache
+
+try:
+    csv.field_size_limit(sys.maxsize)
+except OverflowError:
+    csv.field_size_limit(2**31 - 1)
+
+DELIMITER = "\x1f"
+FOOTER_PATTERN = re.compile(r"^(No Rows|1 Row|(\d+) Rows) retrieved$")
+PROMPT_PATTERN = re.compile(r"^\d+ => ")
+DEFAULT_TIMEOUT_SECONDS = 300.0
+
+# Columns the parity/audit scripts read from the Access system tables.
+MSYSOBJECTS_COLUMNS: tuple[str, ...] = (
+    "Id",
+    "ParentId",
+    "Name",
+    "Type",
+    "Flags",
+    "DateCreate",
+    "DateUpdate",
+    "ForeignName",
+    "Database",
+    "Connect",
+)
+MSYSQUERIES_COLUMNS: tuple[str, ...] = ("ObjectId", "Attribute", "Order", "Name1", "Name2", "Expression", "Flag")
+
+
+class BrokerError(RuntimeError):
+    """The mdb-sql session is out of step or failed; callers fall back to mdb-export."""
+
+
+def run_tool(args: list[str]) -> str:
+    proc = subprocess.run(args, capture_output=True, check=False)
+    if proc.returncode != 0:
+        stderr = (proc.stderr or b"").decode("utf-8", errors="replace")
+        raise RuntimeError(f"Command failed ({proc.returncode}): {' '.join(args)}\n{stderr[:1200]}")
+    return (proc.stdout or b"").decode("utf-8", errors="replace")
+
+
+def export_rows(db_path: Path, table: str, columns: Sequence[str] | None = None) -> list[dict[str, str]]:
+    # newline="" keeps line breaks inside quoted memo values, as mdb-sql does.
+    rows = list(csv.DictReader(io.StringIO(run_tool(["mdb-export", str(db_path), table]), newline="")))
+    if columns is None:
+        return rows
+    return [{column: row.get(column) or "" for column in columns} for row in rows]
+
+
+def select_sql(table: str, columns: Sequence[str] | None) -> str:
+    column_sql = "*" if not columns else ", ".join(f"[{column}]" for column in columns)
+    return f"SELECT {column_sql} FROM [{table}]"
+
+
+class MdbSqlSession:
+    """One `mdb-sql` process bound to one Access file."""
+
+    def __init__(self, db_path: Path, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> None:
+        self.db_path = db_path
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.events: queue.Queue[tuple[str, str | None]] = queue.Queue()
+        self.proc = subprocess.Popen(
+            ["mdb-sql", "-p", "-d", DELIMITER, str(db_path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        self.statements_run = 0
+        for name, stream in (("out", self.proc.stdout), ("err", self.proc.stderr)):
+            # Split on "\n" only, so "\r\n" inside memo values survives the rejoin.
+            reader = io.TextIOWrapper(stream, encoding="utf-8", errors="replace", newline="\n")
+            threading.Thread(target=self._pump, args=(name, reader), daemon=True).start()
+
+    def _pump(self, name: str, stream) -> None:
+        for line in stream:
+            self.events.put((name, line.rstrip("\n")))
+        self.events.put((name, None))
+
+    def _next_line(self) -> str:
+        try:
+            kind, line = self.events.get(timeout=self.timeout)
+        except queue.Empty as exc:
+            raise BrokerError(f"mdb-sql timed out on {self.db_path}") from exc
+        if line is None:
+            raise BrokerError(f"mdb-sql exited unexpectedly on {self.db_path}")
+        if kind == "err":
+            raise BrokerError(f"mdb-sql error on {self.db_path}: {line.strip()[:500]}")
+        return line
+
+    def _read_result(self, expected_columns: Sequence[str] | None) -> list[dict[str, str]]:
+        header_line = PROMPT_PATTERN.sub("", self._next_line())
+        while header_line == "":
+            header_line = PROMPT_PATTERN.sub("", self._next_line())
+        header = header_line.split(DELIMITER)
+        if expected_columns and header != list(expected_columns):
+            raise BrokerError(f"unexpected mdb-sql header {header!r} (wanted {list(expected_columns)!r})")
+
+        width = len(header)
+        rows: list[dict[str, str]] = []
+        pending: str | None = None
+        while True:
+            line = self._next_line()
+            if pending is None:
+                footer = FOOTER_PATTERN.match(line)
+                if footer:
+                    expected = 0 if line.startswith("No") else 1 if line.startswith("1 Row") else int(footer.group(2))
+                    if expected != len(rows):
+                        raise BrokerError(f"mdb-sql row count mismatch: footer={expected} parsed={len(rows)}")
+                    return rows
+                pending = line
+            else:
+                pending = f"{pending}\n{line}"
+            separators = pending.count(DELIMITER)
+            if separators > width - 1:
+                raise BrokerError("mdb-sql row has more fields than its header (delimiter inside a value)")
+            if separators == width - 1:
+                rows.append(dict(zip(header, pending.split(DELIMITER))))
+                pending = None
+
+    def run_batch(self, statements: Sequence[tuple[str, Sequence[str] | None]]) -> list[list[dict[str, str]]]:
+        """Run (sql, expected_columns) statements in one stdin write; return one row list per statement."""
+        with self.lock:
+            if self.proc.poll() is not None:
+                raise BrokerError(f"mdb-sql is not running for {self.db_path}")
+            script = "".join(f"{sql}\ngo\n" for sql, _ in statements)
+            try:
+                assert self.proc.stdin is not None
+                self.proc.stdin.write(script.encode("utf-8"))
+                self.proc.stdin.flush()
+            except OSError as exc:
+                raise BrokerError(f"mdb-sql stdin closed for {self.db_path}: {exc}") from exc
+            results = [self._read_result(columns) for _, columns in statements]
+            self.statements_run += len(statements)
+            return results
+
+    def close(self) -> None:
+        if self.proc.poll() is None:
+            try:
+                assert self.proc.stdin is not None
+                self.proc.stdin.close()
+                self.proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+
+
+class AccessReader:
+    """
+    The one read interface for Access tables. Uses pooled mdb-sql sessions
+    when available and falls back to mdb-export per table otherwise.
+    """
+
+    def __init__(self, use_sql: bool | None = None, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> None:
+        self.use_sql = shutil.which("mdb-sql") is not None if use_sql is None else use_sql
+        self.timeout = timeout
+        self.sessions: dict[Path, MdbSqlSession] = {}
+        self.failed: set[Path] = set()
+        self.lock = threading.Lock()
+        self.cache: TableCache | None = None
+        self.stats = {"sql_statements": 0, "sql_sessions": 0, "export_calls": 0, "fallbacks": 0}
+
+    def _session(self, db_path: Path) -> MdbSqlSession | None:
+        if not self.use_sql or db_path in self.failed:
+            return None
+        with self.lock:
+            session = self.sessions.get(db_path)
+            if session is None:
+                try:
+                    session = MdbSqlSession(db_path, self.timeout)
+                except OSError:
+                    self.failed.add(db_path)
+                    return None
+                self.sessions[db_path] = session
+                self.stats["sql_sessions"] += 1
+            return session
+
+    def _drop_session(self, db_path: Path, reason: BrokerError) -> None:
+        with self.lock:
+            session = self.sessions.pop(db_path, None)
+            self.failed.add(db_path)
+            self.stats["fallbacks"] += 1
+        if session is not None:
+            session.proc.kill()
+            session.proc.wait()
+        print(f"WARN: mdb-sql broker disabled for {db_path.name}, using mdb-export: {reason}", file=sys.stderr)
+
+    def read_tables(
+        self,
+        db_path: Path,
+        requests: Iterable[tuple[str, Sequence[str] | None]],
+    ) -> list[list[dict[str, str]]]:
+        """Read several (table, columns) pairs from one file in a single mdb-sql round trip."""
+        db_path = Path(db_path)
+        pending = list(requests)
+        if self.cache is None:
+            return self._read_uncached(db_path, pending)
+
+        file_sha = self.cache.fingerprint(db_path)
+        results = [self.cache.get(file_sha, table, columns) for table, columns in pending]
+        misses = [index for index, rows in enumerate(results) if rows is None]
+        if misses:
+            fresh = self._read_uncached(db_path, [pending[index] for index in misses])
+            for index, rows in zip(misses, fresh):
+                table, columns = pending[index]
+                self.cache.put(file_sha, table, columns, rows)
+                results[index] = rows
+        return results  # type: ignore[return-value]
+
+    def _read_uncached(
+        self, db_path: Path, pending: list[tuple[str, Sequence[str] | None]]
+    ) -> list[list[dict[str, str]]]:
+        session = self._session(db_path)
+        if session is not None:
+            try:
+                results = session.run_batch([(select_sql(table, columns), columns) for table, columns in pending])
+                self.stats["sql_statements"] += len(pending)
+                return results
+            except BrokerError as exc:
+                self._drop_session(db_path, exc)
+
+        results = []
+        for table, columns in pending:
+            self.stats["export_calls"] += 1
+            results.append(export_rows(db_path, table, columns))
+        return results
+
+    def read_table(
+        self,
+        db_path: Path,
+        table: str,
+        columns: Sequence[str] | None = None,
+        *,
+        binary: bool = False,
+    ) -> list[dict[str, str]]:
+        if not binary:
+            return self.read_tables(db_path, [(table, columns)])[0]
+        db_path = Path(db_path)
+        file_sha = self.cache.fingerprint(db_path) if self.cache is not None else None
+        if file_sha is not None:
+            cached = self.cache.get(file_sha, table, columns, binary=True)
+            if cached is not None:
+                return cached
+        self.stats["export_calls"] += 1
+        rows = export_rows(db_path, table, columns)
+        if file_sha is not None:
+            self.cache.put(file_sha, table, columns, rows, binary=True)
+        return rows
+
+    def list_tables(self, db_path: Path, include_system: bool = True) -> list[str]:
+        file_sha = self.cache.fingerprint(Path(db_path)) if self.cache is not None else None
+        if file_sha is not None:
+            cached = self.cache.get_catalog(file_sha, include_system)
+            if cached is not None:
+                return cached
+        # mdb-sql's `list tables` hides system tables, so the catalog comes from mdb-tables.
+        cmd = ["mdb-tables"]
+        if include_system:
+            cmd.append("-S")
+        cmd.extend(["-1", str(db_path)])
+        output = run_tool(cmd)
+        tables = sorted([line.strip() for line in output.splitlines() if line.strip()])
+        if file_sha is not None:
+            self.cache.put_catalog(file_sha, include_system, tables)
+        return tables
+
+    def close(self) -> None:
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_READER: AccessReader | None = None
+
+
+def access_reader() -> AccessReader:
+    """Process-wide reader, so every script shares one mdb-sql session per file."""
+    global _READER
+    if _READER is None:
+        _READER = AccessReader()
+        atexit.register(_READER.close)
+    return _READER
+
+
+def configure_table_cache(root: Path | None) -> TableCache | None:
+    """Point the process-wide reader at a table cache directory (None disables it)."""
+    reader = access_reader()
+    reader.cache = TableCache(Path(root).expanduser().resolve()) if root is not None else None
+    return reader.cache
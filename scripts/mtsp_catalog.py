@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Indexed SQLite catalog of parsed MTSP reference PDFs.
+
+Usage:
+  python3 scripts/mtsp_catalog.py --pdf-dir "/path/to/MTSP PDFs"
+
+Each PDF is parsed once with `retest_mtsp_corpus.parse_pdf` and stored in:
+- files        (path, size/mtime/sha256 probe, region, report source)
+- source_dots  (Report 5 work-history DOTs, in report order)
+- profiles     (Profile 3 / Profile 4 VQ and trait vectors)
+- report_rows  (Report 8/10 reference TS/VA rows)
+
+Re-runs only re-parse files whose size/mtime changed and whose SHA-256 no
+longer matches, plus files whose last parse failed or used another
+--pdf-backend. Comparison scripts read parses back with `load_parsed`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from mtsp_pdf_backends import BACKEND_CHOICES, REFERENCE_BACKEND, resolve_backend
+
+SCHEMA_VERSION = "2"
+CATALOG_TABLES = ("report_rows", "profiles", "source_dots", "files")
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS catalog_meta (
+  key TEXT PRIMARY KEY,
+  value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS files (
+  file_id INTEGER PRIMARY KEY,
+  path TEXT NOT NULL UNIQUE,
+  size_bytes INTEGER NOT NULL,
+  mtime_ns INTEGER NOT NULL,
+  sha256 TEXT NOT NULL,
+  pdf_backend TEXT NOT NULL,
+  ingested_at_utc TEXT NOT NULL,
+  parse_error TEXT,
+  state_abbrev TEXT,
+  county_name TEXT,
+  selected_report_source TEXT,
+  report8_row_count INTEGER,
+  report10_row_count INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS source_dots (
+  file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+  position INTEGER NOT NULL,
+  dot_code TEXT NOT NULL,
+  PRIMARY KEY (file_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS profiles (
+  file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+  profile_kind TEXT NOT NULL,
+  vq REAL,
+  trait_values TEXT NOT NULL,
+  PRIMARY KEY (file_id, profile_kind)
+);
+
+CREATE TABLE IF NOT EXISTS report_rows (
+  file_id INTEGER NOT NULL REFERENCES files(file_id) ON DELETE CASCADE,
+  position INTEGER NOT NULL,
+  report_source TEXT,
+  dot_code TEXT NOT NULL,
+  dot_code_formatted TEXT,
+  sample_ts_percent INTEGER NOT NULL,
+  sample_va_percent INTEGER NOT NULL,
+  line TEXT,
+  PRIMARY KEY (file_id, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_files_region ON files(state_abbrev, county_name);
+CREATE INDEX IF NOT EXISTS idx_files_sha256 ON files(sha256);
+CREATE INDEX IF NOT EXISTS idx_source_dots_dot ON source_dots(dot_code);
+CREATE INDEX IF NOT EXISTS idx_report_rows_dot ON report_rows(dot_code);
+"""
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def connect(catalog_path: Path) -> sqlite3.Connection:
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(catalog_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("CREATE TABLE IF NOT EXISTS catalog_meta (key TEXT PRIMARY KEY, value TEXT)")
+    version = conn.execute("SELECT value FROM catalog_meta WHERE key = 'schema_version'").fetchone()
+    if version is not None and version["value"] != SCHEMA_VERSION:
+        for table in CATALOG_TABLES:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.executescript(SCHEMA_SQL)
+    conn.execute(
+        "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('schema_version', ?)",
+        (SCHEMA_VERSION,),
+    )
+    conn.commit()
+    return conn
+
+
+def file_probe(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return int(stat.st_size), int(stat.st_mtime_ns)
+
+
+def store_parsed(
+    conn: sqlite3.Connection,
+    path: Path,
+    size_bytes: int,
+    mtime_ns: int,
+    sha256: str,
+    parsed: dict[str, Any] | None,
+    parse_error: str | None = None,
+    pdf_backend: str = REFERENCE_BACKEND,
+) -> None:
+    parsed = parsed or {}
+    conn.execute("DELETE FROM files WHERE path = ?", (str(path),))
+    cursor = conn.execute(
+        """
+        INSERT INTO files (
+          path, size_bytes, mtime_ns, sha256, pdf_backend, ingested_at_utc, parse_error, state_abbrev, county_name,
+          selected_report_source, report8_row_count, report10_row_count
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            str(path),
+            size_bytes,
+            mtime_ns,
+            sha256,
+            pdf_backend,
+            now_iso(),
+            parse_error,
+            parsed.get("state_abbrev"),
+            parsed.get("county_name"),
+            parsed.get("selected_report_source"),
+            parsed.get("report8_row_count"),
+            parsed.get("report10_row_count"),
+        ),
+    )
+    file_id = int(cursor.lastrowid)
+    conn.executemany(
+        "INSERT INTO source_dots (file_id, position, dot_code) VALUES (?, ?, ?)",
+        [(file_id, position, dot_code) for position, dot_code in enumerate(parsed.get("source_dots") or [])],
+    )
+    for kind in ("profile3", "profile4"):
+        values = parsed.get(f"{kind}_values")
+        if values is None:
+            continue
+        conn.execute(
+            "INSERT INTO profiles (file_id, profile_kind, vq, trait_values) VALUES (?, ?, ?, ?)",
+            (file_id, kind, parsed.get(f"{kind}_vq"), ",".join(str(int(value)) for value in values)),
+        )
+    conn.executemany(
+        """
+        INSERT INTO report_rows (
+          file_id, position, report_source, dot_code, dot_code_formatted, sample_ts_percent, sample_va_percent, line
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                file_id,
+                position,
+                parsed.get("selected_report_source"),
+                row["dot_code"],
+                row.get("dot_code_formatted"),
+                int(row["sample_ts_percent"]),
+                int(row["sample_va_percent"]),
+                row.get("line"),
+            )
+            for position, row in enumerate(parsed.get("report_rows") or [])
+        ],
+    )
+
+
+def load_parsed(conn: sqlite3.Connection, path: Path, pdf_backend: str | None = None) -> dict[str, Any] | None:
+    """Return a `parse_pdf`-shaped dict for a current, successfully parsed file, else None."""
+    row = conn.execute("SELECT * FROM files WHERE path = ?", (str(path),)).fetchone()
+    if row is None or row["parse_error"] is not None:
+        return None
+    if pdf_backend is not None and row["pdf_backend"] != pdf_backend:
+        return None
+    if (int(row["size_bytes"]), int(row["mtime_ns"])) != file_probe(path):
+        return None
+
+    file_id = int(row["file_id"])
+    source_dots = [
+        str(item["dot_code"])
+        for item in conn.execute("SELECT dot_code FROM source_dots WHERE file_id = ? ORDER BY position", (file_id,))
+    ]
+    profiles = {
+        str(item["profile_kind"]): item
+        for item in conn.execute("SELECT profile_kind, vq, trait_values FROM profiles WHERE file_id = ?", (file_id,))
+    }
+    report_rows = [
+        {
+            "dot_code": str(item["dot_code"]),
+            "dot_code_formatted": item["dot_code_formatted"],
+            "sample_ts_percent": int(item["sample_ts_percent"]),
+            "sample_va_percent": int(item["sample_va_percent"]),
+            "line": item["line"],
+        }
+        for item in conn.execute(
+            """
+            SELECT dot_code, dot_code_formatted, sample_ts_percent, sample_va_percent, line
+            FROM report_rows
+            WHERE file_id = ?
+            ORDER BY position
+            """,
+            (file_id,),
+        )
+    ]
+
+    def profile_values(kind: str) -> list[int] | None:
+        item = profiles.get(kind)
+        if item is None:
+            return None
+        return [int(token) for token in str(item["trait_values"]).split(",") if token]
+
+    def profile_vq(kind: str) -> float | None:
+        item = profiles.get(kind)
+        return float(item["vq"]) if item is not None and item["vq"] is not None else None
+
+    return {
+        "state_abbrev": row["state_abbrev"],
+        "county_name": row["county_name"],
+        "source_dots": source_dots,
+        "source_dots_count": len(source_dots),
+        "profile3_found": "profile3" in profiles,
+        "profile4_found": "profile4" in profiles,
+        "profile3_values": profile_values("profile3"),
+        "profile4_values": profile_values("profile4"),
+        "profile3_vq": profile_vq("profile3"),
+        "profile4_vq": profile_vq("profile4"),
+        "report_rows": report_rows,
+        "report_rows_count": len(report_rows),
+        "report8_row_count": int(row["report8_row_count"] or 0),
+        "report10_row_count": int(row["report10_row_count"] or 0),
+        "selected_report_source": row["selected_report_source"],
+    }
+
+
+def ingest(
+    conn: sqlite3.Connection,
+    pdf_paths: list[Path],
+    force: bool = False,
+    progress_every: int = 0,
+    pdf_backend: str = REFERENCE_BACKEND,
+) -> dict[str, int]:
+    from retest_mtsp_corpus import parse_pdf
+
+    counts = {"scanned": 0, "ingested": 0, "unchanged": 0, "touched": 0, "failed": 0}
+    for path in pdf_paths:
+        counts["scanned"] += 1
+        if progress_every > 0 and counts["scanned"] % progress_every == 0:
+            print(f"[progress] scanned={counts['scanned']} ingested={counts['ingested']}", flush=True)
+
+        size_bytes, mtime_ns = file_probe(path)
+        existing = conn.execute(
+            "SELECT size_bytes, mtime_ns, sha256, pdf_backend, parse_error FROM files WHERE path = ?",
+            (str(path),),
+        ).fetchone()
+        # A failed parse or another backend's parse is never reused, even for an unchanged file.
+        reusable = (
+            not force
+            and existing is not None
+            and existing["parse_error"] is None
+            and existing["pdf_backend"] == pdf_backend
+        )
+        if reusable and (int(existing["size_bytes"]), int(existing["mtime_ns"])) == (size_bytes, mtime_ns):
+            counts["unchanged"] += 1
+            continue
+
+        digest = sha256_file(path)
+        if reusable and existing["sha256"] == digest:
+            conn.execute(
+                "UPDATE files SET size_bytes = ?, mtime_ns = ? WHERE path = ?",
+                (size_bytes, mtime_ns, str(path)),
+            )
+            conn.commit()
+            counts["touched"] += 1
+            continue
+
+        try:
+            parsed = parse_pdf(path, backend=pdf_backend)
+            parse_error = None
+        except Exception as exc:
+            parsed = None
+            parse_error = str(exc) or exc.__class__.__name__
+        with conn:
+            store_parsed(conn, path, size_bytes, mtime_ns, digest, parsed, parse_error, pdf_backend)
+        counts["failed" if parse_error else "ingested"] += 1
+    return counts
+
+
+def prune_missing(conn: sqlite3.Connection, pdf_dir: Path) -> int:
+    """
+    Drop entries under `pdf_dir` whose file no longer exists. The keep-set is
+    a full listing of the directory, not the --glob/--max-files selection,
+    so a filtered or capped run never prunes files that are still there.
+    """
+    keep = {str(path) for path in pdf_dir.rglob("*") if path.is_file()}
+    stale = [
+        str(row["path"])
+        for row in conn.execute("SELECT path FROM files")
+        if Path(str(row["path"])).is_relative_to(pdf_dir) and str(row["path"]) not in keep
+    ]
+    with conn:
+        conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in stale])
+    return len(stale)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingest parsed MTSP PDFs into an indexed SQLite catalog.")
+    parser.add_argument("--pdf-dir", required=True, help="Directory containing MTSP PDFs")
+    parser.add_argument("--glob", default="*.pdf", help="Glob pattern under --pdf-dir")
+    parser.add_argument("--catalog-db", default="output/analysis/mtsp_catalog.db", help="SQLite catalog path")
+    parser.add_argument("--max-files", type=int, default=0, help="Optional file cap for dry runs")
+    parser.add_argument(
+        "--pdf-backend",
+        choices=BACKEND_CHOICES,
+        default=REFERENCE_BACKEND,
+        help="PDF text-extraction backend (see mtsp_pdf_backends.py).",
+    )
+    parser.add_argument("--force", action="store_true", help="Re-parse every file even if unchanged")
+    parser.add_argument("--prune", action="store_true", help="Drop catalog entries for files no longer under --pdf-dir")
+    parser.add_argument(
+        "--progress-every",
+        type=int,
+        default=50,
+        help="Progress log interval (files). Set 0 to disable.",
+    )
+    args = parser.parse_args()
+
+    pdf_dir = Path(args.pdf_dir).expanduser().resolve()
+    if not pdf_dir.exists():
+        raise RuntimeError(f"PDF directory not found: {pdf_dir}")
+
+    pdf_paths = sorted(path for path in pdf_dir.glob(args.glob) if path.is_file())
+    if args.max_files > 0:
+        pdf_paths = pdf_paths[: args.max_files]
+    if not pdf_paths:
+        raise RuntimeError(f"No files matched {args.glob!r} in {pdf_dir}")
+
+    catalog_path = Path(args.catalog_db).expanduser().resolve()
+    conn = connect(catalog_path)
+    try:
+        counts = ingest(
+            conn,
+            pdf_paths,
+            force=args.force,
+            progress_every=args.progress_every,
+            pdf_backend=resolve_backend(args.pdf_backend),
+        )
+        if args.prune:
+            counts["pruned"] = prune_missing(conn, pdf_dir)
+        counts["catalog_files"] = int(conn.execute("SELECT COUNT(*) FROM files").fetchone()[0])
+        counts["catalog_report_rows"] = int(conn.execute("SELECT COUNT(*) FROM report_rows").fetchone()[0])
+    finally:
+        conn.close()
+
+    print(f"Catalog: {catalog_path}")
+    print(json.dumps(counts, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        raise SystemExit(1)
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Pluggable text-extraction backends for MTSP PDFs, plus a benchmark mode.
+
+Backends:
+- pdfplumber: pure-Python layout analysis (reference/oracle, always the fallback)
+- pdftotext:  poppler `pdftotext -layout` for page text and `-bbox` for words
+- auto:       pdftotext when it is on PATH, otherwise pdfplumber
+
+Benchmark usage:
+  python3 scripts/mtsp_pdf_backends.py --pdf-dir "/path/to/MTSP PDFs" \
+    --backends pdfplumber pdftotext
+
+The benchmark times `retest_mtsp_corpus.parse_pdf` and
+`validate_legacy_sync.parse_pdf_rows` per backend and reports row-level
+differences against the pdfplumber output. It runs the backends with
+`strict=True`, so a pdftotext failure is reported as an error for that file
+instead of silently falling back to pdfplumber and matching itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import re
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+BACKENDS = ("pdfplumber", "pdftotext")
+BACKEND_CHOICES = ("auto",) + BACKENDS
+REFERENCE_BACKEND = "pdfplumber"
+
+PAGE_RE = re.compile(r"<page\b[^>]*>(.*?)</page>", re.DOTALL)
+WORD_RE = re.compile(
+    r'<word xMin="([\d.]+)" yMin="([\d.]+)" xMax="([\d.]+)" yMax="([\d.]+)">(.*?)</word>',
+    re.DOTALL,
+)
+LAYOUT_GAP_RE = re.compile(r"[ \t]{2,}")
+PAGES_RE = re.compile(r"^Pages:\s+(\d+)", re.MULTILINE)
+
+
+def now_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def load_pdfplumber() -> Any:
+    try:
+        import pdfplumber
+    except Exception as exc:  # pragma: no cover
+        raise SystemExit(
+            "Missing dependency: pdfplumber. Install with `python3 -m pip install --user pdfplumber`."
+        ) from exc
+    return pdfplumber
+
+
+def resolve_backend(name: str) -> str:
+    if name == "auto":
+        return "pdftotext" if shutil.which("pdftotext") else REFERENCE_BACKEND
+    if name not in BACKENDS:
+        raise RuntimeError(f"Unknown PDF backend: {name!r} (expected one of {', '.join(BACKEND_CHOICES)})")
+    if name == "pdftotext" and not shutil.which("pdftotext"):
+        raise RuntimeError("pdftotext not found on PATH (install poppler-utils) or use --pdf-backend pdfplumber.")
+    return name
+
+
+def run_pdftotext(args: list[str]) -> str:
+    proc = subprocess.run(["pdftotext", *args], capture_output=True, text=True, encoding="utf-8", errors="replace")
+    if proc.returncode != 0:
+        raise RuntimeError(f"pdftotext failed ({proc.returncode}): {proc.stderr.strip()[:500]}")
+    return proc.stdout
+
+
+def pdf_page_count(path: Path) -> int | None:
+    """Page count from poppler `pdfinfo`, or None when it is unavailable or fails."""
+    if not shutil.which("pdfinfo"):
+        return None
+    proc = subprocess.run(["pdfinfo", str(path)], capture_output=True, text=True, encoding="utf-8", errors="replace")
+    if proc.returncode != 0:
+        return None
+    match = PAGES_RE.search(proc.stdout)
+    return int(match.group(1)) if match else None
+
+
+def page_range_args(page_indexes: list[int] | None, page_count: int | None = None) -> list[str] | None:
+    """
+    `-f`/`-l` for the wanted 0-based pages, clamped to `page_count`. Returns
+    None when no wanted page exists in the document; poppler rejects a first
+    page past the end instead of returning nothing.
+    """
+    if not page_indexes:
+        return []
+    first, last = min(page_indexes) + 1, max(page_indexes) + 1
+    if page_count is not None:
+        if first > page_count:
+            return None
+        last = min(last, page_count)
+    return ["-f", str(first), "-l", str(last)]
+
+
+def fall_back_to_pdfplumber(path: Path, exc: RuntimeError, strict: bool) -> None:
+    if strict:
+        raise exc
+    print(f"WARN: {exc}; falling back to pdfplumber for {path.name}", file=sys.stderr)
+
+
+def extract_page_texts(path: Path, backend: str = REFERENCE_BACKEND, strict: bool = False) -> list[str]:
+    """
+    Return one text block per page, with single-spaced words like pdfplumber's `extract_text`.
+
+    A failing pdftotext run falls back to pdfplumber unless `strict` is set.
+    """
+    backend = resolve_backend(backend)
+    if backend == "pdftotext":
+        try:
+            output = run_pdftotext(["-layout", "-enc", "UTF-8", str(path), "-"])
+        except RuntimeError as exc:
+            fall_back_to_pdfplumber(path, exc, strict)
+        else:
+            pages = output.split("\f")
+            if pages and not pages[-1].strip():
+                pages.pop()
+            return ["\n".join(LAYOUT_GAP_RE.sub(" ", line).strip() for line in page.splitlines()) for page in pages]
+
+    pdfplumber = load_pdfplumber()
+    with pdfplumber.open(str(path)) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages]
+
+
+def extract_page_words(
+    path: Path,
+    backend: str = REFERENCE_BACKEND,
+    page_indexes: Iterable[int] | None = None,
+    strict: bool = False,
+) -> dict[int, list[dict[str, Any]]]:
+    """
+    Return words per page index (0-based) with `text`, `x0`, `x1`, `top`, `bottom`.
+
+    When `page_indexes` is given only those pages are extracted; indexes past
+    the end of the document are omitted. A failing pdftotext run falls back to
+    pdfplumber unless `strict` is set.
+    """
+    backend = resolve_backend(backend)
+    wanted = sorted(set(page_indexes)) if page_indexes is not None else None
+
+    if backend == "pdftotext":
+        # Without a page count the range cannot be clamped, so read every page and filter.
+        page_count = pdf_page_count(path) if wanted else None
+        range_args = page_range_args(wanted, page_count) if page_count is not None else []
+        if range_args is None:
+            return {}
+        try:
+            output = run_pdftotext(["-bbox", "-enc", "UTF-8", *range_args, str(path), "-"])
+        except RuntimeError as exc:
+            fall_back_to_pdfplumber(path, exc, strict)
+        else:
+            first_index = int(range_args[1]) - 1 if range_args else 0
+            pages: dict[int, list[dict[str, Any]]] = {}
+            for offset, page_match in enumerate(PAGE_RE.finditer(output)):
+                page_index = first_index + offset
+                if wanted is not None and page_index not in wanted:
+                    continue
+                pages[page_index] = [
+                    {
+                        "text": html.unescape(text),
+                        "x0": float(x_min),
+                        "x1": float(x_max),
+                        "top": float(y_min),
+                        "bottom": float(y_max),
+                    }
+                    for x_min, y_min, x_max, y_max, text in WORD_RE.findall(page_match.group(1))
+                ]
+            return pages
+
+    pdfplumber = load_pdfplumber()
+    with pdfplumber.open(str(path)) as pdf:
+        indexes = wanted if wanted is not None else list(range(len(pdf.pages)))
+        return {
+            page_index: pdf.pages[page_index].extract_words(use_text_flow=True, keep_blank_chars=False)
+            for page_index in indexes
+            if page_index < len(pdf.pages)
+        }
+
+
+def diff_corpus_parse(reference: dict[str, Any], candidate: dict[str, Any]) -> dict[str, Any]:
+    fields = ["state_abbrev", "county_name", "source_dots", "profile3_values", "profile4_values", "selected_report_source"]
+    ref_rows = {row["dot_code"]: (row["sample_ts_percent"], row["sample_va_percent"]) for row in reference["report_rows"]}
+    cand_rows = {row["dot_code"]: (row["sample_ts_percent"], row["sample_va_percent"]) for row in candidate["report_rows"]}
+    return {
+        "field_mismatches": [field for field in fields if reference.get(field) != candidate.get(field)],
+        "rows_missing": sorted(set(ref_rows) - set(cand_rows)),
+        "rows_extra": sorted(set(cand_rows) - set(ref_rows)),
+        "rows_changed": sorted(dot for dot in set(ref_rows) & set(cand_rows) if ref_rows[dot] != cand_rows[dot]),
+    }
+
+
+def diff_word_rows(reference: list[dict[str, Any]], candidate: list[dict[str, Any]]) -> dict[str, Any]:
+    ref_rows = {row["dot_code"]: row for row in reference}
+    cand_rows = {row["dot_code"]: row for row in candidate}
+    return {
+        "rows_missing": sorted(set(ref_rows) - set(cand_rows)),
+        "rows_extra": sorted(set(cand_rows) - set(ref_rows)),
+        "rows_changed": sorted(dot for dot in set(ref_rows) & set(cand_rows) if ref_rows[dot] != cand_rows[dot]),
+    }
+
+
+def diff_is_clean(diff: dict[str, Any]) -> bool:
+    return not any(diff.get(key) for key in ("field_mismatches", "rows_missing", "rows_extra", "rows_changed"))
+
+
+def timed(func: Any, *args: Any, **kwargs: Any) -> tuple[Any, float, str | None]:
+    started = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        error = None
+    except Exception as exc:
+        result = None
+        error = str(exc) or exc.__class__.__name__
+    return result, time.perf_counter() - started, error
+
+
+def build_markdown(report: dict[str, Any]) -> str:
+    lines: list[str] = []
+    lines.append("# MTSP PDF Backend Benchmark")
+    lines.append("")
+    lines.append(f"- Generated: {report['generated_at_utc']}")
+    lines.append(f"- PDF directory: {report['pdf_dir']}")
+    lines.append(f"- Files: {report['files_scanned']}")
+    lines.append(f"- Reference backend: {report['reference_backend']}")
+    lines.append("")
+    lines.append("| Backend | Corpus parse s | Word-row parse s | Errors | Corpus files matching | Word-row files matching |")
+    lines.append("|---|---:|---:|---:|---:|---:|")
+    for backend, stats in report["backends"].items():
+        lines.append(
+            f"| {backend} | {stats['corpus_parse_seconds']:.2f} | {stats['word_rows_seconds']:.2f} | {stats['errors']} | "
+            f"{stats['corpus_files_matching']} | {stats['word_rows_files_matching']} |"
+        )
+    lines.append("")
+    lines.append("## Files with errors")
+    lines.append("")
+    failed = [row for row in report["files"] if row["errors"]]
+    if failed:
+        for row in failed:
+            for backend, error in row["errors"].items():
+                lines.append(f"- {row['file']} [{backend}]: {error}")
+    else:
+        lines.append("- None")
+    lines.append("")
+    lines.append("## Files with differences")
+    lines.append("")
+    differing = [row for row in report["files"] if row["differences"]]
+    if differing:
+        for row in differing:
+            for backend, diff in row["differences"].items():
+                lines.append(f"- {row['file']} [{backend}]: {json.dumps(diff, sort_keys=True)}")
+    else:
+        lines.append("- None")
+    lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> int:
+    from retest_mtsp_corpus import parse_pdf
+    from validate_legacy_sync import parse_pdf_rows
+
+    parser = argparse.ArgumentParser(description="Benchmark MTSP PDF extraction backends against pdfplumber.")
+    parser.add_argument("--pdf-dir", required=True, help="Directory containing MTSP PDFs")
+    parser.add_argument("--glob", default="*.pdf", help="Glob pattern under --pdf-dir")
+    parser.add_argument("--max-files", type=int, default=0, help="Optional file cap for dry runs")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS), help="Backends to benchmark")
+    parser.add_argument("--out-dir", default="output/analysis", help="Directory for output JSON/markdown")
+    args = parser.parse_args()
+
+    pdf_dir = Path(args.pdf_dir).expanduser().resolve()
+    if not pdf_dir.exists():
+        raise RuntimeError(f"PDF directory not found: {pdf_dir}")
+    pdf_paths = sorted(path for path in pdf_dir.glob(args.glob) if path.is_file())
+    if args.max_files > 0:
+        pdf_paths = pdf_paths[: args.max_files]
+    if not pdf_paths:
+        raise RuntimeError(f"No files matched {args.glob!r} in {pdf_dir}")
+
+    backends = [REFERENCE_BACKEND] + [backend for backend in args.backends if backend != REFERENCE_BACKEND]
+    for backend in backends:
+        resolve_backend(backend)
+
+    stats = {
+        backend: {
+            "corpus_parse_seconds": 0.0,
+            "word_rows_seconds": 0.0,
+            "errors": 0,
+            "corpus_files_matching": 0,
+            "word_rows_files_matching": 0,
+        }
+        for backend in backends
+    }
+    file_rows: list[dict[str, Any]] = []
+    for pdf_path in pdf_paths:
+        results: dict[str, tuple[Any, Any]] = {}
+        file_row: dict[str, Any] = {"file": str(pdf_path), "errors": {}, "differences": {}}
+        for backend in backends:
+            corpus, corpus_seconds, corpus_error = timed(parse_pdf, pdf_path, backend=backend, strict=True)
+            word_rows, word_seconds, word_error = timed(parse_pdf_rows, pdf_path, backend=backend, strict=True)
+            stats[backend]["corpus_parse_seconds"] += corpus_seconds
+            stats[backend]["word_rows_seconds"] += word_seconds
+            if corpus_error or word_error:
+                stats[backend]["errors"] += 1
+                file_row["errors"][backend] = corpus_error or word_error
+            results[backend] = (corpus, word_rows)
+
+        reference_corpus, reference_rows = results[REFERENCE_BACKEND]
+        for backend in backends:
+            if backend in file_row["errors"]:
+                # An error row never counts as a match, even for the half that did parse.
+                continue
+            corpus, word_rows = results[backend]
+            diff: dict[str, Any] = {}
+            if reference_corpus is not None and corpus is not None:
+                corpus_diff = diff_corpus_parse(reference_corpus, corpus)
+                if diff_is_clean(corpus_diff):
+                    stats[backend]["corpus_files_matching"] += 1
+                else:
+                    diff["corpus"] = corpus_diff
+            if reference_rows is not None and word_rows is not None:
+                rows_diff = diff_word_rows(reference_rows, word_rows)
+                if diff_is_clean(rows_diff):
+                    stats[backend]["word_rows_files_matching"] += 1
+                else:
+                    diff["word_rows"] = rows_diff
+            if diff:
+                file_row["differences"][backend] = diff
+        file_rows.append(file_row)
+
+    report = {
+        "generated_at_utc": now_iso(),
+        "pdf_dir": str(pdf_dir),
+        "files_scanned": len(pdf_paths),
+        "reference_backend": REFERENCE_BACKEND,
+        "backends": stats,
+        "files": file_rows,
+    }
+
+    out_dir = Path(args.out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = now_id()
+    json_path = out_dir / f"mtsp_pdf_backend_benchmark_{stamp}.json"
+    md_path = out_dir / f"mtsp_pdf_backend_benchmark_{stamp}.md"
+    json_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    md_path.write_text(build_markdown(report), encoding="utf-8")
+
+    print(f"Wrote: {json_path}")
+    print(f"Wrote: {md_path}")
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        raise SystemExit(1)
@@ -0,0 +1,93 @@
+"""
+Shared word-level table parsing for MTSP PDF report pages.
+
+Report 8/10 rows are recovered from pdfplumber word boxes: every DOT word
+anchors a row, and the words sharing its baseline (within a small `top`
+tolerance) supply the title, TS% and VA% columns.
+
+Words are sorted by `top` once and swept with two pointers, so each page
+costs O(words log words) instead of rescanning the page for every DOT.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable
+
+DOT_PATTERN = re.compile(r"\d{3}\.\d{3}-\d{3}")
+PCT_PATTERN = re.compile(r"\d{1,3}%")
+ROW_TOP_TOLERANCE = 1.3
+
+
+def normalize_dot(dot_with_formatting: str) -> str:
+    return dot_with_formatting.replace(".", "").replace("-", "")
+
+
+def bucket_words_by_dot_row(
+    words: list[dict[str, Any]],
+    tolerance: float = ROW_TOP_TOLERANCE,
+) -> list[tuple[int, list[int]]]:
+    """
+    Return (dot_word_index, row_word_indexes) for every DOT word on the page.
+
+    A row holds every word whose `top` is within `tolerance` of the DOT word,
+    matching the original per-DOT scan. Rows are returned in the DOT words'
+    original page order; row word indexes are in ascending `top` order.
+    """
+    ordered = sorted(range(len(words)), key=lambda index: words[index]["top"])
+    tops = [words[index]["top"] for index in ordered]
+    total = len(ordered)
+
+    buckets: list[tuple[int, list[int]]] = []
+    low = 0
+    high = 0
+    for position in range(total):
+        anchor = ordered[position]
+        if not DOT_PATTERN.fullmatch(words[anchor]["text"]):
+            continue
+        anchor_top = tops[position]
+        while low < total and tops[low] < anchor_top and abs(tops[low] - anchor_top) > tolerance:
+            low += 1
+        while high < total and (tops[high] <= anchor_top or abs(tops[high] - anchor_top) <= tolerance):
+            high += 1
+        buckets.append((anchor, ordered[low:high]))
+
+    buckets.sort(key=lambda bucket: bucket[0])
+    return buckets
+
+
+def extract_dot_rows(
+    words: list[dict[str, Any]],
+    title_max_x0: float,
+    title_stopwords: Iterable[str],
+    tolerance: float = ROW_TOP_TOLERANCE,
+) -> list[dict[str, Any]]:
+    stopwords = set(title_stopwords)
+    parsed: list[dict[str, Any]] = []
+    for anchor, members in bucket_words_by_dot_row(words, tolerance):
+        dot_word = words[anchor]
+        pcts = sorted(
+            (index for index in members if PCT_PATTERN.fullmatch(words[index]["text"])),
+            key=lambda index: (words[index]["x0"], index),
+        )
+        if len(pcts) < 2:
+            continue
+        title_indexes = sorted(
+            (
+                index
+                for index in members
+                if words[index]["x0"] > dot_word["x1"] + 3
+                and words[index]["x0"] < title_max_x0
+                and words[index]["text"] not in stopwords
+            ),
+            key=lambda index: (words[index]["x0"], index),
+        )
+        parsed.append(
+            {
+                "dot_code": normalize_dot(dot_word["text"]),
+                "title": " ".join(words[index]["text"] for index in title_indexes),
+                "sample_ts_percent": int(words[pcts[0]]["text"][:-1]),
+                "sample_va_percent": int(words[pcts[1]]["text"][:-1]),
+            }
+        )
+    return parsed
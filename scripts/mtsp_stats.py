@@ -0,0 +1,303 @@
+"""
+Shared NumPy error statistics for MTSP/legacy-sync parity reports.
+
+Point estimates:
+- mae / rmse / std_error over per-row error arrays
+- bias (mean signed API - sample delta)
+- spearman (average ranks for ties) and kendall_tau_b (O(n log n))
+- ts_band_agreement (same TS level 1-5 on both sides)
+
+`bootstrap_error_ci` resamples matched rows with replacement and returns
+percentile confidence intervals for MAE, RMSE, bias, band agreement and
+Spearman. Replicates are split into a fixed number of chunks, each with its
+own child seed, and the chunks are mapped over worker processes, so results
+depend only on the seed and never on the worker count.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Sequence
+
+try:
+    import numpy as np
+except Exception as exc:  # pragma: no cover
+    raise SystemExit("Missing dependency: numpy. Install with `python3 -m pip install --user numpy`.") from exc
+
+TS_LEVEL_FLOORS = (80.0, 60.0, 40.0, 20.0)
+TS_LEVEL_CEILINGS = (97.0, 79.9, 59.9, 39.9)
+BOOTSTRAP_METRICS = ("ts_mae", "va_mae", "ts_rmse", "va_rmse", "ts_bias", "va_bias", "ts_band_agreement", "spearman")
+# Fixed chunk split, so intervals depend on the seed alone; workers only schedule the chunks.
+BOOTSTRAP_CHUNKS = 64
+
+
+def as_array(values: Sequence[float] | np.ndarray) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def mae(values: Sequence[float] | np.ndarray) -> float:
+    array = as_array(values)
+    return float(np.abs(array).mean()) if array.size else float("nan")
+
+
+def rmse(values: Sequence[float] | np.ndarray) -> float:
+    array = as_array(values)
+    return float(math.sqrt(float(np.square(array).mean()))) if array.size else float("nan")
+
+
+def bias(predicted: Sequence[float] | np.ndarray, reference: Sequence[float] | np.ndarray) -> float:
+    delta = as_array(predicted) - as_array(reference)
+    return float(delta.mean()) if delta.size else float("nan")
+
+
+def std_error(values: Sequence[float] | np.ndarray) -> float:
+    array = as_array(values)
+    if array.size <= 1:
+        return 0.0
+    return float(array.std(ddof=1) / math.sqrt(array.size))
+
+
+def average_ranks(values: Sequence[float] | np.ndarray) -> np.ndarray:
+    array = as_array(values)
+    size = array.size
+    sorter = np.argsort(array, kind="mergesort")
+    inverse = np.empty(size, dtype=np.intp)
+    inverse[sorter] = np.arange(size)
+    ordered = array[sorter]
+    starts = np.concatenate(([True], ordered[1:] != ordered[:-1]))
+    dense = np.cumsum(starts)[inverse]
+    bounds = np.concatenate((np.nonzero(starts)[0], [size]))
+    return 0.5 * (bounds[dense] + bounds[dense - 1] + 1)
+
+
+def pearson(xs: np.ndarray, ys: np.ndarray) -> float:
+    dx = xs - xs.mean()
+    dy = ys - ys.mean()
+    denom = math.sqrt(float(np.dot(dx, dx)) * float(np.dot(dy, dy)))
+    if denom == 0:
+        return float("nan")
+    return float(np.dot(dx, dy) / denom)
+
+
+def spearman(xs: Sequence[float] | np.ndarray, ys: Sequence[float] | np.ndarray) -> float:
+    x_array = as_array(xs)
+    y_array = as_array(ys)
+    if x_array.size <= 1 or x_array.size != y_array.size:
+        return float("nan")
+    return pearson(average_ranks(x_array), average_ranks(y_array))
+
+
+def tied_pairs(sorted_values: np.ndarray) -> int:
+    if sorted_values.size == 0:
+        return 0
+    starts = np.concatenate(([True], sorted_values[1:] != sorted_values[:-1]))
+    counts = np.diff(np.concatenate((np.nonzero(starts)[0], [sorted_values.size]))).astype(np.int64)
+    return int((counts * (counts - 1) // 2).sum())
+
+
+def count_inversions(values: np.ndarray) -> int:
+    """Pairs i < j with values[i] > values[j], via a Fenwick tree over dense ranks."""
+    _, dense = np.unique(values, return_inverse=True)
+    size = int(dense.max()) + 1 if dense.size else 0
+    tree = [0] * (size + 1)
+    inversions = 0
+    seen = 0
+    for rank in dense.tolist():
+        position = rank + 1
+        not_greater = 0
+        while position > 0:
+            not_greater += tree[position]
+            position -= position & -position
+        inversions += seen - not_greater
+        position = rank + 1
+        while position <= size:
+            tree[position] += 1
+            position += position & -position
+        seen += 1
+    return inversions
+
+
+def kendall_tau_b(xs: Sequence[float] | np.ndarray, ys: Sequence[float] | np.ndarray) -> float:
+    x_array = as_array(xs)
+    y_array = as_array(ys)
+    size = x_array.size
+    if size <= 1 or size != y_array.size:
+        return float("nan")
+
+    order = np.lexsort((y_array, x_array))
+    x_sorted = x_array[order]
+    y_sorted = y_array[order]
+    total_pairs = size * (size - 1) // 2
+    x_ties = tied_pairs(x_sorted)
+    y_ties = tied_pairs(np.sort(y_array, kind="mergesort"))
+    joint_starts = np.concatenate(([True], (x_sorted[1:] != x_sorted[:-1]) | (y_sorted[1:] != y_sorted[:-1])))
+    joint_counts = np.diff(np.concatenate((np.nonzero(joint_starts)[0], [size]))).astype(np.int64)
+    joint_ties = int((joint_counts * (joint_counts - 1) // 2).sum())
+    discordant = count_inversions(y_sorted)
+
+    denom = math.sqrt(float(total_pairs - x_ties) * float(total_pairs - y_ties))
+    if denom == 0:
+        return float("nan")
+    score = total_pairs - x_ties - y_ties + joint_ties - 2 * discordant
+    return float(score / denom)
+
+
+def ts_band(values: Sequence[float] | np.ndarray) -> np.ndarray:
+    """Vectorized TS level (1-5) using the legacy 80/60/40/20 band table."""
+    clamped = np.clip(as_array(values), 0.0, 97.0)
+    conditions = [
+        (clamped >= floor) & (clamped <= ceiling) for floor, ceiling in zip(TS_LEVEL_FLOORS, TS_LEVEL_CEILINGS)
+    ]
+    return np.select(conditions, [5, 4, 3, 2], default=1)
+
+
+def ts_band_agreement(sample_ts: Sequence[float] | np.ndarray, api_ts: Sequence[float] | np.ndarray) -> float:
+    sample_band = ts_band(sample_ts)
+    if sample_band.size == 0:
+        return float("nan")
+    return float((sample_band == ts_band(api_ts)).mean())
+
+
+def error_summary(
+    sample_ts: Sequence[float] | np.ndarray,
+    api_ts: Sequence[float] | np.ndarray,
+    sample_va: Sequence[float] | np.ndarray,
+    api_va: Sequence[float] | np.ndarray,
+) -> dict[str, float]:
+    sample_ts_array = as_array(sample_ts)
+    api_ts_array = as_array(api_ts)
+    sample_va_array = as_array(sample_va)
+    api_va_array = as_array(api_va)
+    ts_delta = api_ts_array - sample_ts_array
+    va_delta = api_va_array - sample_va_array
+    return {
+        "ts_mae": mae(ts_delta),
+        "va_mae": mae(va_delta),
+        "ts_rmse": rmse(ts_delta),
+        "va_rmse": rmse(va_delta),
+        "ts_bias": bias(api_ts_array, sample_ts_array),
+        "va_bias": bias(api_va_array, sample_va_array),
+        "ts_spearman": spearman(sample_ts_array, api_ts_array),
+        "ts_kendall_tau_b": kendall_tau_b(sample_ts_array, api_ts_array),
+        "ts_band_agreement": ts_band_agreement(sample_ts_array, api_ts_array),
+    }
+
+
+def tie_groups(values: np.ndarray) -> np.ndarray:
+    """Dense tie-group id per element, ascending by value."""
+    _, groups = np.unique(values, return_inverse=True)
+    return groups.reshape(-1)
+
+
+def weighted_spearman(weights: np.ndarray, x_groups: np.ndarray, y_groups: np.ndarray) -> float:
+    """
+    Spearman of a bootstrap resample described by per-row draw counts.
+
+    Average ranks are rebuilt from tie-group weights, so no per-replicate sort
+    is needed.
+    """
+
+    def ranks(groups: np.ndarray) -> np.ndarray:
+        group_weight = np.bincount(groups, weights=weights)
+        below = np.cumsum(group_weight) - group_weight
+        return (below + (group_weight + 1.0) / 2.0)[groups]
+
+    total = float(weights.sum())
+    rx = ranks(x_groups)
+    ry = ranks(y_groups)
+    dx = rx - float(np.dot(weights, rx)) / total
+    dy = ry - float(np.dot(weights, ry)) / total
+    denom = math.sqrt(float(np.dot(weights, dx * dx)) * float(np.dot(weights, dy * dy)))
+    if denom == 0:
+        return float("nan")
+    return float(np.dot(weights, dx * dy) / denom)
+
+
+def bootstrap_worker(columns: dict[str, np.ndarray], replicates: int, seed: np.random.SeedSequence) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    size = columns["ts_abs"].size
+    ts_sq = np.square(columns["ts_abs"])
+    va_sq = np.square(columns["va_abs"])
+    out = np.empty((replicates, len(BOOTSTRAP_METRICS)), dtype=np.float64)
+    for index in range(replicates):
+        weights = np.bincount(rng.integers(0, size, size=size), minlength=size).astype(np.float64)
+        out[index, 0] = np.dot(weights, columns["ts_abs"]) / size
+        out[index, 1] = np.dot(weights, columns["va_abs"]) / size
+        out[index, 2] = math.sqrt(np.dot(weights, ts_sq) / size)
+        out[index, 3] = math.sqrt(np.dot(weights, va_sq) / size)
+        out[index, 4] = np.dot(weights, columns["ts_signed"]) / size
+        out[index, 5] = np.dot(weights, columns["va_signed"]) / size
+        out[index, 6] = np.dot(weights, columns["band_match"]) / size
+        out[index, 7] = weighted_spearman(weights, columns["sample_ts_groups"], columns["api_ts_groups"])
+    return out
+
+
+def bootstrap_error_ci(
+    sample_ts: Sequence[float] | np.ndarray,
+    api_ts: Sequence[float] | np.ndarray,
+    sample_va: Sequence[float] | np.ndarray,
+    api_va: Sequence[float] | np.ndarray,
+    replicates: int = 2000,
+    confidence: float = 0.95,
+    workers: int | None = None,
+    seed: int = 20260217,
+    ts_abs_errors: Sequence[float] | np.ndarray | None = None,
+    va_abs_errors: Sequence[float] | np.ndarray | None = None,
+) -> dict[str, Any]:
+    """
+    Percentile bootstrap CIs over matched rows.
+
+    `ts_abs_errors` / `va_abs_errors` override the plain |api - sample| errors
+    for MAE/RMSE (e.g. the adaptive per-file modes in the corpus retest).
+    """
+    sample_ts_array = as_array(sample_ts)
+    api_ts_array = as_array(api_ts)
+    sample_va_array = as_array(sample_va)
+    api_va_array = as_array(api_va)
+    size = sample_ts_array.size
+    if size == 0 or replicates <= 0:
+        return {"replicates": 0, "confidence": confidence, "seed": seed, "workers": 0, "intervals": {}}
+
+    columns = {
+        "sample_ts_groups": tie_groups(sample_ts_array),
+        "api_ts_groups": tie_groups(api_ts_array),
+        "ts_signed": api_ts_array - sample_ts_array,
+        "va_signed": api_va_array - sample_va_array,
+        "ts_abs": as_array(ts_abs_errors) if ts_abs_errors is not None else np.abs(api_ts_array - sample_ts_array),
+        "va_abs": as_array(va_abs_errors) if va_abs_errors is not None else np.abs(api_va_array - sample_va_array),
+        "band_match": (ts_band(sample_ts_array) == ts_band(api_ts_array)).astype(np.float64),
+    }
+
+    chunk_count = min(BOOTSTRAP_CHUNKS, replicates)
+    shares = [replicates // chunk_count + (1 if index < replicates % chunk_count else 0) for index in range(chunk_count)]
+    seeds = np.random.SeedSequence(seed).spawn(chunk_count)
+    worker_count = max(1, min(workers or os.cpu_count() or 1, chunk_count))
+    if worker_count == 1:
+        draws = np.vstack([bootstrap_worker(columns, share, child) for share, child in zip(shares, seeds)])
+    else:
+        with ProcessPoolExecutor(max_workers=worker_count) as pool:
+            draws = np.vstack(list(pool.map(bootstrap_worker, [columns] * chunk_count, shares, seeds)))
+
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    intervals: dict[str, dict[str, float]] = {}
+    for column_index, name in enumerate(BOOTSTRAP_METRICS):
+        values = draws[:, column_index]
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            intervals[name] = {"low": float("nan"), "high": float("nan"), "std_error": float("nan")}
+            continue
+        low, high = np.percentile(values, [tail, 100.0 - tail])
+        intervals[name] = {
+            "low": float(low),
+            "high": float(high),
+            "std_error": float(values.std(ddof=1)) if values.size > 1 else 0.0,
+        }
+    return {
+        "replicates": int(replicates),
+        "confidence": confidence,
+        "seed": seed,
+        "workers": worker_count,
+        "intervals": intervals,
+    }
@@ -3,7 +3,10 @@
 Build a canonical Access parity registry across multiple front-ends plus required source DB catalogs.
 
 Outputs:
-- output/analysis/parity/access_registry_<timestamp>.json
+- output/analysis/parity/access_registry_<timestamp>.json (skipped with --no-json)
+- output/analysis/parity/access_registry_<timestamp>.sqlite (indexed form; see access_registry_db.py)
+- output/analysis/parity/access_registry_changes_<timestamp>.json/.md (with --incremental)
+- output/analysis/parity/latest_access_registry.json and .sqlite (always refreshed)
 """
 
 from __future__ import annotations
@@ -17,10 +20,17 @@ import shutil
 import subprocess
 import sys
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from access_file_index import DEFAULT_SEARCH_DEPTH, FileIndex, default_search_roots
+from access_query_sql import render_all
+from access_registry_db import load_registry, write_registry_db
+from access_table_cache import DEFAULT_CACHE_ROOT
+from mdb_broker import MSYSOBJECTS_COLUMNS, MSYSQUERIES_COLUMNS, access_reader, configure_table_cache
+
 try:
     csv.field_size_limit(sys.maxsize)
 except OverflowError:
@@ -57,6 +67,63 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Fail when same canonical query name has different SQL text across front-ends.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent mdb-queries processes for query SQL extraction (default: 8; 1 = serial)",
+    )
+    parser.add_argument(
+        "--query-sql-source",
+        choices=("msysqueries", "mdb-queries"),
+        default="msysqueries",
+        help=(
+            "msysqueries = rebuild mdb-queries text from the MSysQueries rows already read "
+            "(mdb-queries only for queries it cannot rebuild); mdb-queries = one process per query"
+        ),
+    )
+    parser.add_argument(
+        "--verify-query-sql",
+        action="store_true",
+        help="Also run mdb-queries for every query, keep its text on any hash mismatch and report the mismatches",
+    )
+    parser.add_argument(
+        "--search-roots",
+        nargs="*",
+        help="Directories searched for Access files not found at the given path (default: cwd, its parent, ~/Downloads and their MVQS folders)",
+    )
+    parser.add_argument(
+        "--search-depth",
+        type=int,
+        default=DEFAULT_SEARCH_DEPTH,
+        help=f"Subdirectory levels indexed below each search root (default: {DEFAULT_SEARCH_DEPTH})",
+    )
+    parser.add_argument(
+        "--access-cache-dir",
+        default=DEFAULT_CACHE_ROOT,
+        help=f"Cache of parsed Access table reads keyed by file SHA-256 (default: {DEFAULT_CACHE_ROOT})",
+    )
+    parser.add_argument("--no-access-cache", action="store_true", help="Always read Access tables with mdbtools")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Carry query SQL forward from the previous registry for queries whose MSysObjects Id/DateUpdate "
+            "and rebuilt SQL hash are unchanged, and write an access_registry_changes_<id> summary"
+        ),
+    )
+    parser.add_argument(
+        "--previous-registry",
+        help="Registry (.sqlite or .json) to compare against (default: latest_access_registry.* in --out-dir)",
+    )
+    parser.add_argument(
+        "--no-json",
+        action="store_true",
+        help=(
+            "Skip the timestamped access_registry_<id>.json (export it later with access_registry_db.py); "
+            "latest_access_registry.json is still refreshed for the JSON consumers"
+        ),
+    )
     return parser.parse_args()
 
 
@@ -91,18 +158,14 @@ def sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
 
 
-def load_csv_rows_from_export(db_path: Path, table_name: str) -> list[dict[str, str]]:
-    _, output, _ = run_command(["mdb-export", str(db_path), table_name])
-    return list(csv.DictReader(output.splitlines()))
+def load_csv_rows_from_export(
+    db_path: Path, table_name: str, columns: tuple[str, ...] | None = None
+) -> list[dict[str, str]]:
+    return access_reader().read_table(db_path, table_name, columns)
 
 
 def list_tables(db_path: Path, include_system: bool = True) -> list[str]:
-    cmd = ["mdb-tables"]
-    if include_system:
-        cmd.append("-S")
-    cmd.extend(["-1", str(db_path)])
-    _, output, _ = run_command(cmd)
-    return sorted([line.strip() for line in output.splitlines() if line.strip()])
+    return access_reader().list_tables(db_path, include_system=include_system)
 
 
 def extract_query_sql(front_end_path: Path, query_name: str) -> tuple[str | None, str | None]:
@@ -114,6 +177,273 @@ def extract_query_sql(front_end_path: Path, query_name: str) -> tuple[str | None
     return text, None
 
 
+def extract_all_query_sql(
+    front_end_ctx: list[FrontEndContext],
+    query_names: list[str],
+    workers: int,
+    carried: dict[tuple[str, str], tuple[str | None, str | None]] | None = None,
+) -> dict[tuple[str, str], tuple[str | None, str | None]]:
+    """
+    Run `extract_query_sql` for every (query, front-end) pair on a bounded
+    pool of mdb-queries processes. Results are keyed by (query, source_key),
+    so callers assemble them in the same order as the serial loop. Pairs in
+    `carried` (incremental mode) are taken as-is.
+    """
+    carried = carried or {}
+    jobs = [
+        (query_name, ctx)
+        for query_name in query_names
+        for ctx in front_end_ctx
+        if (query_name, ctx.key) not in carried
+    ]
+    return {**carried, **run_query_sql_jobs(jobs, workers)}
+
+
+def run_query_sql_jobs(
+    jobs: list[tuple[str, FrontEndContext]], workers: int
+) -> dict[tuple[str, str], tuple[str | None, str | None]]:
+    if workers <= 1:
+        return {(query_name, ctx.key): extract_query_sql(ctx.path, query_name) for query_name, ctx in jobs}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            (query_name, ctx.key): pool.submit(extract_query_sql, ctx.path, query_name) for query_name, ctx in jobs
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+
+def rebuild_all_query_sql(
+    front_end_ctx: list[FrontEndContext],
+    query_names: list[str],
+    workers: int,
+    verify: bool,
+    carried: dict[tuple[str, str], tuple[str | None, str | None]] | None = None,
+) -> tuple[dict[tuple[str, str], tuple[str | None, str | None]], dict]:
+    """
+    Rebuild mdb-queries text from each front-end's MSysQueries rows (already
+    in memory), falling back to mdb-queries for queries without rows unless
+    the pair was carried forward from the previous registry. With `verify`,
+    every rebuilt pair is also run through mdb-queries; a hash mismatch
+    keeps the mdb-queries text and is listed in the returned summary.
+    """
+    carried = carried or {}
+    carried_keys: set[tuple[str, str]] = set()
+    results: dict[tuple[str, str], tuple[str | None, str | None]] = {}
+    fallback_jobs: list[tuple[str, FrontEndContext]] = []
+    for ctx in front_end_ctx:
+        rendered = render_all(ctx.msysobjects_rows, ctx.msysqueries_rows)
+        for query_name in query_names:
+            sql, _ = rendered.get(query_name, (None, None))
+            if sql is not None:
+                results[(query_name, ctx.key)] = (sql, None)
+            elif (query_name, ctx.key) in carried:
+                results[(query_name, ctx.key)] = carried[(query_name, ctx.key)]
+                carried_keys.add((query_name, ctx.key))
+            else:
+                fallback_jobs.append((query_name, ctx))
+    results.update(run_query_sql_jobs(fallback_jobs, workers))
+
+    summary = {
+        "source": "msysqueries",
+        "rebuilt": len(results) - len(fallback_jobs) - len(carried_keys),
+        "mdb_queries_fallback": len(fallback_jobs),
+        "carried_forward": len(carried_keys),
+        "verified": False,
+        "verify_mismatch_count": 0,
+        "verify_mismatches": [],
+    }
+    if verify:
+        skip_keys = carried_keys | {(query_name, ctx.key) for query_name, ctx in fallback_jobs}
+        verify_jobs = [
+            (query_name, ctx)
+            for query_name in query_names
+            for ctx in front_end_ctx
+            if (query_name, ctx.key) not in skip_keys
+        ]
+        reference = run_query_sql_jobs(verify_jobs, workers)
+        for key in sorted(reference):
+            expected = reference[key]
+            rebuilt_sql, _ = results[key]
+            if expected[0] is not None and sha256_text(expected[0]) == sha256_text(rebuilt_sql or ""):
+                continue
+            summary["verify_mismatches"].append(
+                {
+                    "query": key[0],
+                    "source_key": key[1],
+                    "rebuilt_sha256": sha256_text(rebuilt_sql or ""),
+                    "mdb_queries_sha256": sha256_text(expected[0]) if expected[0] is not None else None,
+                    "mdb_queries_error": expected[1],
+                }
+            )
+            results[key] = expected
+        summary["verified"] = True
+        summary["verify_mismatch_count"] = len(summary["verify_mismatches"])
+    return results, summary
+
+
+def load_previous_registry(args: argparse.Namespace, out_dir: Path) -> tuple[dict | None, Path | None]:
+    if args.previous_registry:
+        candidates = [Path(args.previous_registry).expanduser().resolve()]
+        if not candidates[0].exists():
+            raise RuntimeError(f"Previous registry not found: {candidates[0]}")
+    else:
+        candidates = [out_dir / "latest_access_registry.sqlite", out_dir / "latest_access_registry.json"]
+    for path in candidates:
+        if not path.exists():
+            continue
+        if path.suffix == ".sqlite":
+            return load_registry(path, ("objects", "provenance", "query_names", "query_sql", "edges")), path
+        return json.loads(path.read_text(encoding="utf-8")), path
+    return None, None
+
+
+def object_signature(entry: dict) -> list[tuple]:
+    return sorted(
+        (source.get("source_key"), source.get("object_id"), source.get("date_update"))
+        for source in entry.get("present_in_sources") or []
+    )
+
+
+def carry_forward_query_sql(
+    previous: dict, front_end_ctx: list[FrontEndContext], query_names: list[str]
+) -> dict[tuple[str, str], tuple[str | None, str | None]]:
+    """
+    (query, source_key) pairs whose previous SQL can be reused: same
+    MSysObjects Id and DateUpdate as last time and, where the SQL can be
+    rebuilt from MSysQueries, the same SQL hash. Previous extraction errors
+    carry forward under the same rule.
+    """
+    previous_ids: dict[tuple[str, str], tuple[str | None, str | None]] = {}
+    for entry in (previous.get("objects") or {}).get("queries", []):
+        for source in entry.get("present_in_sources") or []:
+            previous_ids[(entry["name"], source.get("source_key"))] = (source.get("object_id"), source.get("date_update"))
+    previous_sql: dict[tuple[str, str], tuple[str | None, str | None]] = {}
+    previous_errors: dict[tuple[str, str], str] = {}
+    for name, entry in ((previous.get("queries") or {}).get("sql_by_name") or {}).items():
+        for row in entry.get("sources") or []:
+            previous_sql[(name, row.get("source_key"))] = (row.get("sql"), row.get("sql_sha256"))
+        for row in entry.get("extract_errors") or []:
+            previous_errors[(name, row.get("source_key"))] = row.get("error")
+
+    carried: dict[tuple[str, str], tuple[str | None, str | None]] = {}
+    for ctx in front_end_ctx:
+        current_ids = {
+            (row.get("Name") or "").strip(): ((row.get("Id") or "").strip() or None, row.get("DateUpdate") or None)
+            for row in ctx.msysobjects_rows
+            if row.get("Type") == QUERY_TYPE
+        }
+        rendered = render_all(ctx.msysobjects_rows, ctx.msysqueries_rows)
+        for query_name in query_names:
+            key = (query_name, ctx.key)
+            if current_ids.get(query_name) != previous_ids.get(key):
+                continue
+            rebuilt, _ = rendered.get(query_name, (None, None))
+            if key in previous_sql:
+                sql, sql_sha = previous_sql[key]
+                if rebuilt is None or sha256_text(rebuilt) == sql_sha:
+                    carried[key] = (sql, None)
+            elif key in previous_errors and rebuilt is None:
+                # Same object (or still absent from this front-end): the export failed last time too.
+                carried[key] = (None, previous_errors[key])
+    return carried
+
+
+def summarize_registry_changes(previous: dict, report: dict, previous_path: Path) -> dict:
+    """Added/removed/modified objects, changed query SQL and edge changes since `previous`."""
+    objects: dict[str, dict] = {}
+    counts: dict[str, int] = {}
+    for bucket in ("modules", "reports", "queries"):
+        before = {entry["name"]: entry for entry in (previous.get("objects") or {}).get(bucket, [])}
+        after = {entry["name"]: entry for entry in report["objects"][bucket]}
+        added = sorted(set(after) - set(before), key=str.lower)
+        removed = sorted(set(before) - set(after), key=str.lower)
+        modified = [
+            {
+                "name": name,
+                "previous": [list(item) for item in object_signature(before[name])],
+                "current": [list(item) for item in object_signature(after[name])],
+            }
+            for name in sorted(set(before) & set(after), key=str.lower)
+            if object_signature(before[name]) != object_signature(after[name])
+        ]
+        objects[bucket] = {"added": added, "removed": removed, "modified": modified}
+        counts[f"{bucket}_added"] = len(added)
+        counts[f"{bucket}_removed"] = len(removed)
+        counts[f"{bucket}_modified"] = len(modified)
+
+    before_sql = (previous.get("queries") or {}).get("sql_by_name") or {}
+    after_sql = report["queries"]["sql_by_name"]
+    sql_changed = [
+        {
+            "name": name,
+            "previous_variants": before_sql[name].get("sql_variant_sha256") or [],
+            "current_variants": after_sql[name].get("sql_variant_sha256") or [],
+        }
+        for name in sorted(set(before_sql) & set(after_sql), key=str.lower)
+        if (before_sql[name].get("sql_variant_sha256") or []) != (after_sql[name].get("sql_variant_sha256") or [])
+    ]
+    counts["query_sql_changed"] = len(sql_changed)
+
+    def edge_set(registry: dict) -> set[tuple[str, str]]:
+        return {
+            (row["source_query"], row["target_query"])
+            for row in (registry.get("dependencies") or {}).get("query_edges", [])
+        }
+
+    before_edges, after_edges = edge_set(previous), edge_set(report)
+    edge_key = lambda pair: (pair[0].lower(), pair[1].lower())  # noqa: E731
+    edges_added = [list(pair) for pair in sorted(after_edges - before_edges, key=edge_key)]
+    edges_removed = [list(pair) for pair in sorted(before_edges - after_edges, key=edge_key)]
+    counts["query_edges_added"] = len(edges_added)
+    counts["query_edges_removed"] = len(edges_removed)
+
+    return {
+        "generated_at_utc": now_iso(),
+        "snapshot_id": report["snapshot_id"],
+        "previous_snapshot_id": previous.get("snapshot_id"),
+        "previous_registry": str(previous_path),
+        "counts": counts,
+        "objects": objects,
+        "query_sql_changed": sql_changed,
+        "query_edges": {"added": edges_added, "removed": edges_removed},
+    }
+
+
+def render_changes_markdown(changes: dict) -> str:
+    lines = [
+        "# Access Registry Changes",
+        "",
+        f"- Snapshot: `{changes['snapshot_id']}`",
+        f"- Previous snapshot: `{changes['previous_snapshot_id']}`",
+        f"- Generated: `{changes['generated_at_utc']}`",
+        "",
+        "| Object type | Added | Removed | Modified |",
+        "|---|---:|---:|---:|",
+    ]
+    for bucket, entry in changes["objects"].items():
+        lines.append(f"| {bucket} | {len(entry['added'])} | {len(entry['removed'])} | {len(entry['modified'])} |")
+    lines.extend(
+        [
+            "",
+            f"- Queries with changed SQL: {changes['counts']['query_sql_changed']}",
+            f"- Query edges added/removed: {changes['counts']['query_edges_added']}/"
+            f"{changes['counts']['query_edges_removed']}",
+        ]
+    )
+    for bucket, entry in changes["objects"].items():
+        for label in ("added", "removed"):
+            if entry[label]:
+                lines.extend(["", f"## {bucket.capitalize()} {label}", ""])
+                lines.extend(f"- `{name}`" for name in entry[label])
+        if entry["modified"]:
+            lines.extend(["", f"## {bucket.capitalize()} modified", ""])
+            lines.extend(f"- `{row['name']}`" for row in entry["modified"])
+    if changes["query_sql_changed"]:
+        lines.extend(["", "## Query SQL changed", ""])
+        lines.extend(f"- `{row['name']}`" for row in changes["query_sql_changed"])
+    return "\n".join(lines) + "\n"
+
+
 def normalize_name(value: str | None) -> str:
     return (value or "").strip().lower()
 
@@ -224,37 +554,23 @@ def extract_linked_table_bindings(front_end_ctx: list[FrontEndContext]) -> list[
     return sorted(bindings, key=lambda item: (item["table_name"].lower(), item["source_key"]))
 
 
-def ensure_file(path_str: str) -> Path:
+def ensure_file(path_str: str, file_index: FileIndex) -> Path:
     raw = Path(path_str).expanduser()
     if raw.exists():
         return raw.resolve()
 
-    cwd = Path.cwd()
-    home = Path.home()
-    basename = raw.name
-
-    search_dirs = [
-        cwd,
-        cwd / "MVQS_Database 2",
-        cwd.parent,
-        cwd.parent / "MVQS_Database 2",
-        home / "Downloads",
-        home / "Downloads" / "MVQS",
-        home / "Downloads" / "MVQS_Database 2",
-        home / "Downloads" / "MVQS" / "MVQS_Database 2",
-    ]
-
-    for base in search_dirs:
-        for candidate in (base / path_str, base / basename):
-            if candidate.exists():
-                return candidate.resolve()
+    found = file_index.find(path_str)
+    if found is not None:
+        return found
 
     raise RuntimeError(f"Required path not found: {path_str}")
 
 
 def make_frontend_context(front_end_path: Path, source_key: str) -> FrontEndContext:
-    rows_objects = load_csv_rows_from_export(front_end_path, "MSysObjects")
-    rows_queries = load_csv_rows_from_export(front_end_path, "MSysQueries")
+    rows_objects, rows_queries = access_reader().read_tables(
+        front_end_path,
+        [("MSysObjects", MSYSOBJECTS_COLUMNS), ("MSysQueries", MSYSQUERIES_COLUMNS)],
+    )
     return FrontEndContext(
         key=source_key,
         path=front_end_path,
@@ -263,10 +579,12 @@ def make_frontend_context(front_end_path: Path, source_key: str) -> FrontEndCont
     )
 
 
-def build_registry(args: argparse.Namespace) -> tuple[dict, bool]:
-    front_end_paths = [ensure_file(p) for p in args.front_end_paths]
-    dc_data_path = ensure_file(args.dc_data_path)
-    dc_jobbank_path = ensure_file(args.dc_jobbank_path)
+def build_registry(args: argparse.Namespace, previous: dict | None = None) -> tuple[dict, bool]:
+    roots = [Path(root) for root in args.search_roots] if args.search_roots is not None else default_search_roots()
+    file_index = FileIndex(roots, depth=args.search_depth)
+    front_end_paths = [ensure_file(p, file_index) for p in args.front_end_paths]
+    dc_data_path = ensure_file(args.dc_data_path, file_index)
+    dc_jobbank_path = ensure_file(args.dc_jobbank_path, file_index)
 
     front_end_ctx: list[FrontEndContext] = []
     for idx, path in enumerate(front_end_paths, start=1):
@@ -281,6 +599,18 @@ def build_registry(args: argparse.Namespace) -> tuple[dict, bool]:
     hidden_query_names = sorted([name for name in query_names if name.startswith("~sq_")])
 
     # Query SQL extraction and normalization
+    carried = carry_forward_query_sql(previous, front_end_ctx, canonical_query_names) if previous else {}
+    if args.query_sql_source == "msysqueries":
+        extracted_sql, query_sql_extraction = rebuild_all_query_sql(
+            front_end_ctx, canonical_query_names, args.workers, args.verify_query_sql, carried
+        )
+    else:
+        extracted_sql = extract_all_query_sql(front_end_ctx, canonical_query_names, args.workers, carried)
+        query_sql_extraction = {
+            "source": "mdb-queries",
+            "mdb_queries_calls": len(extracted_sql) - len(carried),
+            "carried_forward": len(carried),
+        }
     query_sql_by_name: dict[str, dict] = {}
     query_sql_mismatch_count = 0
     for query_name in canonical_query_names:
@@ -289,7 +619,7 @@ def build_registry(args: argparse.Namespace) -> tuple[dict, bool]:
         variant_counter = Counter()
 
         for ctx in front_end_ctx:
-            sql, err = extract_query_sql(ctx.path, query_name)
+            sql, err = extracted_sql[(query_name, ctx.key)]
             if err:
                 errors.append({"source_key": ctx.key, "source_path": str(ctx.path), "error": err})
                 continue
@@ -447,6 +777,7 @@ def build_registry(args: argparse.Namespace) -> tuple[dict, bool]:
             "canonical_names": canonical_query_names,
             "hidden_names": hidden_query_names,
             "sql_by_name": query_sql_by_name,
+            "extraction": query_sql_extraction,
         },
         "dependencies": {
             "query_edges": edge_rows,
@@ -484,17 +815,29 @@ def main() -> int:
     args = parse_args()
     for tool in ("mdb-export", "mdb-queries", "mdb-tables"):
         require_tool(tool)
-
-    report, pass_ok = build_registry(args)
+    configure_table_cache(None if args.no_access_cache else Path(args.access_cache_dir))
 
     out_dir = Path(args.out_dir).expanduser().resolve()
+    previous, previous_path = load_previous_registry(args, out_dir) if args.incremental else (None, None)
+    if args.incremental and previous is None:
+        print("WARN: --incremental found no previous registry; building from scratch.", file=sys.stderr)
+
+    report, pass_ok = build_registry(args, previous)
+
     out_dir.mkdir(parents=True, exist_ok=True)
     stamp = report["snapshot_id"]
 
+    output_db = write_registry_db(report, out_dir / f"access_registry_{stamp}.sqlite")
+    latest_db = out_dir / "latest_access_registry.sqlite"
+    shutil.copyfile(output_db, latest_db)
     output_json = out_dir / f"access_registry_{stamp}.json"
-    output_json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
     latest_json = out_dir / "latest_access_registry.json"
-    latest_json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    # The npm parity scripts and the Windows execution harness read the JSON
+    # alias, so it is refreshed even with --no-json rather than left stale.
+    registry_text = json.dumps(report, indent=2) + "\n"
+    latest_json.write_text(registry_text, encoding="utf-8")
+    if not args.no_json:
+        output_json.write_text(registry_text, encoding="utf-8")
 
     summary = {
         "modules_total": report["stats"]["modules_total"],
@@ -504,11 +847,30 @@ def main() -> int:
         "dependency_edge_count": report["stats"]["dependency_edge_count"],
         "query_sql_mismatch_count": report["stats"]["query_sql_mismatch_count"],
         "inventory_coverage_pass": report["gate"]["inventory_coverage_pass"],
+        "query_sql_extraction": {
+            key: value
+            for key, value in report["queries"]["extraction"].items()
+            if key != "verify_mismatches"
+        },
     }
 
-    print(f"Wrote registry: {output_json}")
+    if previous is not None and previous_path is not None:
+        changes = summarize_registry_changes(previous, report, previous_path)
+        changes_json = out_dir / f"access_registry_changes_{stamp}.json"
+        changes_json.write_text(json.dumps(changes, indent=2) + "\n", encoding="utf-8")
+        changes_md = out_dir / f"access_registry_changes_{stamp}.md"
+        changes_md.write_text(render_changes_markdown(changes), encoding="utf-8")
+        summary["changes_since_previous"] = changes["counts"]
+        print(f"Wrote change summary: {changes_json}")
+
+    print(f"Wrote registry database: {output_db}")
+    print(f"Wrote latest database alias: {latest_db}")
+    if not args.no_json:
+        print(f"Wrote registry: {output_json}")
     print(f"Wrote latest alias: {latest_json}")
     print(json.dumps(summary, indent=2))
+    if access_reader().cache is not None:
+        print(f"Access table cache: {json.dumps(access_reader().cache.stats)}")
 
     if not pass_ok:
         return 2
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Build the transitive lineage of Access queries and reports from the parity registry.
+
+Direct dependencies come from three places:
+- registry query edges (MSysQueries references between saved queries,
+  including the hidden `~sq_` queries behind report and control sources),
+- table references scanned from each canonical query's SQL (the same scan
+  and cache parity_table_taps uses),
+- hidden query names: `~sq_r<Report>` / `~sq_c<Report>~sq_c<Control>` tie a
+  report to the hidden queries it owns.
+
+Every node gets one bit. Closures are computed once per strongly connected
+component (sinks first, so each component ORs in finished closures of the
+components it reads from), giving the full upstream set of every query and
+report and, from the reversed graph, the downstream impact set of every
+query and table.
+
+Usage:
+  python3 scripts/parity_lineage.py --registry-db output/analysis/parity/latest_access_registry.sqlite
+  python3 scripts/parity_lineage.py --registry-db ... --impact tblJob_Bank
+  python3 scripts/parity_lineage.py --registry-db ... --upstream rptCombine_02_Table_of_Contents
+
+Outputs:
+- output/analysis/parity/lineage_index_<timestamp>.json
+- output/analysis/parity/latest_lineage_index.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from access_registry_db import load_registry
+from access_sql_refs import DEFAULT_SQL_REFS_CACHE, SqlRefCache
+from parity_table_taps import query_sort_key, strongly_connected_components
+
+HIDDEN_OWNER_RE = re.compile(r"^~sq_[a-z](.+?)(?:~sq_|$)")
+KIND_ORDER = ("report", "query", "hidden_query", "table")
+NAMESPACE = {"query": "object", "hidden_query": "object"}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build transitive upstream/downstream lineage for Access objects.")
+    registry_source = parser.add_mutually_exclusive_group(required=True)
+    registry_source.add_argument("--registry-json", help="Path to access_registry_*.json")
+    registry_source.add_argument(
+        "--registry-db",
+        help="Path to access_registry_*.sqlite; reads only the registry slices this step uses",
+    )
+    parser.add_argument("--out-dir", default="output/analysis/parity", help="Output directory")
+    parser.add_argument("--snapshot-id", help="Optional snapshot id")
+    parser.add_argument(
+        "--impact",
+        nargs="+",
+        metavar="NAME",
+        help="Print everything downstream of these tables/queries (what breaks if they change)",
+    )
+    parser.add_argument(
+        "--upstream",
+        nargs="+",
+        metavar="NAME",
+        help="Print every query and base table these reports/queries read from",
+    )
+    parser.add_argument(
+        "--sql-refs-cache-dir",
+        default=DEFAULT_SQL_REFS_CACHE,
+        help=f"Table references scanned from query SQL, keyed by SQL SHA-256 (default: {DEFAULT_SQL_REFS_CACHE})",
+    )
+    parser.add_argument("--no-sql-refs-cache", action="store_true", help="Rescan every query's SQL")
+    return parser.parse_args()
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def timestamp_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def load_json(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@dataclass
+class LineageGraph:
+    """Objects as bit positions; `reads[i]` is the bitset of nodes node i reads from directly."""
+
+    names: list[str] = field(default_factory=list)
+    kinds: list[str] = field(default_factory=list)
+    reads: list[int] = field(default_factory=list)
+    resolved_tables: set[int] = field(default_factory=set)
+    index: dict[tuple[str, str], int] = field(default_factory=dict)
+    folded: dict[tuple[str, str], list[int]] = field(default_factory=dict)
+
+    def node(self, kind: str, name: str) -> int:
+        # Saved and hidden queries share one namespace; tables and reports each have their own.
+        # Queries and reports keep the registry's exact names (two saved queries can differ only
+        # in case); tables come from case-insensitive SQL references, so they are folded.
+        namespace = NAMESPACE.get(kind, kind)
+        key = (namespace, name.lower() if kind == "table" else name)
+        idx = self.index.get(key)
+        if idx is None:
+            idx = len(self.names)
+            self.index[key] = idx
+            self.folded.setdefault((namespace, name.lower()), []).append(idx)
+            self.names.append(name)
+            self.kinds.append(kind)
+            self.reads.append(0)
+        return idx
+
+    def resolve(self, namespace: str, name: str) -> list[int]:
+        """The node named exactly `name`, otherwise every node whose name matches ignoring case."""
+        idx = self.index.get((namespace, name))
+        if idx is not None:
+            return [idx]
+        return list(self.folded.get((namespace, name.lower()), []))
+
+    def add_edge(self, reader: int, target: int) -> None:
+        if reader != target:
+            self.reads[reader] |= 1 << target
+
+    def lookup(self, name: str) -> list[int]:
+        exact = [idx for idx, node_name in enumerate(self.names) if node_name == name]
+        if exact:
+            return exact
+        lowered = name.lower()
+        return [idx for key, nodes in self.folded.items() if key[1] == lowered for idx in nodes]
+
+
+def build_lineage_graph(registry: dict, sql_refs: SqlRefCache) -> LineageGraph:
+    graph = LineageGraph()
+    queries = registry.get("queries", {})
+    canonical = queries.get("canonical_names", [])
+    hidden = queries.get("hidden_names", [])
+    for name in canonical:
+        graph.node("query", name)
+    for name in hidden:
+        graph.node("hidden_query", name)
+    for row in registry.get("objects", {}).get("reports", []):
+        graph.node("report", row["name"])
+
+    for row in registry.get("dependencies", {}).get("query_edges", []):
+        for src in graph.resolve("object", row.get("source_query") or ""):
+            for dst in graph.resolve("object", row.get("target_query") or ""):
+                graph.add_edge(src, dst)
+
+    table_to_sources = registry.get("source_catalog", {}).get("table_to_sources", {})
+    sql_by_name = queries.get("sql_by_name", {})
+    for name in canonical:
+        sql_text = (sql_by_name.get(name) or {}).get("selected_sql")
+        if not sql_text:
+            continue
+        src = graph.index[("object", name)]
+        for ref in sorted(sql_refs.get(sql_text), key=str.lower):
+            # Access resolves SQL names without regard to case.
+            targets = graph.resolve("object", ref)
+            if not targets:
+                target = graph.node("table", ref)
+                if ref.lower() in table_to_sources:
+                    graph.resolved_tables.add(target)
+                targets = [target]
+            for target in targets:
+                graph.add_edge(src, target)
+
+    for name in hidden:
+        match = HIDDEN_OWNER_RE.match(name)
+        for report in graph.resolve("report", match.group(1)) if match else []:
+            graph.add_edge(report, graph.index[("object", name)])
+    return graph
+
+
+def iter_bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def transitive_closure(reads: list[int]) -> list[int]:
+    """Bitset of every node reachable from each node (itself included only when it sits on a cycle)."""
+    nodes = list(range(len(reads)))
+    successors = {idx: list(iter_bits(mask)) for idx, mask in enumerate(reads)}
+    closure = [0] * len(reads)
+    # Tarjan emits a component only after every component reachable from it.
+    for members in strongly_connected_components(nodes, successors):
+        mask = 0
+        for member in members:
+            mask |= reads[member]
+            for target in successors[member]:
+                mask |= closure[target]
+        if len(members) > 1:
+            for member in members:
+                mask |= 1 << member
+        for member in members:
+            closure[member] = mask
+    return closure
+
+
+def reverse(reads: list[int]) -> list[int]:
+    reverse_reads = [0] * len(reads)
+    for idx, mask in enumerate(reads):
+        for target in iter_bits(mask):
+            reverse_reads[target] |= 1 << idx
+    return reverse_reads
+
+
+def names_by_kind(graph: LineageGraph, mask: int) -> dict[str, list[str]]:
+    grouped: dict[str, list[str]] = {kind: [] for kind in KIND_ORDER}
+    for idx in iter_bits(mask):
+        grouped[graph.kinds[idx]].append(graph.names[idx])
+    return {kind: sorted(names, key=query_sort_key) for kind, names in grouped.items()}
+
+
+def build_lineage_index(graph: LineageGraph, upstream: list[int], downstream: list[int], snapshot_id: str) -> dict:
+    rows = []
+    for idx in sorted(range(len(graph.names)), key=lambda i: (KIND_ORDER.index(graph.kinds[i]), query_sort_key(graph.names[i]))):
+        kind = graph.kinds[idx]
+        row: dict = {"name": graph.names[idx], "kind": kind}
+        if kind == "table":
+            row["resolved_in_sources"] = idx in graph.resolved_tables
+        else:
+            direct = names_by_kind(graph, graph.reads[idx])
+            row["direct_upstream"] = sorted(direct["query"] + direct["hidden_query"] + direct["table"], key=query_sort_key)
+            lineage = names_by_kind(graph, upstream[idx])
+            row["upstream_queries"] = lineage["query"] + lineage["hidden_query"]
+            row["upstream_tables"] = lineage["table"]
+        if kind != "report":
+            impact = names_by_kind(graph, downstream[idx])
+            row["downstream_queries"] = impact["query"] + impact["hidden_query"]
+            row["downstream_reports"] = impact["report"]
+        rows.append(row)
+
+    counts = {kind: graph.kinds.count(kind) for kind in KIND_ORDER}
+    return {
+        "generated_at_utc": now_iso(),
+        "snapshot_id": snapshot_id,
+        "stats": {
+            "nodes_by_kind": counts,
+            "direct_edges_total": sum(mask.bit_count() for mask in graph.reads),
+            "tables_unresolved": counts["table"] - len(graph.resolved_tables),
+            "max_upstream_size": max((mask.bit_count() for mask in upstream), default=0),
+            "max_downstream_size": max((mask.bit_count() for mask in downstream), default=0),
+        },
+        "notes": [
+            "Report lineage covers the hidden ~sq_ queries a report owns; a report whose record source is a saved "
+            "query by name is not linked, because the registry does not record report properties.",
+            "Hidden queries contribute query edges only; their own SQL is not in the registry, so tables they read "
+            "directly are not listed.",
+        ],
+        "objects": rows,
+    }
+
+
+def answer(graph: LineageGraph, closure: list[int], names: list[str], direction: str) -> list[dict]:
+    answers = []
+    for name in names:
+        matches = graph.lookup(name)
+        if not matches:
+            raise RuntimeError(f"Unknown Access object or table: {name}")
+        for idx in matches:
+            grouped = names_by_kind(graph, closure[idx])
+            answers.append(
+                {
+                    "name": graph.names[idx],
+                    "kind": graph.kinds[idx],
+                    direction: {kind: values for kind, values in grouped.items() if values},
+                    f"{direction}_total": closure[idx].bit_count(),
+                }
+            )
+    return answers
+
+
+def main() -> int:
+    args = parse_args()
+    if args.registry_db:
+        registry_path = Path(args.registry_db).expanduser().resolve()
+        if not registry_path.exists():
+            raise RuntimeError(f"Registry database not found: {registry_path}")
+        registry = load_registry(registry_path, ("query_names", "objects", "selected_sql", "edges", "source_catalog"))
+    else:
+        registry_path = Path(args.registry_json).expanduser().resolve()
+        if not registry_path.exists():
+            raise RuntimeError(f"Registry JSON not found: {registry_path}")
+        registry = load_json(registry_path)
+    snapshot_id = args.snapshot_id or registry.get("snapshot_id") or timestamp_id()
+
+    sql_refs = SqlRefCache(None if args.no_sql_refs_cache else Path(args.sql_refs_cache_dir))
+    graph = build_lineage_graph(registry, sql_refs)
+    sql_refs.save()
+    upstream = transitive_closure(graph.reads)
+    downstream = transitive_closure(reverse(graph.reads))
+
+    if args.impact or args.upstream:
+        report = {}
+        if args.impact:
+            report["impact"] = answer(graph, downstream, args.impact, "downstream")
+        if args.upstream:
+            report["lineage"] = answer(graph, upstream, args.upstream, "upstream")
+        print(json.dumps(report, indent=2))
+        return 0
+
+    lineage = build_lineage_index(graph, upstream, downstream, snapshot_id)
+    lineage["inputs"] = {"registry_db" if args.registry_db else "registry_json": str(registry_path)}
+
+    out_dir = Path(args.out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    lineage_path = out_dir / f"lineage_index_{snapshot_id}.json"
+    latest_path = out_dir / "latest_lineage_index.json"
+    lineage_path.write_text(json.dumps(lineage, indent=2) + "\n", encoding="utf-8")
+    latest_path.write_text(json.dumps(lineage, indent=2) + "\n", encoding="utf-8")
+
+    print(f"Wrote lineage index: {lineage_path}")
+    print(f"Wrote latest lineage alias: {latest_path}")
+    print(json.dumps(lineage["stats"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except RuntimeError as exc:
+        print(f"FAIL: {exc}", file=sys.stderr)
+        raise SystemExit(1)
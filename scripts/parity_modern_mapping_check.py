@@ -11,9 +11,13 @@ from __future__ import annotations
 import argparse
 import fnmatch
 import json
+import re
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from access_registry_db import load_registry
+
 
 TYPE_TO_PLURAL = {
     "module": "modules",
@@ -25,7 +29,12 @@ TYPE_TO_PLURAL = {
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Validate modern object mapping coverage from registry.")
     parser.add_argument("--mapping-path", required=True, help="Path to docs/access_object_mapping.json")
-    parser.add_argument("--registry-json", required=True, help="Path to access_registry_*.json")
+    registry_source = parser.add_mutually_exclusive_group(required=True)
+    registry_source.add_argument("--registry-json", help="Path to access_registry_*.json")
+    registry_source.add_argument(
+        "--registry-db",
+        help="Path to access_registry_*.sqlite; reads only the registry slices this step uses",
+    )
     parser.add_argument("--out-dir", default="output/analysis/parity", help="Output directory")
     parser.add_argument("--snapshot-id", help="Optional snapshot id")
     parser.add_argument(
@@ -65,30 +74,68 @@ def canonical_object_rows(registry: dict) -> dict[str, list[str]]:
     }
 
 
+@dataclass
+class RuleMatcher:
+    """Rules for one object type, compiled into a single first-match regex."""
+
+    rules: list[tuple[int, dict]]
+    pattern: re.Pattern | None
+
+    def match(self, lowered_name: str) -> tuple[int, dict] | None:
+        if self.pattern is None:
+            return None
+        found = self.pattern.match(lowered_name)
+        if found is None:
+            return None
+        # Each alternative is wrapped in group r<k>; the outermost group closes last.
+        return self.rules[int(found.lastgroup[1:])]
+
+
+class MappingIndex:
+    """
+    Mapping manifest pre-indexed for lookup: explicit entries per object type,
+    and the wildcard rules of each type compiled into one alternation of
+    `fnmatch` translations in manifest order. Regex alternation tries
+    alternatives left to right, so the first rule that matches wins, as in
+    a plain loop over the rules.
+    """
+
+    def __init__(self, mapping_manifest: dict) -> None:
+        objects = mapping_manifest.get("objects", {})
+        self.explicit = {object_type: objects.get(plural) or {} for object_type, plural in TYPE_TO_PLURAL.items()}
+        self.rules = list(mapping_manifest.get("rules", []))
+
+        by_type: dict[str, list[tuple[int, dict, str]]] = {object_type: [] for object_type in TYPE_TO_PLURAL}
+        for rule_index, rule in enumerate(self.rules):
+            object_type = str(rule.get("object_type", "")).strip().lower()
+            pattern = str(rule.get("pattern", "")).strip()
+            if object_type in by_type and pattern:
+                by_type[object_type].append((rule_index, rule, pattern.lower()))
+
+        self.matchers: dict[str, RuleMatcher] = {}
+        for object_type, entries in by_type.items():
+            alternatives = [f"(?P<r{k}>{fnmatch.translate(pattern)})" for k, (_, _, pattern) in enumerate(entries)]
+            self.matchers[object_type] = RuleMatcher(
+                rules=[(rule_index, rule) for rule_index, rule, _ in entries],
+                pattern=re.compile("|".join(alternatives)) if alternatives else None,
+            )
+
+
 def find_mapping_for_object(
-    mapping_manifest: dict,
+    mapping_index: MappingIndex,
     object_type: str,
     object_name: str,
-) -> tuple[dict | None, str | None]:
-    objects = mapping_manifest.get("objects", {})
-    bucket = TYPE_TO_PLURAL[object_type]
-    explicit = (objects.get(bucket) or {}).get(object_name)
+) -> tuple[dict | None, str | None, int | None]:
+    explicit = mapping_index.explicit[object_type].get(object_name)
     if explicit is not None:
-        return explicit, "explicit"
+        return explicit, "explicit", None
 
-    rules = mapping_manifest.get("rules", [])
-    for rule in rules:
-        if str(rule.get("object_type", "")).strip().lower() != object_type:
-            continue
+    matched = mapping_index.matchers[object_type].match(object_name.lower())
+    if matched is not None:
+        rule_index, rule = matched
+        return rule, f"rule:{rule.get('name', 'unnamed')}", rule_index
 
-        pattern = str(rule.get("pattern", "")).strip()
-        if not pattern:
-            continue
-
-        if fnmatch.fnmatchcase(object_name.lower(), pattern.lower()):
-            return rule, f"rule:{rule.get('name', 'unnamed')}"
-
-    return None, None
+    return None, None, None
 
 
 def validate_mapping_entry(entry: dict | None) -> tuple[bool, list[str]]:
@@ -111,7 +158,7 @@ def validate_mapping_entry(entry: dict | None) -> tuple[bool, list[str]]:
 def main() -> int:
     args = parse_args()
     mapping_path = Path(args.mapping_path).expanduser().resolve()
-    registry_path = Path(args.registry_json).expanduser().resolve()
+    registry_path = Path(args.registry_db or args.registry_json).expanduser().resolve()
 
     if not mapping_path.exists():
         raise RuntimeError(f"Mapping file not found: {mapping_path}")
@@ -119,11 +166,13 @@ def main() -> int:
         raise RuntimeError(f"Registry file not found: {registry_path}")
 
     mapping_manifest = load_json(mapping_path)
-    registry = load_json(registry_path)
+    registry = load_registry(registry_path, ("objects",)) if args.registry_db else load_json(registry_path)
 
     snapshot_id = args.snapshot_id or registry.get("snapshot_id") or timestamp_id()
 
     objects_by_type = canonical_object_rows(registry)
+    mapping_index = MappingIndex(mapping_manifest)
+    rule_hits = [0] * len(mapping_index.rules)
 
     coverage_rows: dict[str, list[dict]] = {
         "modules": [],
@@ -135,13 +184,16 @@ def main() -> int:
     for object_type, names in objects_by_type.items():
         plural = TYPE_TO_PLURAL[object_type]
         for name in names:
-            mapping_entry, source = find_mapping_for_object(mapping_manifest, object_type, name)
+            mapping_entry, source, rule_index = find_mapping_for_object(mapping_index, object_type, name)
             is_valid, errors = validate_mapping_entry(mapping_entry)
+            if rule_index is not None:
+                rule_hits[rule_index] += 1
 
             row = {
                 "object_name": name,
                 "object_type": object_type,
                 "mapping_source": source,
+                "matched_rule_index": rule_index,
                 "mapped": is_valid,
                 "errors": errors,
                 "mapping": mapping_entry,
@@ -169,13 +221,23 @@ def main() -> int:
         "snapshot_id": snapshot_id,
         "inputs": {
             "mapping_path": str(mapping_path),
-            "registry_json": str(registry_path),
+            "registry_db" if args.registry_db else "registry_json": str(registry_path),
         },
         "counts": counts,
         "gate": {
             "mapped_coverage_pass": counts["unmapped_total"] == 0,
             "unmapped_total": counts["unmapped_total"],
         },
+        "rule_usage": [
+            {
+                "rule_index": idx,
+                "name": rule.get("name", "unnamed"),
+                "object_type": rule.get("object_type"),
+                "pattern": rule.get("pattern"),
+                "objects_matched": rule_hits[idx],
+            }
+            for idx, rule in enumerate(mapping_index.rules)
+        ],
         "coverage": coverage_rows,
         "unmapped": unmapped_rows,
     }
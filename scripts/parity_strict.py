@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
+from access_file_index import DEFAULT_SEARCH_DEPTH, FileIndex, default_search_roots
+
 
 @dataclass
 class StepResult:
@@ -86,37 +88,28 @@ def parse_args() -> argparse.Namespace:
         help="Gracefully pass when Access .accdb files are not available (CI mode). "
              "Falls back to validating committed parity artifacts instead.",
     )
+    parser.add_argument(
+        "--search-roots",
+        nargs="*",
+        help="Directories searched for Access files not found at the given path (default: cwd, its parent, ~/Downloads and their MVQS folders)",
+    )
+    parser.add_argument(
+        "--search-depth",
+        type=int,
+        default=DEFAULT_SEARCH_DEPTH,
+        help=f"Subdirectory levels indexed below each search root (default: {DEFAULT_SEARCH_DEPTH})",
+    )
     return parser.parse_args()
 
 
-def resolve_file_path(path_str: str, *, required: bool = True) -> Path | None:
+def resolve_file_path(path_str: str, file_index: FileIndex, *, required: bool = True) -> Path | None:
     raw = Path(path_str).expanduser()
     if raw.exists():
         return raw.resolve()
 
-    cwd = Path.cwd()
-    home = Path.home()
-    basename = raw.name
-
-    search_dirs = [
-        cwd,
-        cwd / "MVQS_Database 2",
-        cwd.parent,
-        cwd.parent / "MVQS_Database 2",
-        home / "Downloads",
-        home / "Downloads" / "MVQS_Database 2",
-        home / "Downloads" / "MVQS",
-        home / "Downloads" / "MVQS" / "MVQS_Database 2",
-    ]
-
-    candidates = []
-    for base in search_dirs:
-        candidates.append(base / path_str)
-        candidates.append(base / basename)
-
-    for candidate in candidates:
-        if candidate.exists():
-            return candidate.resolve()
+    found = file_index.find(path_str)
+    if found is not None:
+        return found
 
     if not required:
         return None
@@ -178,23 +171,26 @@ def main() -> int:
     snapshot_id = args.snapshot_id or timestamp_id()
     out_dir = Path(args.out_dir).expanduser().resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
+    search_roots = list(args.search_roots) if args.search_roots is not None else [str(root) for root in default_search_roots()]
+    file_index = FileIndex([Path(root) for root in search_roots], depth=args.search_depth)
 
     # In CI mode (--skip-if-no-databases), check if databases are available.
     # If not, fall back to validating committed parity artifacts.
     if args.skip_if_no_databases:
         all_db_paths = list(args.front_end_paths) + [args.dc_data_path, args.dc_jobbank_path]
-        resolved = [resolve_file_path(p, required=False) for p in all_db_paths]
+        resolved = [resolve_file_path(p, file_index, required=False) for p in all_db_paths]
         if any(r is None for r in resolved):
             missing_names = [p for p, r in zip(all_db_paths, resolved) if r is None]
             print(f"Access databases not found: {', '.join(missing_names)}")
             return validate_committed_artifacts(out_dir)
 
-    front_end_paths = [str(resolve_file_path(p)) for p in args.front_end_paths]
-    dc_data_path = str(resolve_file_path(args.dc_data_path))
-    dc_jobbank_path = str(resolve_file_path(args.dc_jobbank_path))
-    mapping_path = str(resolve_file_path(args.mapping_path))
+    front_end_paths = [str(resolve_file_path(p, file_index)) for p in args.front_end_paths]
+    dc_data_path = str(resolve_file_path(args.dc_data_path, file_index))
+    dc_jobbank_path = str(resolve_file_path(args.dc_jobbank_path, file_index))
+    mapping_path = str(resolve_file_path(args.mapping_path, file_index))
 
     registry_path = out_dir / f"access_registry_{snapshot_id}.json"
+    registry_db_path = out_dir / f"access_registry_{snapshot_id}.sqlite"
     table_taps_path = out_dir / f"table_tap_coverage_{snapshot_id}.json"
     query_order_path = out_dir / f"query_order_{snapshot_id}.json"
     mapping_coverage_path = out_dir / f"modern_mapping_coverage_{snapshot_id}.json"
@@ -224,13 +220,17 @@ def main() -> int:
     table_taps_cmd = [
         sys.executable,
         "scripts/parity_table_taps.py",
-        "--registry-json",
-        str(registry_path),
+        "--registry-db",
+        str(registry_db_path),
         "--out-dir",
         str(out_dir),
         "--snapshot-id",
         snapshot_id,
         "--fail-on-missing-table",
+        "--search-depth",
+        str(args.search_depth),
+        "--search-roots",
+        *search_roots,
     ]
     steps.append(run_step("table_taps", table_taps_cmd))
 
@@ -239,8 +239,8 @@ def main() -> int:
         "scripts/parity_modern_mapping_check.py",
         "--mapping-path",
         mapping_path,
-        "--registry-json",
-        str(registry_path),
+        "--registry-db",
+        str(registry_db_path),
         "--out-dir",
         str(out_dir),
         "--snapshot-id",
@@ -300,6 +300,7 @@ def main() -> int:
 
     artifact_presence = {
         "registry_exists": registry_path.exists(),
+        "registry_db_exists": registry_db_path.exists(),
         "query_order_exists": query_order_path.exists(),
         "table_taps_exists": table_taps_path.exists(),
         "mapping_coverage_exists": mapping_coverage_path.exists(),
@@ -319,6 +320,7 @@ def main() -> int:
         },
         "artifacts": {
             "access_registry": str(registry_path),
+            "access_registry_db": str(registry_db_path),
             "query_order": str(query_order_path),
             "table_tap_coverage": str(table_taps_path),
             "modern_mapping_coverage": str(mapping_coverage_path),
@@ -10,46 +10,19 @@ Outputs:
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
-import os
 import re
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
-IDENTIFIER_TOKEN = r"(?:\[[^\]]+\]|\"[^\"]+\"|`[^`]+`|[A-Za-z0-9_.$~]+)"
-CLAUSE_PATTERNS = (
-    re.compile(rf"\bFROM\s+({IDENTIFIER_TOKEN})", re.IGNORECASE),
-    re.compile(rf"\bJOIN\s+({IDENTIFIER_TOKEN})", re.IGNORECASE),
-    re.compile(rf"\bUPDATE\s+({IDENTIFIER_TOKEN})", re.IGNORECASE),
-    re.compile(rf"\bINTO\s+({IDENTIFIER_TOKEN})", re.IGNORECASE),
-    re.compile(rf"\bDELETE\s+FROM\s+({IDENTIFIER_TOKEN})", re.IGNORECASE),
-)
-NUMERIC_RE = re.compile(r"(\d+)")
-MULTISPACE_RE = re.compile(r"\s+")
-
-SKIP_IDENTIFIERS = {
-    "select",
-    "distinct",
-    "distinctrow",
-    "top",
-    "inner",
-    "left",
-    "right",
-    "full",
-    "where",
-    "group",
-    "order",
-    "having",
-    "as",
-    "set",
-    "on",
-    "values",
-    "union",
-    "all",
-}
-
+from access_file_index import DEFAULT_SEARCH_DEPTH, FileIndex, default_search_roots
+from access_registry_db import load_registry
+from access_sql_refs import DEFAULT_SQL_REFS_CACHE, SqlRefCache
 
+NUMERIC_RE = re.compile(r"(\d+)")
 
 # Tables that are linked/referenced in Access queries but are known to not exist in any
 # backend database (they are stubs, linked-table placeholders, import-staging tables, or
@@ -72,7 +45,12 @@ KNOWN_ABSENT_TABLES: set[str] = {
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build deterministic query order and table-tap coverage.")
-    parser.add_argument("--registry-json", required=True, help="Path to access_registry_*.json")
+    registry_source = parser.add_mutually_exclusive_group(required=True)
+    registry_source.add_argument("--registry-json", help="Path to access_registry_*.json")
+    registry_source.add_argument(
+        "--registry-db",
+        help="Path to access_registry_*.sqlite; reads only the registry slices this step uses",
+    )
     parser.add_argument("--out-dir", default="output/analysis/parity", help="Output directory")
     parser.add_argument("--snapshot-id", help="Optional snapshot id")
     parser.add_argument(
@@ -86,6 +64,23 @@ def parse_args() -> argparse.Namespace:
         default=[],
         help="Additional table names to exclude from the missing-table gate.",
     )
+    parser.add_argument(
+        "--search-roots",
+        nargs="*",
+        help="Directories searched for expected linked databases (default: cwd, its parent, ~/Downloads and their MVQS folders)",
+    )
+    parser.add_argument(
+        "--search-depth",
+        type=int,
+        default=DEFAULT_SEARCH_DEPTH,
+        help=f"Subdirectory levels indexed below each search root (default: {DEFAULT_SEARCH_DEPTH})",
+    )
+    parser.add_argument(
+        "--sql-refs-cache-dir",
+        default=DEFAULT_SQL_REFS_CACHE,
+        help=f"Table references scanned from query SQL, keyed by SQL SHA-256 (default: {DEFAULT_SQL_REFS_CACHE})",
+    )
+    parser.add_argument("--no-sql-refs-cache", action="store_true", help="Rescan every query's SQL")
     return parser.parse_args()
 
 
@@ -101,55 +96,6 @@ def load_json(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def normalize_identifier(raw: str | None) -> str | None:
-    if raw is None:
-        return None
-
-    text = raw.strip().rstrip(",;")
-    if not text:
-        return None
-
-    if text.startswith("[") and text.endswith("]"):
-        text = text[1:-1]
-    elif text.startswith('"') and text.endswith('"'):
-        text = text[1:-1]
-    elif text.startswith("`") and text.endswith("`"):
-        text = text[1:-1]
-
-    text = text.strip().rstrip(",;")
-    if not text:
-        return None
-
-    lowered = text.lower()
-    if lowered in SKIP_IDENTIFIERS:
-        return None
-    if "!" in text:
-        return None
-    if text.startswith("("):
-        return None
-
-    return text
-
-
-def normalize_sql(sql: str) -> str:
-    without_comments = re.sub(r"--[^\n\r]*", " ", sql)
-    without_comments = re.sub(r"/\*.*?\*/", " ", without_comments, flags=re.DOTALL)
-    return MULTISPACE_RE.sub(" ", without_comments).strip()
-
-
-def extract_identifiers_from_sql(sql: str) -> set[str]:
-    refs: set[str] = set()
-    normalized_sql = normalize_sql(sql)
-
-    for pattern in CLAUSE_PATTERNS:
-        for match in pattern.finditer(normalized_sql):
-            value = normalize_identifier(match.group(1))
-            if value:
-                refs.add(value)
-
-    return refs
-
-
 def sequence_sort_key(name: str) -> tuple:
     parts = NUMERIC_RE.split(name.lower())
     key_parts: list[tuple] = []
@@ -161,48 +107,151 @@ def sequence_sort_key(name: str) -> tuple:
     return tuple(key_parts)
 
 
-def topo_sort_with_fallback(nodes: list[str], edges: set[tuple[str, str]]) -> tuple[list[str], list[str]]:
-    adjacency: dict[str, set[str]] = {name: set() for name in nodes}
-    indegree: dict[str, int] = {name: 0 for name in nodes}
+def query_sort_key(name: str) -> tuple:
+    return (sequence_sort_key(name), name.lower())
 
-    for src, dst in edges:
-        if src not in adjacency or dst not in adjacency or src == dst:
-            continue
-        if dst in adjacency[src]:
-            continue
-        adjacency[src].add(dst)
-        indegree[dst] += 1
 
-    frontier = sorted([name for name in nodes if indegree[name] == 0], key=lambda n: (sequence_sort_key(n), n.lower()))
-    ordered: list[str] = []
+@dataclass
+class ComponentOrder:
+    """Strongly connected components of the query graph, in deterministic topological order."""
 
-    while frontier:
-        current = frontier.pop(0)
-        ordered.append(current)
+    ordered: list[str]
+    components: list[list[str]]
+    component_of: dict[str, int]
+    levels: list[int]
+    entry_edges: list[list[tuple[str, str]]]
+
+    @property
+    def cycle_nodes(self) -> list[str]:
+        return [name for members in self.components if len(members) > 1 for name in members]
+
+
+def strongly_connected_components(nodes: list[str], successors: dict[str, list[str]]) -> list[list[str]]:
+    """Tarjan's algorithm, iterative so deep dependency chains cannot hit the recursion limit."""
+    index_of: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    components: list[list[str]] = []
+    counter = 0
 
-        for neighbor in sorted(adjacency[current], key=lambda n: (sequence_sort_key(n), n.lower())):
-            indegree[neighbor] -= 1
-            if indegree[neighbor] == 0:
-                frontier.append(neighbor)
-        frontier.sort(key=lambda n: (sequence_sort_key(n), n.lower()))
+    for root in nodes:
+        if root in index_of:
+            continue
+        work = [(root, iter(successors[root]))]
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index_of:
+                    index_of[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == node:
+                            break
+                    components.append(members)
+    return components
+
+
+def order_components(nodes: list[str], edges: set[tuple[str, str]]) -> ComponentOrder:
+    """
+    Collapse each dependency cycle into one strongly connected component and
+    topologically sort the resulting DAG. Components are emitted smallest
+    `query_sort_key` first (a component's key is its smallest member's) from
+    a heap, with an insertion counter for ties, so an acyclic graph comes out
+    in the same order as a plain Kahn's sort over the queries. Members of a
+    cyclic component are listed in key order. `levels` gives each
+    component's depth in the condensation; components on one level do not
+    depend on each other.
+    """
+    keys = {name: query_sort_key(name) for name in nodes}
+    position = {name: idx for idx, name in enumerate(nodes)}
+    adjacency: dict[str, set[str]] = {name: set() for name in nodes}
+    for src, dst in edges:
+        if src in adjacency and dst in adjacency and src != dst:
+            adjacency[src].add(dst)
+    successors = {name: sorted(targets, key=keys.__getitem__) for name, targets in adjacency.items()}
+
+    raw_components = strongly_connected_components(nodes, successors)
+    members_of = [sorted(members, key=keys.__getitem__) for members in raw_components]
+    component_id = {name: cid for cid, members in enumerate(members_of) for name in members}
+    component_key = [keys[members[0]] for members in members_of]
+    component_seq = [min(position[name] for name in members) for members in members_of]
+
+    comp_successors: list[set[int]] = [set() for _ in members_of]
+    entry: list[list[tuple[str, str]]] = [[] for _ in members_of]
+    for src in nodes:
+        for dst in successors[src]:
+            a, b = component_id[src], component_id[dst]
+            if a != b:
+                comp_successors[a].add(b)
+                entry[b].append((src, dst))
+    indegree = [0] * len(members_of)
+    for targets in comp_successors:
+        for target in targets:
+            indegree[target] += 1
+
+    frontier = [(component_key[cid], component_seq[cid], cid) for cid in range(len(members_of)) if indegree[cid] == 0]
+    heapq.heapify(frontier)
+    counter = len(nodes)
+    level = [0] * len(members_of)
+    emitted: list[int] = []
+    while frontier:
+        _, _, current = heapq.heappop(frontier)
+        emitted.append(current)
+        for target in sorted(comp_successors[current], key=component_key.__getitem__):
+            level[target] = max(level[target], level[current] + 1)
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                heapq.heappush(frontier, (component_key[target], counter, target))
+                counter += 1
+
+    renumber = {cid: idx for idx, cid in enumerate(emitted)}
+    components = [members_of[cid] for cid in emitted]
+    return ComponentOrder(
+        ordered=[name for members in components for name in members],
+        components=components,
+        component_of={name: renumber[cid] for name, cid in component_id.items()},
+        levels=[level[cid] for cid in emitted],
+        entry_edges=[sorted(entry[cid], key=lambda pair: (keys[pair[0]], keys[pair[1]])) for cid in emitted],
+    )
 
-    cycle_nodes = [name for name in nodes if name not in set(ordered)]
-    if cycle_nodes:
-        cycle_nodes = sorted(cycle_nodes, key=lambda n: (sequence_sort_key(n), n.lower()))
-        ordered.extend(cycle_nodes)
 
-    return ordered, cycle_nodes
+def topo_sort_with_fallback(nodes: list[str], edges: set[tuple[str, str]]) -> tuple[list[str], list[str]]:
+    """Query order plus the queries that sit on dependency cycles (see `order_components`)."""
+    order = order_components(nodes, edges)
+    return order.ordered, order.cycle_nodes
 
 
-def build_query_order(registry: dict, snapshot_id: str) -> dict:
+def build_query_order(registry: dict, snapshot_id: str, sql_refs: SqlRefCache) -> dict:
     canonical_queries: list[str] = list(registry.get("queries", {}).get("canonical_names", []))
     all_queries = set(item.get("name") for item in registry.get("objects", {}).get("queries", []) if item.get("name"))
 
+    canonical_set = set(canonical_queries)
     edges: set[tuple[str, str]] = set()
     for row in registry.get("dependencies", {}).get("query_edges", []):
         src = row.get("source_query")
         dst = row.get("target_query")
-        if src and dst and src in canonical_queries and dst in canonical_queries and src != dst:
+        if src and dst and src in canonical_set and dst in canonical_set and src != dst:
             edges.add((src, dst))
 
     sql_by_name = registry.get("queries", {}).get("sql_by_name", {})
@@ -212,11 +261,13 @@ def build_query_order(registry: dict, snapshot_id: str) -> dict:
         sql_text = (sql_by_name.get(query_name) or {}).get("selected_sql")
         if not sql_text:
             continue
-        for ref in extract_identifiers_from_sql(sql_text):
-            if ref in all_queries and ref in canonical_queries and ref != query_name:
+        for ref in sql_refs.get(sql_text):
+            if ref in all_queries and ref in canonical_set and ref != query_name:
                 edges.add((query_name, ref))
 
-    ordered, cycle_nodes = topo_sort_with_fallback(canonical_queries, edges)
+    order = order_components(canonical_queries, edges)
+    cycle_nodes = order.cycle_nodes
+    cycle_set = set(cycle_nodes)
 
     inbound: dict[str, int] = {name: 0 for name in canonical_queries}
     outbound: dict[str, int] = {name: 0 for name in canonical_queries}
@@ -224,6 +275,18 @@ def build_query_order(registry: dict, snapshot_id: str) -> dict:
         outbound[src] += 1
         inbound[dst] += 1
 
+    cycle_components = [
+        {
+            "component": cid + 1,
+            "level": order.levels[cid],
+            "size": len(members),
+            "members": members,
+            "entry_edges": [{"source_query": src, "target_query": dst} for src, dst in order.entry_edges[cid]],
+        }
+        for cid, members in enumerate(order.components)
+        if len(members) > 1
+    ]
+
     return {
         "generated_at_utc": now_iso(),
         "snapshot_id": snapshot_id,
@@ -231,17 +294,23 @@ def build_query_order(registry: dict, snapshot_id: str) -> dict:
             "canonical_queries_total": len(canonical_queries),
             "dependency_edges_total": len(edges),
             "cycle_node_count": len(cycle_nodes),
+            "component_count": len(order.components),
+            "cycle_component_count": len(cycle_components),
+            "level_count": (max(order.levels) + 1) if order.levels else 0,
         },
         "cycle_nodes": cycle_nodes,
+        "cycle_components": cycle_components,
         "ordered_queries": [
             {
                 "position": idx + 1,
                 "name": name,
                 "inbound_dependencies": inbound[name],
                 "outbound_dependencies": outbound[name],
-                "cycle_fallback": name in set(cycle_nodes),
+                "cycle_fallback": name in cycle_set,
+                "component": order.component_of[name] + 1,
+                "level": order.levels[order.component_of[name]],
             }
-            for idx, name in enumerate(ordered)
+            for idx, name in enumerate(order.ordered)
         ],
         "dependencies": [
             {"source_query": src, "target_query": dst}
@@ -250,7 +319,13 @@ def build_query_order(registry: dict, snapshot_id: str) -> dict:
     }
 
 
-def build_table_tap_coverage(registry: dict, query_order: dict, snapshot_id: str) -> dict:
+def build_table_tap_coverage(
+    registry: dict,
+    query_order: dict,
+    snapshot_id: str,
+    sql_refs: SqlRefCache,
+    file_index: FileIndex,
+) -> dict:
     sql_by_name = registry.get("queries", {}).get("sql_by_name", {})
     query_names = [row["name"] for row in query_order.get("ordered_queries", [])]
     query_lookup = {item.get("name", "").lower(): item.get("name") for item in registry.get("objects", {}).get("queries", [])}
@@ -267,7 +342,7 @@ def build_table_tap_coverage(registry: dict, query_order: dict, snapshot_id: str
     for query_name in query_names:
         sql_row = sql_by_name.get(query_name, {})
         sql_text = sql_row.get("selected_sql") or ""
-        refs = sorted(extract_identifiers_from_sql(sql_text), key=lambda v: v.lower())
+        refs = sorted(sql_refs.get(sql_text), key=lambda v: v.lower())
 
         query_refs: list[str] = []
         resolved_tables: list[dict] = []
@@ -313,27 +388,11 @@ def build_table_tap_coverage(registry: dict, query_order: dict, snapshot_id: str
         )
 
     unresolved_rows = []
-    search_roots = [
-        Path.cwd(),
-        Path.cwd() / "MVQS_Database 2",
-        Path.cwd().parent,
-        Path.cwd().parent / "MVQS_Database 2",
-        Path.home() / "Downloads",
-        Path.home() / "Downloads" / "MVQS",
-        Path.home() / "Downloads" / "MVQS_Database 2",
-        Path.home() / "Downloads" / "MVQS" / "MVQS_Database 2",
-    ]
     for table_name in missing_tables:
         expected_databases = linked_table_to_databases.get(table_name.lower(), [])
         local_candidates: list[str] = []
         for db_path in expected_databases:
-            basename = os.path.basename(db_path.replace("\\", "/"))
-            if not basename:
-                continue
-            for root in search_roots:
-                candidate = (root / basename).resolve()
-                if candidate.exists():
-                    local_candidates.append(str(candidate))
+            local_candidates.extend(str(candidate) for candidate in file_index.candidates(db_path))
 
         unresolved_rows.append(
             {
@@ -376,18 +435,25 @@ def build_table_tap_coverage(registry: dict, query_order: dict, snapshot_id: str
 
 def main() -> int:
     args = parse_args()
-    registry_path = Path(args.registry_json).expanduser().resolve()
-    if not registry_path.exists():
-        raise RuntimeError(f"Registry JSON not found: {registry_path}")
-
-    registry = load_json(registry_path)
+    if args.registry_db:
+        registry_path = Path(args.registry_db).expanduser().resolve()
+        registry = load_registry(registry_path, ("query_names", "objects", "selected_sql", "edges", "source_catalog"))
+    else:
+        registry_path = Path(args.registry_json).expanduser().resolve()
+        if not registry_path.exists():
+            raise RuntimeError(f"Registry JSON not found: {registry_path}")
+        registry = load_json(registry_path)
     snapshot_id = args.snapshot_id or registry.get("snapshot_id") or timestamp_id()
 
     out_dir = Path(args.out_dir).expanduser().resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    query_order = build_query_order(registry, snapshot_id)
-    table_taps = build_table_tap_coverage(registry, query_order, snapshot_id)
+    sql_refs = SqlRefCache(None if args.no_sql_refs_cache else Path(args.sql_refs_cache_dir))
+    query_order = build_query_order(registry, snapshot_id, sql_refs)
+    roots = [Path(root) for root in args.search_roots] if args.search_roots is not None else default_search_roots()
+    file_index = FileIndex(roots, depth=args.search_depth)
+    table_taps = build_table_tap_coverage(registry, query_order, snapshot_id, sql_refs, file_index)
+    sql_refs.save()
 
     query_path = out_dir / f"query_order_{snapshot_id}.json"
     coverage_path = out_dir / f"table_tap_coverage_{snapshot_id}.json"
@@ -403,6 +469,7 @@ def main() -> int:
     print(f"Wrote table taps: {coverage_path}")
     print(f"Wrote latest query alias: {latest_query}")
     print(f"Wrote latest table-tap alias: {latest_coverage}")
+    print(f"SQL reference scans: {sql_refs.stats['misses']} scanned, {sql_refs.stats['hits']} memoized")
     print(
         json.dumps(
             {
@@ -9,7 +9,8 @@ The script parses each PDF for:
 - TS/VA rows (Report 8 and/or Report 10)
 
 It then replays /api/transferable-skills/analyze with parsed inputs and
-computes TS/VA parity metrics.
+computes TS/VA parity metrics. Files that resolve to the same request
+(source DOTs, state, county, replay profile) share a single API replay.
 """
 
 from __future__ import annotations
@@ -18,21 +19,23 @@ import argparse
 import json
 import math
 import re
-import statistics
+import sqlite3
 import sys
 import urllib.error
 import urllib.request
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-try:
-    import pdfplumber
-except Exception as exc:  # pragma: no cover
-    raise SystemExit(
-        "Missing dependency: pdfplumber. Install with `python3 -m pip install --user pdfplumber`."
-    ) from exc
+import mtsp_catalog
+from mtsp_pdf_backends import BACKEND_CHOICES, REFERENCE_BACKEND, extract_page_texts, resolve_backend
+from mtsp_stats import bootstrap_error_ci, error_summary, mae, rmse, std_error
+
+# /api/transferable-skills/analyze clamps `limit` to TRANSFERABLE_MAX_LIMIT (src/server.js).
+TSA_MAX_PAGE_LIMIT = 250
+TSA_MAX_PAGES = 1000
 
 
 DOT_VALUE_RE = re.compile(r"\d{3}\.\d{3}-\d{3}")
@@ -133,11 +136,56 @@ def parse_match_row(line: str) -> dict[str, Any] | None:
     }
 
 
+def text_trigrams(value: str) -> set[str]:
+    return {value[index : index + 3] for index in range(len(value) - 2)}
+
+
+class CountyIndex:
+    """Normalized county names for one state, indexed for exact/contains lookups."""
+
+    def __init__(self, rows: list[dict[str, Any]]):
+        self.rows = rows
+        self.normalized = [normalize_text(str(row.get("county_name") or "")) for row in rows]
+        self.by_name: dict[str, list[int]] = {}
+        self.by_trigram: dict[str, set[int]] = {}
+        for index, normalized in enumerate(self.normalized):
+            if not normalized:
+                continue
+            self.by_name.setdefault(normalized, []).append(index)
+            for gram in text_trigrams(normalized):
+                self.by_trigram.setdefault(gram, set()).add(index)
+
+    def exact(self, target: str) -> list[dict[str, Any]]:
+        return [self.rows[index] for index in self.by_name.get(target, [])]
+
+    def contains(self, target: str) -> list[dict[str, Any]]:
+        grams = text_trigrams(target)
+        if grams:
+            postings = sorted((self.by_trigram.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = set(range(len(self.rows)))
+        return [self.rows[index] for index in sorted(candidates) if target in self.normalized[index]]
+
+    def reverse_contains(self, target: str) -> list[dict[str, Any]]:
+        matched: set[int] = set()
+        seen: set[str] = set()
+        for start in range(len(target)):
+            for end in range(start + 1, len(target) + 1):
+                fragment = target[start:end]
+                if fragment in seen:
+                    continue
+                seen.add(fragment)
+                matched.update(self.by_name.get(fragment, []))
+        return [self.rows[index] for index in sorted(matched)]
+
+
 class RegionResolver:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, db_path: Path | None = None, workers: int = 8):
         states = api_json(base_url, "/api/states").get("states", [])
         self.state_by_abbrev: dict[str, dict[str, Any]] = {}
-        self.counties_cache: dict[int, list[dict[str, Any]]] = {}
+        self.county_index: dict[int, CountyIndex] = {}
+        self.resolved_cache: dict[tuple[str, str], dict[str, Any]] = {}
 
         for row in states:
             abbrev = str(row.get("state_abbrev") or "").upper().strip()
@@ -148,16 +196,53 @@ class RegionResolver:
             raise RuntimeError("No states returned by /api/states.")
 
         self.base_url = base_url
-
-    def _load_counties(self, state_id: int) -> list[dict[str, Any]]:
-        if state_id in self.counties_cache:
-            return self.counties_cache[state_id]
-        out = api_json(self.base_url, f"/api/counties?stateId={state_id}")
-        rows = out.get("counties", [])
-        self.counties_cache[state_id] = rows if isinstance(rows, list) else []
-        return self.counties_cache[state_id]
+        state_ids = sorted({int(row["state_id"]) for row in self.state_by_abbrev.values()})
+        if db_path is not None:
+            counties_by_state = self._load_counties_from_db(db_path, state_ids)
+        else:
+            counties_by_state = self._load_counties_from_api(state_ids, workers)
+        for state_id in state_ids:
+            self.county_index[state_id] = CountyIndex(counties_by_state.get(state_id, []))
+
+    def _load_counties_from_db(self, db_path: Path, state_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        if not db_path.exists():
+            raise RuntimeError(f"County database not found: {db_path}")
+        out: dict[int, list[dict[str, Any]]] = {state_id: [] for state_id in state_ids}
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(
+                """
+                SELECT county_id, county_name, state_id, eclr_current
+                FROM counties
+                ORDER BY state_id, county_name
+                """
+            ).fetchall()
+        finally:
+            conn.close()
+        for row in rows:
+            state_id = int(row["state_id"])
+            if state_id in out:
+                out[state_id].append(dict(row))
+        return out
+
+    def _load_counties_from_api(self, state_ids: list[int], workers: int) -> dict[int, list[dict[str, Any]]]:
+        def load(state_id: int) -> list[dict[str, Any]]:
+            rows = api_json(self.base_url, f"/api/counties?stateId={state_id}").get("counties", [])
+            return rows if isinstance(rows, list) else []
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            return dict(zip(state_ids, pool.map(load, state_ids)))
 
     def resolve(self, state_abbrev: str | None, county_name: str | None) -> dict[str, Any]:
+        cache_key = ((state_abbrev or "").upper().strip(), county_name or "")
+        cached = self.resolved_cache.get(cache_key)
+        if cached is None:
+            cached = self._resolve(state_abbrev, county_name)
+            self.resolved_cache[cache_key] = cached
+        return dict(cached)
+
+    def _resolve(self, state_abbrev: str | None, county_name: str | None) -> dict[str, Any]:
         result = {
             "state_abbrev": (state_abbrev or "").upper().strip() or None,
             "county_name": county_name,
@@ -180,26 +265,21 @@ class RegionResolver:
         if not normalized_target:
             return result
 
-        counties = self._load_counties(state_id)
-        indexed = []
-        for row in counties:
-            name = str(row.get("county_name") or "")
-            normalized = normalize_text(name)
-            indexed.append((normalized, row))
+        index = self.county_index[state_id]
 
-        exact = [row for normalized, row in indexed if normalized == normalized_target]
+        exact = index.exact(normalized_target)
         if len(exact) == 1:
             result["county_id"] = int(exact[0]["county_id"])
             result["county_resolution"] = "exact"
             return result
 
-        contains = [row for normalized, row in indexed if normalized_target and normalized_target in normalized]
+        contains = index.contains(normalized_target)
         if len(contains) == 1:
             result["county_id"] = int(contains[0]["county_id"])
             result["county_resolution"] = "contains"
             return result
 
-        reverse_contains = [row for normalized, row in indexed if normalized and normalized in normalized_target]
+        reverse_contains = index.reverse_contains(normalized_target)
         if len(reverse_contains) == 1:
             result["county_id"] = int(reverse_contains[0]["county_id"])
             result["county_resolution"] = "reverse_contains"
@@ -218,7 +298,7 @@ class RegionResolver:
         return result
 
 
-def parse_pdf(path: Path) -> dict[str, Any]:
+def parse_pdf(path: Path, backend: str = REFERENCE_BACKEND, strict: bool = False) -> dict[str, Any]:
     state_abbrev: str | None = None
     county_name: str | None = None
     source_dots: list[str] = []
@@ -232,70 +312,68 @@ def parse_pdf(path: Path) -> dict[str, Any]:
     report8_row_count = 0
     report10_row_count = 0
 
-    with pdfplumber.open(str(path)) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            lines = [line.strip() for line in text.splitlines() if line.strip()]
-            if not lines:
-                continue
+    for text in extract_page_texts(path, backend, strict):
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines:
+            continue
 
-            page_text_lower = text.lower()
-            page_is_report5 = "report 5" in page_text_lower and "work history" in page_text_lower
-            page_is_report8 = "report 8" in page_text_lower and "transferable skills" in page_text_lower
-            page_is_report10 = "report 10" in page_text_lower and "transferable skills" in page_text_lower
-
-            for line in lines:
-                if state_abbrev is None and "City/State/Zip:" in line:
-                    match = CITY_STATE_ZIP_RE.search(line)
-                    if match:
-                        state_abbrev = match.group(1).upper()
-
-                if state_abbrev is None and "StateParishProvince:" in line:
-                    match = STATE_PARISH_RE.search(line)
-                    if match:
-                        state_abbrev = match.group(1).upper()
-
-                if county_name is None and "Job Bank Name:" in line:
-                    tail = line.split("Job Bank Name:", 1)[1].strip()
-                    tail = COUNTY_SPLIT_RE.split(tail)[0].strip(" :|-")
-                    if tail:
-                        county_name = tail
-
-                if profile3_values is None and PROFILE3_MARKER in line:
-                    parsed_vq, parsed_values = parse_profile_values(line, PROFILE3_MARKER)
-                    if parsed_values is not None:
-                        profile3_values = parsed_values
-                        profile3_vq = parsed_vq
-
-                if profile4_values is None and PROFILE4_MARKER in line:
-                    parsed_vq, parsed_values = parse_profile_values(line, PROFILE4_MARKER)
-                    if parsed_values is not None:
-                        profile4_values = parsed_values
-                        profile4_vq = parsed_vq
-
-                if page_is_report5:
-                    dot_match = DOT_LINE_RE.match(line)
-                    if dot_match:
-                        dot_code = normalize_dot(dot_match.group(1))
-                        if dot_code and dot_code not in source_dot_set:
-                            source_dot_set.add(dot_code)
-                            source_dots.append(dot_code)
-
-                if page_is_report8 or page_is_report10:
-                    parsed_row = parse_match_row(line)
-                    if not parsed_row:
-                        continue
-                    dot_code = parsed_row["dot_code"]
-                    if not dot_code:
-                        continue
-                    if page_is_report8:
-                        if dot_code not in rows_report8_by_dot:
-                            rows_report8_by_dot[dot_code] = parsed_row
-                        report8_row_count += 1
-                    if page_is_report10:
-                        if dot_code not in rows_report10_by_dot:
-                            rows_report10_by_dot[dot_code] = parsed_row
-                        report10_row_count += 1
+        page_text_lower = text.lower()
+        page_is_report5 = "report 5" in page_text_lower and "work history" in page_text_lower
+        page_is_report8 = "report 8" in page_text_lower and "transferable skills" in page_text_lower
+        page_is_report10 = "report 10" in page_text_lower and "transferable skills" in page_text_lower
+
+        for line in lines:
+            if state_abbrev is None and "City/State/Zip:" in line:
+                match = CITY_STATE_ZIP_RE.search(line)
+                if match:
+                    state_abbrev = match.group(1).upper()
+
+            if state_abbrev is None and "StateParishProvince:" in line:
+                match = STATE_PARISH_RE.search(line)
+                if match:
+                    state_abbrev = match.group(1).upper()
+
+            if county_name is None and "Job Bank Name:" in line:
+                tail = line.split("Job Bank Name:", 1)[1].strip()
+                tail = COUNTY_SPLIT_RE.split(tail)[0].strip(" :|-")
+                if tail:
+                    county_name = tail
+
+            if profile3_values is None and PROFILE3_MARKER in line:
+                parsed_vq, parsed_values = parse_profile_values(line, PROFILE3_MARKER)
+                if parsed_values is not None:
+                    profile3_values = parsed_values
+                    profile3_vq = parsed_vq
+
+            if profile4_values is None and PROFILE4_MARKER in line:
+                parsed_vq, parsed_values = parse_profile_values(line, PROFILE4_MARKER)
+                if parsed_values is not None:
+                    profile4_values = parsed_values
+                    profile4_vq = parsed_vq
+
+            if page_is_report5:
+                dot_match = DOT_LINE_RE.match(line)
+                if dot_match:
+                    dot_code = normalize_dot(dot_match.group(1))
+                    if dot_code and dot_code not in source_dot_set:
+                        source_dot_set.add(dot_code)
+                        source_dots.append(dot_code)
+
+            if page_is_report8 or page_is_report10:
+                parsed_row = parse_match_row(line)
+                if not parsed_row:
+                    continue
+                dot_code = parsed_row["dot_code"]
+                if not dot_code:
+                    continue
+                if page_is_report8:
+                    if dot_code not in rows_report8_by_dot:
+                        rows_report8_by_dot[dot_code] = parsed_row
+                    report8_row_count += 1
+                if page_is_report10:
+                    if dot_code not in rows_report10_by_dot:
+                        rows_report10_by_dot[dot_code] = parsed_row
+                    report10_row_count += 1
 
     selected_report_source = "report8" if rows_report8_by_dot else "report10" if rows_report10_by_dot else None
     rows = (
@@ -330,14 +408,20 @@ def fetch_all_tsa_rows(
     profile: list[int],
     page_limit: int,
 ) -> dict[str, Any]:
+    """Page /api/transferable-skills/analyze until `offset` reaches the first page's `total`."""
+    if not 1 <= page_limit <= TSA_MAX_PAGE_LIMIT:
+        raise RuntimeError(f"page_limit must be between 1 and {TSA_MAX_PAGE_LIMIT}, got {page_limit}")
     all_rows: list[dict[str, Any]] = []
     total: int | None = None
     offset = 0
-    safety_counter = 0
+    pages = 0
+    methodology_payload: dict[str, Any] | None = None
     aggregate_payload: dict[str, Any] | None = None
     band_counts_payload: dict[str, Any] | None = None
 
-    while True:
+    while total is None or offset < total:
+        if pages >= TSA_MAX_PAGES:
+            raise RuntimeError(f"TSA paging stopped after {pages} pages at offset {offset} of {total}")
         response = api_json(
             base_url,
             "/api/transferable-skills/analyze",
@@ -352,56 +436,50 @@ def fetch_all_tsa_rows(
                 "offset": offset,
             },
         )
+        pages += 1
 
         rows = response.get("results", [])
         if not isinstance(rows, list):
             rows = []
+        rows = [row for row in rows if isinstance(row, dict)]
         all_rows.extend(rows)
         if total is None:
             try:
                 total = int(response.get("total") or 0)
             except Exception:
                 total = 0
+            methodology_payload = response.get("methodology") if isinstance(response.get("methodology"), dict) else None
             aggregate_payload = response.get("aggregate") if isinstance(response.get("aggregate"), dict) else None
             band_counts_payload = (
                 response.get("tsp_band_counts") if isinstance(response.get("tsp_band_counts"), dict) else None
             )
 
         offset += len(rows)
-        safety_counter += 1
-        if not rows:
-            break
-        if total is not None and offset >= total:
-            break
-        if len(rows) < page_limit:
-            break
-        if safety_counter >= 200:
-            break
+        if not rows and offset < total:
+            raise RuntimeError(f"TSA page at offset {offset} returned no rows before reaching total {total}")
 
     return {
         "rows": all_rows,
         "total": total,
+        "methodology": methodology_payload,
         "aggregate": aggregate_payload,
         "tsp_bands": band_counts_payload,
     }
 
 
-def mean_abs(values: list[float]) -> float | None:
-    if not values:
-        return None
-    return float(sum(values) / len(values))
-
-
-def root_mean_square(values: list[float]) -> float | None:
-    if not values:
-        return None
-    return float(math.sqrt(sum(value * value for value in values) / len(values)))
-
-
-def std_error(values: list[float]) -> float:
-    if len(values) <= 1:
-        return 0.0
-    return float(statistics.stdev(values) / math.sqrt(len(values)))
+def replay_request_key(
+    source_dots: list[str],
+    state_id: int,
+    county_id: int | None,
+    profile: list[int],
+) -> tuple[Any, ...]:
+    # Source DOT order is kept: best-source selection breaks full ties by order.
+    return (
+        tuple(normalize_dot(dot) for dot in source_dots),
+        int(state_id),
+        int(county_id) if county_id is not None else None,
+        tuple(int(value) for value in profile),
+    )
 
 
 def build_markdown(report: dict[str, Any]) -> str:
@@ -411,12 +489,19 @@ def build_markdown(report: dict[str, Any]) -> str:
     lines.append(f"- Generated: {report['generated_at_utc']}")
     lines.append(f"- Base URL: {report['base_url']}")
     lines.append(f"- PDF directory: {report['pdf_dir']}")
+    lines.append(f"- PDF backend: {report['pdf_backend']}")
     lines.append(f"- Files scanned: {report['summary']['files_scanned']}")
     lines.append(f"- Files parsed: {report['summary']['files_parsed']}")
     lines.append(f"- Files replayed: {report['summary']['files_replayed']}")
     lines.append(f"- Files compared: {report['summary']['files_compared']}")
     lines.append(f"- Files skipped: {report['summary']['files_skipped']}")
     lines.append(f"- Rows compared: {report['summary']['rows_compared']}")
+    replay = report["summary"].get("replay_dedupe") or {}
+    if replay.get("requests"):
+        lines.append(
+            f"- Replay dedupe: {replay['requests']} requests -> {replay['distinct_requests']} distinct API replays "
+            f"(ratio {replay['dedupe_ratio']:.2f}x, saved {replay['calls_saved']}, enabled={replay['enabled']})"
+        )
     lines.append("")
     lines.append("## Metrics")
     lines.append("")
@@ -454,7 +539,26 @@ def build_markdown(report: dict[str, Any]) -> str:
     lines.append(
         f"- VA 95% CI MAE (adaptive): [{report['metrics']['va_ci95_low']:.3f}, {report['metrics']['va_ci95_high']:.3f}]"
     )
+    lines.append(
+        f"- TS bias / VA bias (direct): {report['metrics']['ts_bias_direct']:+.3f} / {report['metrics']['va_bias_direct']:+.3f}"
+    )
+    lines.append(
+        f"- TS Spearman / Kendall tau-b: {report['metrics']['ts_spearman']:.4f} / {report['metrics']['ts_kendall_tau_b']:.4f}"
+    )
+    lines.append(f"- TS band agreement: {report['metrics']['ts_band_agreement']:.3%}")
     lines.append(f"- Overall pass: {report['gates']['overall_pass']}")
+    bootstrap = report["metrics"].get("bootstrap") or {}
+    if bootstrap.get("intervals"):
+        lines.append("")
+        lines.append(
+            f"## Bootstrap {bootstrap['confidence']:.0%} CIs "
+            f"({bootstrap['replicates']} replicates, seed={bootstrap['seed']}, workers={bootstrap['workers']})"
+        )
+        lines.append("")
+        lines.append("MAE/RMSE use the adaptive per-file errors; bias, band agreement and Spearman use direct API values.")
+        lines.append("")
+        for name, interval in bootstrap["intervals"].items():
+            lines.append(f"- {name}: [{interval['low']:.4f}, {interval['high']:.4f}] (se={interval['std_error']:.4f})")
     lines.append("")
     lines.append("## Skips")
     lines.append("")
@@ -502,7 +606,12 @@ def main() -> int:
     parser.add_argument("--pdf-dir", required=True, help="Directory containing MTSP PDFs")
     parser.add_argument("--glob", default="*.pdf", help="Glob pattern under --pdf-dir")
     parser.add_argument("--max-files", type=int, default=0, help="Optional file cap for dry runs")
-    parser.add_argument("--page-limit", type=int, default=250, help="API page size for pagination")
+    parser.add_argument(
+        "--page-limit",
+        type=int,
+        default=TSA_MAX_PAGE_LIMIT,
+        help=f"API page size for pagination (1-{TSA_MAX_PAGE_LIMIT}, the server's cap)",
+    )
     parser.add_argument("--out-dir", default="output/analysis", help="Directory for output JSON/markdown")
     parser.add_argument("--ts-mae-gate", type=float, default=2.0, help="Acceptance gate for TS MAE")
     parser.add_argument("--va-mae-gate", type=float, default=5.0, help="Acceptance gate for VA MAE")
@@ -512,13 +621,55 @@ def main() -> int:
         default=50,
         help="Progress log interval (files). Set 0 to disable.",
     )
+    parser.add_argument(
+        "--db-path",
+        default="",
+        help="Optional MVQS SQLite database; counties are bulk-loaded from it instead of /api/counties.",
+    )
+    parser.add_argument(
+        "--county-workers",
+        type=int,
+        default=8,
+        help="Concurrent /api/counties requests when bulk-loading counties over HTTP.",
+    )
+    parser.add_argument("--bootstrap-replicates", type=int, default=2000, help="Bootstrap resamples (0 disables)")
+    parser.add_argument(
+        "--bootstrap-workers",
+        type=int,
+        default=0,
+        help="Worker processes for bootstrap resampling (0 = all cores; results do not depend on it)",
+    )
+    parser.add_argument("--bootstrap-seed", type=int, default=20260217, help="Bootstrap random seed")
+    parser.add_argument(
+        "--pdf-backend",
+        choices=BACKEND_CHOICES,
+        default=REFERENCE_BACKEND,
+        help="PDF text-extraction backend (see mtsp_pdf_backends.py).",
+    )
+    parser.add_argument(
+        "--catalog-db",
+        default="",
+        help="Optional MTSP catalog (see mtsp_catalog.py); unchanged PDFs are read from it instead of re-parsed.",
+    )
+    parser.add_argument(
+        "--no-replay-dedupe",
+        action="store_true",
+        help="Replay every file against the API even when an identical request was already replayed.",
+    )
     args = parser.parse_args()
+    if not 1 <= args.page_limit <= TSA_MAX_PAGE_LIMIT:
+        parser.error(f"--page-limit must be between 1 and {TSA_MAX_PAGE_LIMIT}")
+    args.pdf_backend = resolve_backend(args.pdf_backend)
 
     pdf_dir = Path(args.pdf_dir).expanduser().resolve()
     if not pdf_dir.exists():
         raise RuntimeError(f"PDF directory not found: {pdf_dir}")
 
-    resolver = RegionResolver(args.base_url)
+    resolver = RegionResolver(
+        args.base_url,
+        db_path=Path(args.db_path).expanduser().resolve() if args.db_path else None,
+        workers=args.county_workers,
+    )
     pdf_paths = sorted(path for path in pdf_dir.glob(args.glob) if path.is_file())
     if args.max_files > 0:
         pdf_paths = pdf_paths[: args.max_files]
@@ -526,6 +677,11 @@ def main() -> int:
     if not pdf_paths:
         raise RuntimeError(f"No files matched {args.glob!r} in {pdf_dir}")
 
+    catalog_conn = (
+        mtsp_catalog.connect(Path(args.catalog_db).expanduser().resolve()) if args.catalog_db else None
+    )
+    catalog_hits = 0
+
     file_rows: list[dict[str, Any]] = []
     all_row_matches: list[dict[str, Any]] = []
     skip_reasons: Counter[str] = Counter()
@@ -535,6 +691,9 @@ def main() -> int:
     files_replayed = 0
     files_compared = 0
     files_skipped = 0
+    replay_cache: dict[tuple[Any, ...], dict[str, Any]] = {}
+    replay_requests = 0
+    replay_api_calls = 0
 
     for pdf_path in pdf_paths:
         files_scanned += 1
@@ -546,6 +705,7 @@ def main() -> int:
             "parsed": {},
             "api": {
                 "called": False,
+                "deduplicated": False,
                 "error": None,
                 "total": None,
                 "result_rows": None,
@@ -580,7 +740,25 @@ def main() -> int:
         }
 
         try:
-            parsed = parse_pdf(pdf_path)
+            parsed = (
+                mtsp_catalog.load_parsed(catalog_conn, pdf_path, args.pdf_backend) if catalog_conn is not None else None
+            )
+            if parsed is not None:
+                catalog_hits += 1
+            else:
+                parsed = parse_pdf(pdf_path, backend=args.pdf_backend)
+                if catalog_conn is not None:
+                    size_bytes, mtime_ns = mtsp_catalog.file_probe(pdf_path)
+                    with catalog_conn:
+                        mtsp_catalog.store_parsed(
+                            catalog_conn,
+                            pdf_path,
+                            size_bytes,
+                            mtime_ns,
+                            mtsp_catalog.sha256_file(pdf_path),
+                            parsed,
+                            pdf_backend=args.pdf_backend,
+                        )
             files_parsed += 1
         except Exception as exc:
             files_skipped += 1
@@ -635,15 +813,34 @@ def main() -> int:
             file_rows.append(row_payload)
             continue
 
+        replay_county_id = int(region["county_id"]) if region["county_id"] is not None else None
+        replay_key = replay_request_key(parsed["source_dots"], int(region["state_id"]), replay_county_id, replay_profile)
+        replay_requests += 1
+        cached_replay = None if args.no_replay_dedupe else replay_cache.get(replay_key)
+        if cached_replay is None:
+            replay_api_calls += 1
+            try:
+                cached_replay = {
+                    "result": fetch_all_tsa_rows(
+                        base_url=args.base_url,
+                        source_dots=parsed["source_dots"],
+                        state_id=int(region["state_id"]),
+                        county_id=replay_county_id,
+                        profile=replay_profile,
+                        page_limit=args.page_limit,
+                    ),
+                    "error": None,
+                }
+            except Exception as exc:
+                cached_replay = {"result": None, "error": str(exc)}
+            replay_cache[replay_key] = cached_replay
+        else:
+            row_payload["api"]["deduplicated"] = True
+
         try:
-            api_result = fetch_all_tsa_rows(
-                base_url=args.base_url,
-                source_dots=parsed["source_dots"],
-                state_id=int(region["state_id"]),
-                county_id=int(region["county_id"]) if region["county_id"] is not None else None,
-                profile=replay_profile,
-                page_limit=args.page_limit,
-            )
+            if cached_replay["error"] is not None:
+                raise RuntimeError(cached_replay["error"])
+            api_result = cached_replay["result"]
             files_replayed += 1
             row_payload["api"]["called"] = True
             row_payload["api"]["total"] = api_result["total"]
@@ -739,8 +936,8 @@ def main() -> int:
         all_row_matches.extend(per_file_matches)
         ts_errors_direct = [row["abs_ts_error_direct"] for row in per_file_matches]
         ts_errors_band = [row["abs_ts_error_band_floor"] for row in per_file_matches]
-        ts_mae_direct = mean_abs(ts_errors_direct)
-        ts_mae_band = mean_abs(ts_errors_band)
+        ts_mae_direct = mae(ts_errors_direct)
+        ts_mae_band = mae(ts_errors_band)
         use_ts_band = (
             ts_mae_direct is not None
             and ts_mae_band is not None
@@ -755,12 +952,12 @@ def main() -> int:
         va_errors_pct_46 = [row["abs_va_error_pct_46"] for row in per_file_matches]
         va_errors_raw_46_unadjusted = [row["abs_va_error_raw_46_unadjusted"] for row in per_file_matches]
         va_errors_pct_46_unadjusted = [row["abs_va_error_pct_46_unadjusted"] for row in per_file_matches]
-        va_mae_direct = mean_abs(va_errors_direct)
-        va_mae_inverted = mean_abs(va_errors_inverted)
-        va_mae_raw_46 = mean_abs(va_errors_raw_46)
-        va_mae_pct_46 = mean_abs(va_errors_pct_46)
-        va_mae_raw_46_unadjusted = mean_abs(va_errors_raw_46_unadjusted)
-        va_mae_pct_46_unadjusted = mean_abs(va_errors_pct_46_unadjusted)
+        va_mae_direct = mae(va_errors_direct)
+        va_mae_inverted = mae(va_errors_inverted)
+        va_mae_raw_46 = mae(va_errors_raw_46)
+        va_mae_pct_46 = mae(va_errors_pct_46)
+        va_mae_raw_46_unadjusted = mae(va_errors_raw_46_unadjusted)
+        va_mae_pct_46_unadjusted = mae(va_errors_pct_46_unadjusted)
 
         va_candidates = [
             ("direct_api_va", va_errors_direct, va_mae_direct),
@@ -793,7 +990,7 @@ def main() -> int:
 
         row_payload["comparison"]["ts_mae_direct"] = ts_mae_direct
         row_payload["comparison"]["ts_mae_band_floor"] = ts_mae_band
-        row_payload["comparison"]["ts_mae"] = mean_abs(ts_errors_selected)
+        row_payload["comparison"]["ts_mae"] = mae(ts_errors_selected)
         row_payload["comparison"]["ts_mode"] = ts_mode
         row_payload["comparison"]["va_mae_direct"] = va_mae_direct
         row_payload["comparison"]["va_mae_inverted"] = va_mae_inverted
@@ -801,20 +998,23 @@ def main() -> int:
         row_payload["comparison"]["va_mae_pct_46"] = va_mae_pct_46
         row_payload["comparison"]["va_mae_raw_46_unadjusted"] = va_mae_raw_46_unadjusted
         row_payload["comparison"]["va_mae_pct_46_unadjusted"] = va_mae_pct_46_unadjusted
-        row_payload["comparison"]["va_mae"] = mean_abs(va_errors_selected)
+        row_payload["comparison"]["va_mae"] = mae(va_errors_selected)
         row_payload["comparison"]["va_mode"] = va_mode
-        row_payload["comparison"]["ts_rmse_direct"] = root_mean_square(ts_errors_direct)
-        row_payload["comparison"]["ts_rmse_band_floor"] = root_mean_square(ts_errors_band)
-        row_payload["comparison"]["ts_rmse"] = root_mean_square(ts_errors_selected)
-        row_payload["comparison"]["va_rmse_direct"] = root_mean_square(va_errors_direct)
-        row_payload["comparison"]["va_rmse_inverted"] = root_mean_square(va_errors_inverted)
-        row_payload["comparison"]["va_rmse_raw_46"] = root_mean_square(va_errors_raw_46)
-        row_payload["comparison"]["va_rmse_pct_46"] = root_mean_square(va_errors_pct_46)
-        row_payload["comparison"]["va_rmse_raw_46_unadjusted"] = root_mean_square(va_errors_raw_46_unadjusted)
-        row_payload["comparison"]["va_rmse_pct_46_unadjusted"] = root_mean_square(va_errors_pct_46_unadjusted)
-        row_payload["comparison"]["va_rmse"] = root_mean_square(va_errors_selected)
+        row_payload["comparison"]["ts_rmse_direct"] = rmse(ts_errors_direct)
+        row_payload["comparison"]["ts_rmse_band_floor"] = rmse(ts_errors_band)
+        row_payload["comparison"]["ts_rmse"] = rmse(ts_errors_selected)
+        row_payload["comparison"]["va_rmse_direct"] = rmse(va_errors_direct)
+        row_payload["comparison"]["va_rmse_inverted"] = rmse(va_errors_inverted)
+        row_payload["comparison"]["va_rmse_raw_46"] = rmse(va_errors_raw_46)
+        row_payload["comparison"]["va_rmse_pct_46"] = rmse(va_errors_pct_46)
+        row_payload["comparison"]["va_rmse_raw_46_unadjusted"] = rmse(va_errors_raw_46_unadjusted)
+        row_payload["comparison"]["va_rmse_pct_46_unadjusted"] = rmse(va_errors_pct_46_unadjusted)
+        row_payload["comparison"]["va_rmse"] = rmse(va_errors_selected)
         file_rows.append(row_payload)
 
+    if catalog_conn is not None:
+        catalog_conn.close()
+
     if not all_row_matches:
         raise RuntimeError("No overlapping rows between parsed MTSP reports and API results.")
 
@@ -828,20 +1028,36 @@ def main() -> int:
     va_all_raw_46_unadjusted = [row["abs_va_error_raw_46_unadjusted"] for row in all_row_matches]
     va_all_pct_46_unadjusted = [row["abs_va_error_pct_46_unadjusted"] for row in all_row_matches]
     va_all_adaptive = [row["abs_va_error"] for row in all_row_matches]
-    ts_mae_direct = mean_abs(ts_all_direct) or 0.0
-    ts_mae_band_floor = mean_abs(ts_all_band) or 0.0
-    ts_mae_adaptive = mean_abs(ts_all_adaptive) or 0.0
-    va_mae_direct = mean_abs(va_all_direct) or 0.0
-    va_mae_inverted = mean_abs(va_all_inverted) or 0.0
-    va_mae_raw_46 = mean_abs(va_all_raw_46) or 0.0
-    va_mae_pct_46 = mean_abs(va_all_pct_46) or 0.0
-    va_mae_raw_46_unadjusted = mean_abs(va_all_raw_46_unadjusted) or 0.0
-    va_mae_pct_46_unadjusted = mean_abs(va_all_pct_46_unadjusted) or 0.0
-    va_mae_adaptive = mean_abs(va_all_adaptive) or 0.0
-    ts_rmse_adaptive = root_mean_square(ts_all_adaptive) or 0.0
-    va_rmse_adaptive = root_mean_square(va_all_adaptive) or 0.0
+    ts_mae_direct = mae(ts_all_direct)
+    ts_mae_band_floor = mae(ts_all_band)
+    ts_mae_adaptive = mae(ts_all_adaptive)
+    va_mae_direct = mae(va_all_direct)
+    va_mae_inverted = mae(va_all_inverted)
+    va_mae_raw_46 = mae(va_all_raw_46)
+    va_mae_pct_46 = mae(va_all_pct_46)
+    va_mae_raw_46_unadjusted = mae(va_all_raw_46_unadjusted)
+    va_mae_pct_46_unadjusted = mae(va_all_pct_46_unadjusted)
+    va_mae_adaptive = mae(va_all_adaptive)
+    ts_rmse_adaptive = rmse(ts_all_adaptive)
+    va_rmse_adaptive = rmse(va_all_adaptive)
     ts_se = std_error(ts_all_adaptive)
     va_se = std_error(va_all_adaptive)
+    sample_ts_all = [float(row["sample_ts_percent"]) for row in all_row_matches]
+    api_ts_all = [float(row["api_ts_percent"]) for row in all_row_matches]
+    sample_va_all = [float(row["sample_va_percent"]) for row in all_row_matches]
+    api_va_all = [float(row["api_va_percent"]) for row in all_row_matches]
+    direct_summary = error_summary(sample_ts_all, api_ts_all, sample_va_all, api_va_all)
+    bootstrap = bootstrap_error_ci(
+        sample_ts_all,
+        api_ts_all,
+        sample_va_all,
+        api_va_all,
+        replicates=args.bootstrap_replicates,
+        workers=args.bootstrap_workers or None,
+        seed=args.bootstrap_seed,
+        ts_abs_errors=ts_all_adaptive,
+        va_abs_errors=va_all_adaptive,
+    )
 
     worst_files = sorted(
         [
@@ -860,6 +1076,16 @@ def main() -> int:
         reverse=True,
     )[:25]
 
+    replay_distinct = len(replay_cache)
+    replay_dedupe = {
+        "enabled": not args.no_replay_dedupe,
+        "requests": replay_requests,
+        "distinct_requests": replay_distinct,
+        "api_calls": replay_api_calls,
+        "calls_saved": replay_requests - replay_api_calls,
+        "dedupe_ratio": (replay_requests / replay_distinct) if replay_distinct else 1.0,
+    }
+
     largest_rows = sorted(
         all_row_matches,
         key=lambda row: (row["abs_va_error"], row["abs_ts_error"]),
@@ -870,13 +1096,16 @@ def main() -> int:
         "generated_at_utc": now_iso(),
         "base_url": args.base_url,
         "pdf_dir": str(pdf_dir),
+        "pdf_backend": args.pdf_backend,
         "summary": {
             "files_scanned": files_scanned,
             "files_parsed": files_parsed,
+            "files_from_catalog": catalog_hits,
             "files_replayed": files_replayed,
             "files_compared": files_compared,
             "files_skipped": files_skipped,
             "rows_compared": len(all_row_matches),
+            "replay_dedupe": replay_dedupe,
         },
         "metrics": {
             "ts_mae_direct": ts_mae_direct,
@@ -897,6 +1126,12 @@ def main() -> int:
             "ts_ci95_high": ts_mae_adaptive + 1.96 * ts_se,
             "va_ci95_low": va_mae_adaptive - 1.96 * va_se,
             "va_ci95_high": va_mae_adaptive + 1.96 * va_se,
+            "ts_bias_direct": direct_summary["ts_bias"],
+            "va_bias_direct": direct_summary["va_bias"],
+            "ts_spearman": direct_summary["ts_spearman"],
+            "ts_kendall_tau_b": direct_summary["ts_kendall_tau_b"],
+            "ts_band_agreement": direct_summary["ts_band_agreement"],
+            "bootstrap": bootstrap,
         },
         "gates": {
             "ts_mae_gate": args.ts_mae_gate,
@@ -927,6 +1162,9 @@ def main() -> int:
                 "files_scanned": files_scanned,
                 "files_compared": files_compared,
                 "rows_compared": len(all_row_matches),
+                "replay_requests": replay_requests,
+                "replay_distinct_requests": replay_distinct,
+                "replay_dedupe_ratio": replay_dedupe["dedupe_ratio"],
                 "ts_mae_direct": ts_mae_direct,
                 "ts_mae_band_floor": ts_mae_band_floor,
                 "ts_mae_adaptive": ts_mae_adaptive,
@@ -2,6 +2,9 @@
 """
 Run legacy-sync parity validation against one or more MTSP sample PDFs.
 
+With --sweep-states the same source DOTs/profile are replayed for every
+state (fully paged, bounded concurrency) to surface region-dependent drift.
+
 Outputs timestamped JSON + markdown summaries under output/analysis.
 """
 
@@ -9,25 +12,34 @@ from __future__ import annotations
 
 import argparse
 import json
-import math
-import re
-import statistics
 import sys
 import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-try:
-    import pdfplumber
-except Exception as exc:  # pragma: no cover
-    raise SystemExit(
-        "Missing dependency: pdfplumber. Install with `python3 -m pip install --user pdfplumber`."
-    ) from exc
-
-DOT_PATTERN = re.compile(r"\d{3}\.\d{3}-\d{3}")
-PCT_PATTERN = re.compile(r"\d{1,3}%")
+from mtsp_pdf_backends import BACKEND_CHOICES, REFERENCE_BACKEND, extract_page_words, resolve_backend
+from mtsp_pdf_tables import extract_dot_rows
+from mtsp_stats import bootstrap_error_ci, error_summary, mae, std_error
+from retest_mtsp_corpus import TSA_MAX_PAGE_LIMIT, fetch_all_tsa_rows
+
+TITLE_STOPWORDS = {
+    "Job",
+    "Profile",
+    "Report",
+    "8:",
+    "Matches",
+    "by",
+    "Transferable",
+    "Skills",
+    "(TS)",
+    "-",
+    "Demands",
+    "Skill",
+    "Level",
+}
 TS_LEVELS = [
     (5, 80, 97),
     (4, 60, 79.9),
@@ -60,10 +72,6 @@ def api_json(base_url: str, path: str, method: str = "GET", body: dict[str, Any]
         raise RuntimeError(f"{method} {path} failed: {exc.reason}") from exc
 
 
-def normalize_dot(value: str) -> str:
-    return value.replace(".", "").replace("-", "")
-
-
 def to_band(score: float) -> int:
     numeric = max(0.0, min(97.0, float(score)))
     for level, low, high in TS_LEVELS:
@@ -72,53 +80,11 @@ def to_band(score: float) -> int:
     return 1
 
 
-def parse_pdf_rows(pdf_path: Path) -> list[dict[str, Any]]:
+def parse_pdf_rows(pdf_path: Path, backend: str = REFERENCE_BACKEND, strict: bool = False) -> list[dict[str, Any]]:
     rows: list[dict[str, Any]] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        page_indexes = [4, 5, 6, 7]
-        for page_index in page_indexes:
-            if page_index >= len(pdf.pages):
-                continue
-            words = pdf.pages[page_index].extract_words(use_text_flow=True, keep_blank_chars=False)
-            dot_words = [word for word in words if DOT_PATTERN.fullmatch(word["text"])]
-            for dot_word in dot_words:
-                near = [word for word in words if abs(word["top"] - dot_word["top"]) <= 1.3]
-                pcts = sorted([word for word in near if PCT_PATTERN.fullmatch(word["text"])], key=lambda word: word["x0"])
-                if len(pcts) < 2:
-                    continue
-                title_tokens = sorted(
-                    [
-                        word
-                        for word in near
-                        if word["x0"] > dot_word["x1"] + 3
-                        and word["x0"] < 240
-                        and word["text"]
-                        not in {
-                            "Job",
-                            "Profile",
-                            "Report",
-                            "8:",
-                            "Matches",
-                            "by",
-                            "Transferable",
-                            "Skills",
-                            "(TS)",
-                            "-",
-                            "Demands",
-                            "Skill",
-                            "Level",
-                        }
-                    ],
-                    key=lambda word: word["x0"],
-                )
-                rows.append(
-                    {
-                        "dot_code": normalize_dot(dot_word["text"]),
-                        "title": " ".join(token["text"] for token in title_tokens),
-                        "sample_ts_percent": int(pcts[0]["text"][:-1]),
-                        "sample_va_percent": int(pcts[1]["text"][:-1]),
-                    }
-                )
+    page_indexes = [4, 5, 6, 7]
+    for words in extract_page_words(pdf_path, backend, page_indexes, strict).values():
+        rows.extend(extract_dot_rows(words, title_max_x0=240, title_stopwords=TITLE_STOPWORDS))
 
     dedup: dict[str, dict[str, Any]] = {}
     for row in rows:
@@ -126,48 +92,6 @@ def parse_pdf_rows(pdf_path: Path) -> list[dict[str, Any]]:
     return list(dedup.values())
 
 
-def mae(values: list[float]) -> float:
-    return float(sum(values) / len(values)) if values else float("nan")
-
-
-def std_error(values: list[float]) -> float:
-    if len(values) <= 1:
-        return 0.0
-    return float(statistics.stdev(values) / math.sqrt(len(values)))
-
-
-def spearman_rank_correlation(xs: list[float], ys: list[float]) -> float:
-    if len(xs) <= 1 or len(xs) != len(ys):
-        return float("nan")
-
-    def ranks(values: list[float]) -> list[float]:
-        order = sorted((value, idx) for idx, value in enumerate(values))
-        out = [0.0] * len(values)
-        rank = 1
-        i = 0
-        while i < len(order):
-            j = i
-            while j + 1 < len(order) and order[j + 1][0] == order[i][0]:
-                j += 1
-            avg = (rank + rank + (j - i)) / 2.0
-            for k in range(i, j + 1):
-                out[order[k][1]] = avg
-            rank += (j - i + 1)
-            i = j + 1
-        return out
-
-    rx = ranks(xs)
-    ry = ranks(ys)
-    mean_rx = statistics.fmean(rx)
-    mean_ry = statistics.fmean(ry)
-    cov = sum((a - mean_rx) * (b - mean_ry) for a, b in zip(rx, ry))
-    std_rx = math.sqrt(sum((a - mean_rx) ** 2 for a in rx))
-    std_ry = math.sqrt(sum((b - mean_ry) ** 2 for b in ry))
-    if std_rx == 0 or std_ry == 0:
-        return float("nan")
-    return float(cov / (std_rx * std_ry))
-
-
 def build_markdown(report: dict[str, Any]) -> str:
     lines: list[str] = []
     lines.append("# MVQS Legacy-Sync Validation")
@@ -183,6 +107,20 @@ def build_markdown(report: dict[str, Any]) -> str:
     lines.append(f"- VA 95% CI: [{report['metrics']['va_ci95_low']:.3f}, {report['metrics']['va_ci95_high']:.3f}]")
     lines.append(f"- Top-25 overlap: {report['metrics']['top25_overlap']}")
     lines.append(f"- Spearman rank correlation: {report['metrics']['spearman_rank_corr']:.4f}")
+    lines.append(f"- Kendall tau-b: {report['metrics']['kendall_tau_b']:.4f}")
+    lines.append(f"- TS RMSE / bias: {report['metrics']['ts_rmse']:.3f} / {report['metrics']['ts_bias']:+.3f}")
+    lines.append(f"- VA RMSE / bias: {report['metrics']['va_rmse']:.3f} / {report['metrics']['va_bias']:+.3f}")
+    lines.append(f"- TS band agreement: {report['metrics']['ts_band_agreement']:.3%}")
+    bootstrap = report["metrics"].get("bootstrap") or {}
+    if bootstrap.get("intervals"):
+        lines.append("")
+        lines.append(
+            f"## Bootstrap {bootstrap['confidence']:.0%} CIs "
+            f"({bootstrap['replicates']} replicates, seed={bootstrap['seed']}, workers={bootstrap['workers']})"
+        )
+        lines.append("")
+        for name, interval in bootstrap["intervals"].items():
+            lines.append(f"- {name}: [{interval['low']:.4f}, {interval['high']:.4f}] (se={interval['std_error']:.4f})")
     lines.append("")
     lines.append("## Acceptance")
     lines.append("")
@@ -201,6 +139,169 @@ def build_markdown(report: dict[str, Any]) -> str:
     return "\n".join(lines) + "\n"
 
 
+def validate_state(
+    base_url: str,
+    state: dict[str, Any],
+    source_dots: list[str],
+    profile: list[int],
+    page_limit: int,
+    samples: list[tuple[Path, list[dict[str, Any]]]],
+) -> dict[str, Any]:
+    out: dict[str, Any] = {
+        "state_id": state.get("state_id"),
+        "state_abbrev": state.get("state_abbrev"),
+        "state_name": state.get("state_name"),
+        "api_total": None,
+        "api_rows_fetched": 0,
+        "overlap_rows": 0,
+        "ts_mae": None,
+        "va_mae": None,
+        "ts_bias": None,
+        "va_bias": None,
+        "methodology_version": None,
+        "error": None,
+    }
+    try:
+        fetched = fetch_all_tsa_rows(base_url, source_dots, int(state["state_id"]), None, profile, page_limit)
+    except Exception as exc:
+        out["error"] = str(exc)
+        return out
+
+    methodology = fetched["methodology"] or {}
+    out["methodology_version"] = methodology.get("methodology_version") or methodology.get("selected_model")
+    out["api_total"] = fetched["total"]
+    out["api_rows_fetched"] = len(fetched["rows"])
+    by_dot = {row.get("dot_code"): row for row in fetched["rows"]}
+
+    sample_ts: list[float] = []
+    api_ts: list[float] = []
+    sample_va: list[float] = []
+    api_va: list[float] = []
+    for _, sample_rows in samples:
+        for sample in sample_rows:
+            api_row = by_dot.get(sample["dot_code"])
+            if not api_row:
+                continue
+            sample_ts.append(float(sample["sample_ts_percent"]))
+            sample_va.append(float(sample["sample_va_percent"]))
+            api_ts.append(float(api_row.get("ts_percent") or api_row.get("tsp_percent") or 0))
+            api_va.append(float(api_row.get("va_percent") or api_row.get("va_adjustment_percent") or 0))
+
+    out["overlap_rows"] = len(sample_ts)
+    if sample_ts:
+        summary = error_summary(sample_ts, api_ts, sample_va, api_va)
+        for key in ("ts_mae", "va_mae", "ts_bias", "va_bias"):
+            out[key] = summary[key]
+    return out
+
+
+def build_sweep_markdown(report: dict[str, Any]) -> str:
+    lines: list[str] = []
+    lines.append("# MVQS Legacy-Sync Multi-State Sweep")
+    lines.append("")
+    lines.append(f"- Generated: {report['generated_at_utc']}")
+    lines.append(f"- Base URL: {report['base_url']}")
+    lines.append(f"- Source DOTs: {', '.join(report['source_dots'])}")
+    lines.append(f"- States swept: {report['summary']['states_swept']}")
+    lines.append(f"- States compared: {report['summary']['states_compared']}")
+    lines.append(f"- States failing gates: {report['summary']['states_failing']}")
+    lines.append(f"- States with errors: {report['summary']['states_errored']}")
+    lines.append(f"- Overall pass: {report['gates']['overall_pass']}")
+    lines.append("")
+    lines.append("## Worst States")
+    lines.append("")
+    lines.append("Ranked by drift score = max(TS MAE / TS gate, VA MAE / VA gate).")
+    lines.append("")
+    if report["worst_states"]:
+        lines.append("| Rank | State | Overlap | TS MAE | VA MAE | TS bias | VA bias | Score |")
+        lines.append("|---:|---|---:|---:|---:|---:|---:|---:|")
+        for rank, row in enumerate(report["worst_states"], start=1):
+            lines.append(
+                f"| {rank} | {row['state_abbrev']} | {row['overlap_rows']} | {row['ts_mae']:.3f} | {row['va_mae']:.3f} | "
+                f"{row['ts_bias']:+.3f} | {row['va_bias']:+.3f} | {row['drift_score']:.3f} |"
+            )
+    else:
+        lines.append("- None")
+    lines.append("")
+    errored = [row for row in report["states"] if row["error"]]
+    if errored:
+        lines.append("## Errors")
+        lines.append("")
+        for row in errored:
+            lines.append(f"- {row['state_abbrev']}: {row['error']}")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def run_state_sweep(args: argparse.Namespace, source_dots: list[str], profile: list[int]) -> int:
+    samples = []
+    for pdf_raw in args.pdf_paths:
+        pdf_path = Path(pdf_raw).expanduser().resolve()
+        samples.append((pdf_path, parse_pdf_rows(pdf_path, backend=args.pdf_backend)))
+    if not any(rows for _, rows in samples):
+        raise RuntimeError("No sample rows extracted from PDFs.")
+
+    states = [row for row in api_json(args.base_url, "/api/states").get("states", []) if row.get("state_id") is not None]
+    if not states:
+        raise RuntimeError("No states returned by /api/states.")
+
+    with ThreadPoolExecutor(max_workers=max(1, args.sweep_workers)) as pool:
+        state_rows = list(
+            pool.map(
+                lambda state: validate_state(args.base_url, state, source_dots, profile, args.page_limit, samples),
+                states,
+            )
+        )
+
+    compared = [row for row in state_rows if row["overlap_rows"] > 0]
+    for row in compared:
+        row["ts_mae_pass"] = row["ts_mae"] <= args.ts_mae_gate
+        row["va_mae_pass"] = row["va_mae"] <= args.va_mae_gate
+        row["drift_score"] = max(row["ts_mae"] / args.ts_mae_gate, row["va_mae"] / args.va_mae_gate)
+    worst = sorted(compared, key=lambda row: (-row["drift_score"], str(row["state_abbrev"])))[: args.sweep_top]
+    failing = [row for row in compared if not (row["ts_mae_pass"] and row["va_mae_pass"])]
+    errored = [row for row in state_rows if row["error"]]
+
+    report = {
+        "generated_at_utc": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "base_url": args.base_url,
+        "source_dots": source_dots,
+        "profile": profile,
+        "page_limit": args.page_limit,
+        "samples": [{"pdf_path": str(path), "sample_rows": len(rows)} for path, rows in samples],
+        "summary": {
+            "states_swept": len(state_rows),
+            "states_compared": len(compared),
+            "states_failing": len(failing),
+            "states_errored": len(errored),
+        },
+        "gates": {
+            "ts_mae_gate": args.ts_mae_gate,
+            "va_mae_gate": args.va_mae_gate,
+            "overall_pass": bool(compared) and not failing and not errored,
+        },
+        "worst_states": worst,
+        "states": state_rows,
+    }
+
+    out_dir = Path(args.out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = now_id()
+    json_path = out_dir / f"legacy_sync_sweep_{stamp}.json"
+    md_path = out_dir / f"legacy_sync_sweep_{stamp}.md"
+    json_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    md_path.write_text(build_sweep_markdown(report), encoding="utf-8")
+
+    print(f"Wrote: {json_path}")
+    print(f"Wrote: {md_path}")
+    print(
+        f"States compared: {len(compared)}/{len(state_rows)} | failing: {len(failing)} | errors: {len(errored)}"
+    )
+    for row in worst[:5]:
+        print(f"  {row['state_abbrev']}: TS MAE={row['ts_mae']:.3f} VA MAE={row['va_mae']:.3f}")
+    return 0 if report["gates"]["overall_pass"] else 2
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Validate MVQS legacy-sync methodology parity")
     parser.add_argument("--base-url", default="http://localhost:4173", help="MVQS base URL")
@@ -219,10 +320,42 @@ def main() -> int:
     parser.add_argument("--out-dir", default="output/analysis", help="Output directory for reports")
     parser.add_argument("--ts-mae-gate", type=float, default=2.0, help="Phase gate for TS MAE")
     parser.add_argument("--va-mae-gate", type=float, default=5.0, help="Phase gate for VA MAE")
+    parser.add_argument(
+        "--sweep-states",
+        action="store_true",
+        help="Validate the same source DOTs/profile against every state from /api/states",
+    )
+    parser.add_argument("--sweep-workers", type=int, default=4, help="Concurrent states in --sweep-states mode")
+    parser.add_argument("--sweep-top", type=int, default=15, help="Worst states listed in the sweep report")
+    parser.add_argument(
+        "--page-limit",
+        type=int,
+        default=TSA_MAX_PAGE_LIMIT,
+        help=f"API page size in --sweep-states mode (1-{TSA_MAX_PAGE_LIMIT}, the server's cap)",
+    )
+    parser.add_argument("--bootstrap-replicates", type=int, default=2000, help="Bootstrap resamples (0 disables)")
+    parser.add_argument(
+        "--bootstrap-workers",
+        type=int,
+        default=0,
+        help="Worker processes for bootstrap resampling (0 = all cores; results do not depend on it)",
+    )
+    parser.add_argument("--bootstrap-seed", type=int, default=20260217, help="Bootstrap random seed")
+    parser.add_argument(
+        "--pdf-backend",
+        choices=BACKEND_CHOICES,
+        default=REFERENCE_BACKEND,
+        help="PDF text-extraction backend (see mtsp_pdf_backends.py).",
+    )
     args = parser.parse_args()
+    if not 1 <= args.page_limit <= TSA_MAX_PAGE_LIMIT:
+        parser.error(f"--page-limit must be between 1 and {TSA_MAX_PAGE_LIMIT}")
+    args.pdf_backend = resolve_backend(args.pdf_backend)
 
     source_dots = [token.strip() for token in args.source_dots.split(",") if token.strip()]
     profile = [int(token.strip()) for token in args.profile.split(",") if token.strip()]
+    if args.sweep_states:
+        return run_state_sweep(args, source_dots, profile)
 
     states = api_json(args.base_url, "/api/states").get("states", [])
     state = next((row for row in states if str(row.get("state_abbrev", "")).upper() == args.state_abbrev.upper()), None)
@@ -265,7 +398,7 @@ def main() -> int:
 
     for pdf_raw in args.pdf_paths:
         pdf_path = Path(pdf_raw).expanduser().resolve()
-        sample_rows = parse_pdf_rows(pdf_path)
+        sample_rows = parse_pdf_rows(pdf_path, backend=args.pdf_backend)
         matched_rows = []
         for sample in sample_rows:
             api_row = by_dot.get(sample["dot_code"])
@@ -328,9 +461,20 @@ def main() -> int:
     api_top = [row.get("dot_code") for row in sorted(api_rows, key=lambda r: float(r.get("ts_percent") or r.get("tsp_percent") or 0), reverse=True)[:25]]
     top_overlap = len(set(sample_top) & set(api_top))
 
-    sample_ranks = [float(row["sample_ts_percent"]) for row in all_matches]
-    api_ranks = [float(row["api_ts_percent"]) for row in all_matches]
-    spearman = spearman_rank_correlation(sample_ranks, api_ranks)
+    sample_ts = [float(row["sample_ts_percent"]) for row in all_matches]
+    api_ts = [float(row["api_ts_percent"]) for row in all_matches]
+    sample_va = [float(row["sample_va_percent"]) for row in all_matches]
+    api_va = [float(row["api_va_percent"]) for row in all_matches]
+    summary = error_summary(sample_ts, api_ts, sample_va, api_va)
+    bootstrap = bootstrap_error_ci(
+        sample_ts,
+        api_ts,
+        sample_va,
+        api_va,
+        replicates=args.bootstrap_replicates,
+        workers=args.bootstrap_workers or None,
+        seed=args.bootstrap_seed,
+    )
 
     report = {
         "generated_at_utc": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
@@ -349,7 +493,14 @@ def main() -> int:
             "va_ci95_low": va_mae - 1.96 * va_se,
             "va_ci95_high": va_mae + 1.96 * va_se,
             "top25_overlap": top_overlap,
-            "spearman_rank_corr": spearman,
+            "spearman_rank_corr": summary["ts_spearman"],
+            "kendall_tau_b": summary["ts_kendall_tau_b"],
+            "ts_rmse": summary["ts_rmse"],
+            "va_rmse": summary["va_rmse"],
+            "ts_bias": summary["ts_bias"],
+            "va_bias": summary["va_bias"],
+            "ts_band_agreement": summary["ts_band_agreement"],
+            "bootstrap": bootstrap,
             "ts_band_confusion": confusion,
         },
         "gates": {
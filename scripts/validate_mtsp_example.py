@@ -12,22 +12,36 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
 import sys
 import urllib.error
 import urllib.request
+from pathlib import Path
 from typing import Any
 
-try:
-    import pdfplumber
-except Exception as exc:  # pragma: no cover
-    raise SystemExit(
-        "Missing dependency: pdfplumber. Install with `python3 -m pip install --user pdfplumber`."
-    ) from exc
-
-
-DOT_PATTERN = re.compile(r"\d{3}\.\d{3}-\d{3}")
-PCT_PATTERN = re.compile(r"\d{1,3}%")
+from mtsp_pdf_backends import BACKEND_CHOICES, REFERENCE_BACKEND, extract_page_words, resolve_backend
+from mtsp_pdf_tables import extract_dot_rows
+
+
+TITLE_STOPWORDS = {
+    "Thursday,",
+    "February",
+    "12,",
+    "2026Michael",
+    "Pollack",
+    "Job",
+    "Profile",
+    "Report",
+    "8:",
+    "Matches",
+    "by",
+    "Transferable",
+    "Skills",
+    "(TS)",
+    "-",
+    "Demands",
+    "Skill",
+    "Level",
+}
 
 
 def api_json(base_url: str, path: str, method: str = "GET", body: dict[str, Any] | None = None) -> Any:
@@ -50,76 +64,19 @@ def api_json(base_url: str, path: str, method: str = "GET", body: dict[str, Any]
         raise RuntimeError(f"{method} {path} failed: {exc.reason}") from exc
 
 
-def normalize_dot(dot_with_formatting: str) -> str:
-    return dot_with_formatting.replace(".", "").replace("-", "")
-
-
-def parse_pdf_rows(pdf_path: str) -> list[dict[str, Any]]:
+def parse_pdf_rows(pdf_path: str, backend: str = REFERENCE_BACKEND) -> list[dict[str, Any]]:
     def parse_rows_from_page(words: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        parsed: list[dict[str, Any]] = []
-        dot_words = [word for word in words if DOT_PATTERN.fullmatch(word["text"])]
-        for dot_word in dot_words:
-            near = [word for word in words if abs(word["top"] - dot_word["top"]) <= 1.3]
-            pcts = sorted(
-                [word for word in near if PCT_PATTERN.fullmatch(word["text"])],
-                key=lambda word: word["x0"],
-            )
-            if len(pcts) < 2:
-                continue
-            title_tokens = sorted(
-                [
-                    word
-                    for word in near
-                    if word["x0"] > dot_word["x1"] + 3
-                    and word["x0"] < 230
-                    and word["text"]
-                    not in {
-                        "Thursday,",
-                        "February",
-                        "12,",
-                        "2026Michael",
-                        "Pollack",
-                        "Job",
-                        "Profile",
-                        "Report",
-                        "8:",
-                        "Matches",
-                        "by",
-                        "Transferable",
-                        "Skills",
-                        "(TS)",
-                        "-",
-                        "Demands",
-                        "Skill",
-                        "Level",
-                    }
-                ],
-                key=lambda word: word["x0"],
-            )
-            parsed.append(
-                {
-                    "dot_code": normalize_dot(dot_word["text"]),
-                    "title": " ".join(token["text"] for token in title_tokens),
-                    "sample_ts_percent": int(pcts[0]["text"][:-1]),
-                    "sample_va_percent": int(pcts[1]["text"][:-1]),
-                }
-            )
-        return parsed
+        return extract_dot_rows(words, title_max_x0=230, title_stopwords=TITLE_STOPWORDS)
 
     rows: list[dict[str, Any]] = []
-    with pdfplumber.open(pdf_path) as pdf:
-        preferred_indexes = [4, 5, 6, 7]
-        for page_index in preferred_indexes:
-            if page_index >= len(pdf.pages):
-                continue
-            words = pdf.pages[page_index].extract_words(use_text_flow=True, keep_blank_chars=False)
-            rows.extend(parse_rows_from_page(words))
+    preferred_indexes = [4, 5, 6, 7]
+    for words in extract_page_words(Path(pdf_path), backend, preferred_indexes).values():
+        rows.extend(parse_rows_from_page(words))
 
-        # Fallback for shorter or differently structured sample packets.
-        if not rows:
-            for page in pdf.pages:
-                words = page.extract_words(use_text_flow=True, keep_blank_chars=False)
-                rows.extend(parse_rows_from_page(words))
+    # Fallback for shorter or differently structured sample packets.
+    if not rows:
+        for words in extract_page_words(Path(pdf_path), backend).values():
+            rows.extend(parse_rows_from_page(words))
 
     return rows
 
@@ -145,12 +102,19 @@ def main() -> int:
         default="5,5,5,3,3,4,2,2,2,1,1,2,0,0,0,1,1,1,0,0,0,0,0,0",
         help="Comma-separated 24-trait profile values",
     )
+    parser.add_argument(
+        "--pdf-backend",
+        choices=BACKEND_CHOICES,
+        default=REFERENCE_BACKEND,
+        help="PDF text-extraction backend (see mtsp_pdf_backends.py).",
+    )
     args = parser.parse_args()
+    args.pdf_backend = resolve_backend(args.pdf_backend)
 
     source_dots = [token.strip() for token in args.source_dots.split(",") if token.strip()]
     profile = [int(token.strip()) for token in args.profile.split(",") if token.strip()]
 
-    sample_rows = parse_pdf_rows(args.pdf_path)
+    sample_rows = parse_pdf_rows(args.pdf_path, backend=args.pdf_backend)
     if not sample_rows:
         raise RuntimeError("No sample rows extracted from PDF.")
 